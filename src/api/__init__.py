@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from src.api import users, vacancy, channels, languages, world, worldAdmin, statistic, industry, admin
+from src.api import users, vacancy, channels, languages, world, worldAdmin, statistic, industry, admin, media, search, reference
 from src.api.vacancy import moderation
 
 routers = APIRouter()
@@ -13,4 +13,7 @@ routers.include_router(moderation.router)
 routers.include_router(worldAdmin.router)
 routers.include_router(statistic.router)
 routers.include_router(industry.router)
-routers.include_router(admin.router)
\ No newline at end of file
+routers.include_router(admin.router)
+routers.include_router(media.router)
+routers.include_router(search.router)
+routers.include_router(reference.router)
\ No newline at end of file
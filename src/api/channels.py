@@ -3,11 +3,12 @@ from pydantic import BaseModel
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 
 from src.models.channels import Channels
+from src.models.load_plans import channel_card_plan
 from src.core.auth import require_api_key
+from src.core.channels import invalidate_channel_chats
 from src.database import get_async_session
 from src.schemas.channels import CreateChennel, UpdateChennel
 
@@ -49,7 +50,8 @@ async def create_new_channel(
         )
         session.add(channel)
         await session.commit()
-        await session.refresh(channel)
+        invalidate_channel_chats()
+        await session.refresh(channel, ["country", "region"])
         
         return {
             'data': 
@@ -78,7 +80,7 @@ async def get_list_channels(
         authorized: bool = Depends(require_api_key)
     ):
     try:
-        exiting = await session.execute(select(Channels).order_by(Channels.id.desc()))
+        exiting = await session.execute(select(Channels).options(*channel_card_plan()).order_by(Channels.id.desc()))
         return {
             'data': [
                 {
@@ -130,11 +132,14 @@ async def update_channel(
 
         data.region_id = payload.region_id
 
-        if payload.channel_url is not None:
+        if payload.channel_url is not None and payload.channel_url != data.channel_url:
             data.channel_url = payload.channel_url
+            data.chat_id = None
+            data.chat_username = None
 
         await session.commit()
-        await session.refresh(data)
+        invalidate_channel_chats()
+        await session.refresh(data, ["country", "region"])
         return {'data':{
                     "id": data.id, 
                     'channel_url': data.channel_url,
@@ -175,6 +180,7 @@ async def delete_channel(
             return {'data': False, 'status': 400, 'message': f"Chat with id={item_id} not found.", 'error': None}
         await session.delete(data)
         await session.commit()
+        invalidate_channel_chats()
         return {'data': True, 'status': 200, 'message': f"Chat with id={item_id} has been deleted.", 'error': None}
     except Exception as err:
         await session.rollback()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from enum import Enum
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,6 +6,7 @@ from sqlalchemy import select
 
 from src.models.industry import Industry
 from src.core.auth import require_api_key
+from src.core.reference import reference_store, prepared_response, refresh_reference
 from src.database import get_async_session
 from src.schemas.industry import CreateIndustry, IndustryResponse
 from src.logs.error_handler import handle_exceptions
@@ -30,32 +31,24 @@ async def create_industry(
         item = Industry(name = payload.name.strip())
         session.add(item)
         await session.commit()
+        await refresh_reference()
         return {'data': {'id': item.id, 'name': item.name}, 'status': 200, 'message': "Industry saved successfully.", 'error': None}
     except Exception as err:
         return await handle_exceptions(session, {}, err, "The industry has not been created.")
 
 @router.get("/", response_model=IndustryResponse)
 async def get_industry(
+        request: Request,
         order: OrderEnum = Query(
         default=OrderEnum.asc,
         description="Порядок сортировки: asc (по возрастание) или desc (по убывание)"
     ),
-        session: AsyncSession = Depends(get_async_session)
     ):
-    try:
-        stmt = select(Industry)
-        if order == OrderEnum.desc:
-            stmt = stmt.order_by(Industry.id.desc())
-        else:
-            stmt = stmt.order_by(Industry.id)
-
-        industry = (
-            await session.execute(stmt)
-        ).scalars().all()
-
-        return {'data': [{'id': item.id, 'name': item.name} for item in industry], 'status': 200, 'message': None, 'error': None}
-    except Exception as err:
-        return await handle_exceptions(session, [], err, "The industry has not been responsed.")
+    # из снимка справочников, без базы; пересобирается после записи ниже
+    snapshot = await reference_store.get()
+    if order == OrderEnum.desc:
+        return prepared_response(request, snapshot.industries_desc)
+    return prepared_response(request, snapshot.industries_asc)
 
 @router.put("/{industry_id}", response_model=IndustryResponse)
 async def update_industry(
@@ -88,6 +81,7 @@ async def update_industry(
 
         await session.commit()
         await session.refresh(item)
+        await refresh_reference()
         return {'data': {'id': item.id, 'name': item.name}, 'status': 200, 'message': "Industry updated successfully.", 'error': None}
     except Exception as err:
         return await handle_exceptions(session, {}, err, "The industry has not been updated.")
@@ -108,8 +102,7 @@ async def create_industry(
         
         await session.delete(item)
         await session.commit()
-
-        await session.commit()
+        await refresh_reference()
         return {'data': {}, 'status': 200, 'message': "Industry deleted successfully.", 'error': None}
     except Exception as err:
         return await handle_exceptions(session, {}, err, "The industry has not been deleted.")
\ No newline at end of file
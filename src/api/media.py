@@ -0,0 +1,110 @@
+import os
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from src.core.files import IMAGES_ROOT
+from src.core.http_cache import etag_matches, not_modified
+
+router = APIRouter(prefix="/media/img", tags=['Media'])
+
+# имена файлов содержат sha256 содержимого — по одному URL содержимое не меняется никогда
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MEDIA_TYPES = {".jpg": "image/jpeg", ".png": "image/png", ".webp": "image/webp"}
+# варианты того же имени, которые отдаём вместо JPEG/PNG, если клиент их принимает;
+# копии пишет src/core/files.py (RENDITIONS) — AVIF там не генерируется
+NEGOTIATED = (("image/webp", ".webp"),)
+
+_images_root = IMAGES_ROOT.resolve()
+
+class SendfileResponse(FileResponse):
+    # Без Range отдаём файл через расширение сервера (pathsend / zerocopysend),
+    # если оно есть; иначе — обычное чтение кусками из FileResponse.
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        plain = scope["method"].upper() == "GET" and "range" not in Headers(scope=scope)
+        if not plain or not ({"http.response.pathsend", "http.response.zerocopysend"} & extensions.keys()):
+            return await super().__call__(scope, receive, send)
+
+        stat_result = os.stat(self.path)
+        self.set_stat_headers(stat_result)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+        else:
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file.fileno(),
+                    "count": stat_result.st_size,
+                })
+        if self.background is not None:
+            await self.background()
+
+def _resolve(path: str) -> Path | None:
+    file = (_images_root / path).resolve()
+    if _images_root not in file.parents or not file.is_file():
+        return None
+    return file
+
+def _parse_accept(accept: str) -> dict[str, float]:
+    # "image/webp,image/*;q=0.8" -> {"image/webp": 1.0, "image/*": 0.8}
+    ranges = {}
+    for item in accept.split(","):
+        media_range, *params = item.split(";")
+        media_range = media_range.strip().lower()
+        if not media_range:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    q = 0.0
+        ranges[media_range] = max(q, ranges.get(media_range, 0.0))
+    return ranges
+
+def _quality(ranges: dict[str, float], media_type: str) -> float:
+    # самый точный диапазон побеждает: image/webp, затем image/*, затем */*
+    for key in (media_type, media_type.split("/")[0] + "/*", "*/*"):
+        if key in ranges:
+            return ranges[key]
+    return 0.0
+
+def _negotiate(file: Path, accept: str) -> Path:
+    if file.suffix not in (".jpg", ".png") or not accept:
+        return file
+    ranges = _parse_accept(accept)
+    original_q = _quality(ranges, MEDIA_TYPES[file.suffix]) if ranges else 1.0
+    for media_type, ext in NEGOTIATED:
+        # только явно названный тип: "*/*" от curl и ботов получает оригинал
+        q = ranges.get(media_type, 0.0)
+        if q > 0 and q >= original_q:
+            candidate = file.with_suffix(ext)
+            if candidate.is_file():
+                return candidate
+    return file
+
+@router.api_route("/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_media_image(path: str, request: Request):
+    file = _resolve(path)
+    if file is None:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    served = _negotiate(file, request.headers.get("accept", ""))
+    etag = f'"{served.name}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if file.suffix in (".jpg", ".png"):
+        headers["Vary"] = "Accept"
+
+    if etag_matches(request, etag):
+        response = not_modified(etag, IMMUTABLE_CACHE_CONTROL)
+        if "Vary" in headers:
+            response.headers["Vary"] = headers["Vary"]
+        return response
+    return SendfileResponse(served, media_type=MEDIA_TYPES.get(served.suffix), headers=headers)
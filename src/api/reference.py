@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Request
+
+from src.core.reference import reference_store, prepared_response
+
+router = APIRouter(prefix="/reference", tags=['Reference data'])
+
+@router.get("/", description="Mámleketler, regionlar, industriyalar hám tiller bir juwapta")
+async def get_reference_bundle(request: Request):
+    # data.version — хэш содержимого; ETag меняется вместе с ним
+    snapshot = await reference_store.get()
+    return prepared_response(request, snapshot.bundle)
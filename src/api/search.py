@@ -0,0 +1,131 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select, func, literal, literal_column, union_all, tuple_, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.auth import API_KEY, api_key_header, get_current_principal
+from src.core.cursor import encode_cursor, decode_cursor
+from src.database import get_async_session
+from src.models.vacancy import JobVacancy, Internship, OneTimeTask, OpportunitiesGrants, StatusEnum
+from src.logs.error_handler import handle_exceptions
+
+router = APIRouter(prefix="/search", tags=['Поиск'])
+
+# та же конфигурация, что и в search_vector (SEARCH_DOCUMENTS)
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+SNIPPET_LENGTH = 120
+
+SEARCH_MODELS = {
+    "job_vacancies": (JobVacancy, JobVacancy.position_title),
+    "internship": (Internship, Internship.position_title),
+    "one_time_task": (OneTimeTask, OneTimeTask.who_needed),
+    "opportunities_grants": (OpportunitiesGrants, func.left(OpportunitiesGrants.content, SNIPPET_LENGTH)),
+}
+
+# WebApp приходит с Bearer-токеном, админка — с X-API-Key
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/telegram/webapp/auth", auto_error=False)
+
+async def search_access(
+        x_api_key: str | None = Depends(api_key_header),
+        token: str | None = Depends(optional_oauth2_scheme),
+        session: AsyncSession = Depends(get_async_session),
+    ) -> bool:
+    # True — админка (все статусы), False — пользователь WebApp (только APPROVED)
+    if x_api_key is not None:
+        if x_api_key != API_KEY:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+        return True
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    await get_current_principal(token, session)
+    return False
+
+@router.get("/", description="Barlıq vakansiya túrleri boyınsha tekst penen izlew")
+async def search_vacancies(
+        q: str = Query(..., min_length=2, max_length=200, description="Izlew sózi (websearch sintaksisi)"),
+        types: list[str] | None = Query(None, description="job_vacancies | internship | one_time_task | opportunities_grants"),
+        country_id: int | None = Query(None),
+        region_id: int | None = Query(None),
+        vacancy_status: StatusEnum | None = Query(None, alias="status", description="Tek admin paneli ushın"),
+        date_from: date | None = Query(None, description="Начало периода, включительно"),
+        date_to: date | None = Query(None, description="Конец периода, не включительно"),
+        cursor: str | None = Query(None, description="Aldıńǵı bettiń next_cursor mánisi"),
+        limit: int = Query(20, ge=1, le=100),
+        is_admin: bool = Depends(search_access),
+        session: AsyncSession = Depends(get_async_session),
+    ):
+    selected = types or list(SEARCH_MODELS)
+    unknown = [t for t in selected if t not in SEARCH_MODELS]
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown types: {', '.join(unknown)}")
+    after = decode_cursor(cursor, float, str, int) if cursor else None
+
+    # пользователи WebApp видят только опубликованное
+    if not is_admin:
+        vacancy_status = StatusEnum.APPROVED
+
+    try:
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        branches = []
+        for vacancy_type in selected:
+            model, title = SEARCH_MODELS[vacancy_type]
+            stmt = (
+                select(
+                    literal(vacancy_type).label("type"),
+                    model.id,
+                    func.ts_rank(model.search_vector, query).cast(Float).label("rank"),
+                    title.label("title"),
+                    model.country_id,
+                    model.region_id,
+                    model.status,
+                    model.created_at,
+                )
+                .where(model.search_vector.op("@@")(query))
+                .where(model.is_delete == False)
+            )
+            if country_id is not None:
+                stmt = stmt.where(model.country_id == country_id)
+            if region_id is not None:
+                stmt = stmt.where(model.region_id == region_id)
+            if vacancy_status is not None:
+                stmt = stmt.where(model.status == vacancy_status)
+            if date_from is not None:
+                stmt = stmt.where(model.created_at >= date_from)
+            if date_to is not None:
+                stmt = stmt.where(model.created_at < date_to)
+            branches.append(stmt)
+
+        # один запрос по всем таблицам; порядок (rank, type, id) однозначен — на нём и курсор
+        found = union_all(*branches).subquery("found")
+        stmt = select(found).order_by(found.c.rank.desc(), found.c.type.desc(), found.c.id.desc())
+        if after is not None:
+            stmt = stmt.where(tuple_(found.c.rank, found.c.type, found.c.id) < tuple_(*after))
+
+        rows = (await session.execute(stmt.limit(limit + 1))).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        result = [
+            {
+                "type": row.type,
+                "id": row.id,
+                "rank": row.rank,
+                "title": row.title,
+                "country_id": row.country_id,
+                "region_id": row.region_id,
+                "status": row.status.value,
+                "created_at": row.created_at,
+            }
+            for row in rows
+        ]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].type, rows[-1].id) if has_more else None
+
+        return {'data': result, 'next_cursor': next_cursor, 'status': 200, 'message': None, 'error': None}
+    except Exception as err:
+        return await handle_exceptions(session, {}, err, "Search error")
@@ -1,17 +1,29 @@
-import aiohttp
+import asyncio
+import os
+from datetime import date, datetime, timedelta
+from enum import Enum
 from fastapi import APIRouter, Depends, Query, Response, Request
-from pathlib import Path
+from fastapi.responses import FileResponse
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, extract
-from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, func, extract, literal_column, union_all, tuple_, true
 
-from src.core.bot import BotConfig, get_bot_config
+from src.core.bot import BotConfig, get_bot_config, bot_metrics
 from src.models.users import Users, Clients
-from src.models.vacancy import JobVacancy, Internship, OneTimeTask, OpportunitiesGrants, StatusEnum
+from src.models.vacancy import JobVacancy, Internship, OneTimeTask, OpportunitiesGrants, StatusEnum, TITLE_COLUMNS
 from src.models.industry import Industry
-from src.database import get_async_session
+from src.models.statistic import VacancyCounters
+from src.models.media import MediaObject, MediaGcRun
+from src.models.post_index import PostIndex
+from src.models.load_plans import user_profile_plan, vacancy_detail_plan
+from src.database import get_async_session, get_session_factory
 from src.core.auth import require_api_key
+from src.core.avatars import (
+    AVATAR_CACHE_CONTROL, DEFAULT_AVATAR, DEFAULT_AVATAR_ETAG, avatar_etag, avatar_path, get_avatar
+)
+from src.core.http_cache import etag_matches, not_modified
+from src.core.exports import ExportFormat, ndjson_response, csv_response, xlsx_response
+from src.core.cursor import encode_cursor, decode_cursor
 from src.schemas.statistic import GetUserPost, GetUserProfile, StatVacancyOut, StatVacancyMonthOut
 from src.schemas.industry import IndustryResponse
 from src.logs.error_handler import handle_exceptions
@@ -37,6 +49,9 @@ COLORS = {
     "opportunities_grants": "#48d3ff"
 }
 
+# длина подписи последнего поста в /client/posts
+CLIENT_POST_SNIPPET = 15
+
 ELEMENTARY_MODELS = {
     "job_vacancies": JobVacancy,
     "internship": Internship,
@@ -89,28 +104,96 @@ async def get_vacancy_tabs(authorized: bool = Depends(require_api_key)):
 
     return {'data': {'tabs': TABS, 'offical': TAB_NAMES}, 'status': 200, 'message': None, 'error': None}
 
-@router.get('/vacancies', response_model=StatVacancyOut)
-async def vacancy_stat(session: AsyncSession = Depends(get_async_session), authorized: bool = Depends(require_api_key)):
-    try:
-        MODELS = [JobVacancy, Internship, OneTimeTask, OpportunitiesGrants]
-        
-        results = []
+@router.get('/bot', description="Telegram Bot API client metrics")
+async def get_bot_metrics(authorized: bool = Depends(require_api_key)):
+    return {'data': bot_metrics.as_dict(), 'status': 200, 'message': None, 'error': None}
 
-        for item in MODELS:
-            total = await session.scalar(select(func.count()).select_from(item))
-            approved = await session.scalar(
-                select(func.count()).select_from(item).where(item.status == StatusEnum.APPROVED)
+@router.get('/media', description="Media fayllar: saqlanǵan, siltemesiz ha'm GC azat etken orın")
+async def get_media_stat(
+        session: AsyncSession = Depends(get_async_session),
+        authorized: bool = Depends(require_api_key),
+    ):
+    try:
+        stored = (await session.execute(
+            select(
+                func.count().label('objects'),
+                func.coalesce(func.sum(MediaObject.size), 0).label('bytes'),
+                func.count().filter(MediaObject.refcount == 0).label('orphans'),
+                func.coalesce(func.sum(MediaObject.size).filter(MediaObject.refcount == 0), 0).label('orphan_bytes'),
+                func.coalesce(func.sum(MediaObject.refcount), 0).label('references'),
             )
-            rejected = await session.scalar(
-                select(func.count()).select_from(item).where(item.status == StatusEnum.REJECTED)
+        )).one()
+        reclaimed = (await session.execute(
+            select(
+                func.count().label('runs'),
+                func.coalesce(func.sum(MediaGcRun.files_removed), 0).label('files'),
+                func.coalesce(func.sum(MediaGcRun.bytes_reclaimed), 0).label('bytes'),
             )
+        )).one()
+        runs = (await session.execute(
+            select(MediaGcRun).order_by(MediaGcRun.id.desc()).limit(20)
+        )).scalars().all()
 
+        return {'data': {
+            'stored': {
+                'objects': stored.objects,
+                'bytes': stored.bytes,
+                'references': stored.references,
+                # ссылок больше, чем объектов, — столько копий не записано на диск
+                'deduplicated': max(stored.references - (stored.objects - stored.orphans), 0),
+            },
+            'unreferenced': {'objects': stored.orphans, 'bytes': stored.orphan_bytes},
+            'reclaimed': {'runs': reclaimed.runs, 'files': reclaimed.files, 'bytes': reclaimed.bytes},
+            'recent_runs': [
+                {
+                    'started_at': run.started_at,
+                    'finished_at': run.finished_at,
+                    'files_removed': run.files_removed,
+                    'bytes_reclaimed': run.bytes_reclaimed,
+                }
+                for run in runs
+            ],
+        }, 'status': 200, 'message': None, 'error': None}
+    except Exception as err:
+        return await handle_exceptions(session, {}, err, "Media stat error!")
+
+async def aggregate_vacancy_counts(session: AsyncSession) -> dict[str, tuple[int, int, int]]:
+    # Точный пересчёт одним запросом: UNION ALL по четырём таблицам с FILTER
+    stmt = union_all(*[
+        select(
+            literal_column(f"'{model.__tablename__}'").label('code'),
+            func.count().label('total'),
+            func.count().filter(model.status == StatusEnum.APPROVED).label('approved'),
+            func.count().filter(model.status == StatusEnum.REJECTED).label('rejected'),
+        )
+        for model in ELEMENTARY_MODELS.values()
+    ])
+    rows = await session.execute(stmt)
+    return {row.code: (row.total, row.approved, row.rejected) for row in rows}
+
+@router.get('/vacancies', response_model=StatVacancyOut)
+async def vacancy_stat(
+        exact: bool = Query(False, description="Пересчитать по таблицам вместо счётчиков"),
+        session: AsyncSession = Depends(get_async_session),
+        authorized: bool = Depends(require_api_key)
+    ):
+    try:
+        counts = {}
+        if not exact:
+            rows = (await session.execute(select(VacancyCounters))).scalars().all()
+            counts = {row.code: (row.total, row.approved, row.rejected) for row in rows}
+        if len(counts) < len(ELEMENTARY_MODELS):
+            counts = await aggregate_vacancy_counts(session)
+
+        results = []
+        for code in ELEMENTARY_MODELS:
+            total, approved, rejected = counts.get(code, (0, 0, 0))
             results.append({
-                'code': f"{item.__table__.name}",
-                'title': MODEL_TITLES[item.__table__.name],
+                'code': code,
+                'title': MODEL_TITLES[code],
                 'length': total or 0,
-                'icon': ICONS[item.__table__.name],
-                'color': COLORS[item.__table__.name],
+                'icon': ICONS[code],
+                'color': COLORS[code],
                 'approved': approved or 0,
                 'rejected': rejected or 0
             })
@@ -119,32 +202,75 @@ async def vacancy_stat(session: AsyncSession = Depends(get_async_session), autho
     except Exception as err:
         return {'data': [], 'status': 500, 'message': f"Server error", 'error': f"{err}"}
     
+class Granularity(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+MAX_SERIES_POINTS = 1000
+
+def _bucket_start(value: datetime, granularity: Granularity) -> datetime:
+    value = datetime(value.year, value.month, value.day)
+    if granularity == Granularity.week:
+        return value - timedelta(days=value.weekday())
+    if granularity == Granularity.month:
+        return value.replace(day=1)
+    return value
+
+def _next_bucket(value: datetime, granularity: Granularity) -> datetime:
+    if granularity == Granularity.day:
+        return value + timedelta(days=1)
+    if granularity == Granularity.week:
+        return value + timedelta(weeks=1)
+    return value.replace(year=value.year + value.month // 12, month=value.month % 12 + 1)
+
 @router.get('/vacancies/elementary/{stat_code}', response_model=StatVacancyMonthOut)
-async def vacancy_stat_elementary(stat_code: str, session: AsyncSession = Depends(get_async_session), authorized: bool = Depends(require_api_key)):
+async def vacancy_stat_elementary(
+        stat_code: str,
+        year: int | None = Query(None, description="Год (по умолчанию текущий)"),
+        date_from: date | None = Query(None, description="Начало периода, включительно"),
+        date_to: date | None = Query(None, description="Конец периода, не включительно"),
+        granularity: Granularity = Query(Granularity.month, description="day | week | month"),
+        session: AsyncSession = Depends(get_async_session),
+        authorized: bool = Depends(require_api_key)
+    ):
     try:
         MODEL = ELEMENTARY_MODELS.get(stat_code)
         
         if not MODEL:
             return {'data': [], 'status': 404, 'message': "Wrong stat type", 'error': None}
 
-        result = [{'month': i, 'value': 0} for i in range(1, 13)]
-
+        by_year = date_from is None and date_to is None
+        if by_year:
+            year = year or datetime.now().year
+            start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+        else:
+            if date_from is None or date_to is None or date_from >= date_to:
+                return {'data': [], 'status': 400, 'message': "date_from and date_to are both required, date_from < date_to", 'error': None}
+            start = datetime.combine(date_from, datetime.min.time())
+            end = datetime.combine(date_to, datetime.min.time())
+
+        buckets = []
+        cursor = _bucket_start(start, granularity)
+        while cursor < end:
+            buckets.append(cursor)
+            cursor = _next_bucket(cursor, granularity)
+            if len(buckets) > MAX_SERIES_POINTS:
+                return {'data': [], 'status': 400, 'message': "Too many points, use a larger granularity", 'error': None}
+
+        # диапазон по created_at, а не extract(year) — так работает индекс
+        bucket = func.date_trunc(granularity.value, MODEL.created_at).label('bucket')
         query = (
-            select(
-                func.extract('month', MODEL.created_at).label('month'),
-                func.count().label('total')
-            )
-            .where(func.extract('year', MODEL.created_at) == 2025)
-            .group_by('month')
-            .order_by('month')
+            select(bucket, func.count().label('total'))
+            .where(MODEL.created_at >= start, MODEL.created_at < end)
+            .group_by(bucket)
         )
+        totals = {row.bucket: row.total for row in await session.execute(query)}
 
-        rows = await session.execute(query)
-
-        for month, total in rows:
-            for i in result:
-                if i['month'] == int(month):
-                    i['value'] = total
+        if by_year and granularity == Granularity.month:
+            result = [{'month': b.month, 'value': totals.get(b, 0)} for b in buckets]
+        else:
+            result = [{'period': b.date(), 'value': totals.get(b, 0)} for b in buckets]
 
         return {'data': result, 'status': 200, 'message': None, 'error': None}
     except Exception as err:
@@ -197,33 +323,57 @@ async def get_industry_stat(
     except Exception as err:
         return await handle_exceptions(session, [], err, "Industry stat error!")
     
+USERS_EXPORT_COLUMNS = ['id', 'telegram_id', 'full_name', 'company_name', 'contact']
+
 @router.get("/users")
 async def get_users_stat_list(
+        after_id: int | None = Query(None, description="Aldıńǵı bettiń next_after_id mánisi"),
+        limit: int = Query(100, ge=1, le=1000),
+        output: ExportFormat = Query(ExportFormat.json, alias="format"),
         session: AsyncSession = Depends(get_async_session),
+        session_factory: async_sessionmaker = Depends(get_session_factory),
         authorized: bool = Depends(require_api_key),
     ):
     try:
-        users = (await session.execute(
-            select(Users).order_by(Users.id)
-        )).scalars().all()
-
-
-        result = []
-        for user in users:
-            client = user.client
-
-            result.append({
-                'id': user.id,
-                'telegram_id': user.telegram_id,
-                'full_name': user.full_name,
-                'company_name': client.company_name,
-                'contact': user.contact
-            })
+        # только нужные колонки, без загрузки ORM-объектов Users/Clients
+        stmt = (
+            select(Users.id, Users.telegram_id, Users.full_name, Clients.company_name, Users.contact)
+            .outerjoin(Clients, Clients.user_id == Users.id)
+            .order_by(Users.id)
+        )
+        if after_id is not None:
+            stmt = stmt.where(Users.id > after_id)
+
+        # полная выгрузка потоком, страницы не применяются
+        if output == ExportFormat.ndjson:
+            return ndjson_response(session_factory, stmt, USERS_EXPORT_COLUMNS, "users")
+        if output == ExportFormat.csv:
+            return csv_response(session_factory, stmt, USERS_EXPORT_COLUMNS, "users")
+        if output == ExportFormat.xlsx:
+            return await xlsx_response(session_factory, stmt, USERS_EXPORT_COLUMNS, "users")
+
+        rows = (await session.execute(stmt.limit(limit + 1))).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        result = [dict(zip(USERS_EXPORT_COLUMNS, row)) for row in rows]
 
-        return {'data': result, 'status': 200, 'message': None, 'error': None}
+        return {
+            'data': result,
+            'next_after_id': rows[-1].id if has_more else None,
+            'status': 200, 'message': None, 'error': None
+        }
     except Exception as err:
         return await handle_exceptions(session, {}, err, "Error in users list")
 
+def _default_avatar_response(request: Request) -> Response:
+    if etag_matches(request, DEFAULT_AVATAR_ETAG):
+        return not_modified(DEFAULT_AVATAR_ETAG, AVATAR_CACHE_CONTROL)
+    return Response(
+        DEFAULT_AVATAR,
+        media_type="image/png",
+        headers={"ETag": DEFAULT_AVATAR_ETAG, "Cache-Control": AVATAR_CACHE_CONTROL},
+    )
+
 @router.get("/photo/{telegram_id}")
 async def get_photo_with_file_id(
         telegram_id: int,
@@ -231,29 +381,33 @@ async def get_photo_with_file_id(
         authorized: bool = Depends(require_api_key),
         botcfg: BotConfig = Depends(get_bot_config)
     ):
-    bot = await botcfg.getBot()
-    base_url = str(request.base_url).rstrip("/")
-    default_path = Path(__file__).resolve().parent.parent / "media" / "userprofile.png"
     try:
-        chat = await bot.get_chat(telegram_id)
-
-        if chat.photo:
-            file = await bot.get_file(chat.photo.big_file_id)
-            photo_url = f"https://api.telegram.org/file/bot{bot.token}/{file.file_path}"
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(photo_url) as resp:
-                    content = await resp.read()
-            return Response(content, media_type="image/jpeg")
-        else:
-            with open(default_path, "rb") as f:
-                content = f.read()
-            return Response(content, media_type="image/png")
+        bot = await botcfg.getBot()
+        file_unique_id = await get_avatar(bot, telegram_id)
     except Exception as err:
         print(f"[get_photo_with_file_id] Error: {err}")
-        with open(default_path, "rb") as f:
-            content = f.read()
-        return Response(content, media_type="image/png")
+        return _default_avatar_response(request)
+
+    if file_unique_id is None:
+        return _default_avatar_response(request)
+
+    etag = avatar_etag(file_unique_id)
+    if etag_matches(request, etag):
+        return not_modified(etag, AVATAR_CACHE_CONTROL)
+
+    path = avatar_path(file_unique_id)
+    try:
+        # файл мог удалить sweep после get_avatar
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except OSError as err:
+        print(f"[get_photo_with_file_id] Cached avatar unavailable: {err}")
+        return _default_avatar_response(request)
+    return FileResponse(
+        path,
+        stat_result=stat_result,
+        media_type="image/jpeg",
+        headers={"ETag": etag, "Cache-Control": AVATAR_CACHE_CONTROL},
+    )
 
 @router.post("/user/profile")
 async def get_one_user(
@@ -267,7 +421,7 @@ async def get_one_user(
                 select(Users)
                 .where(Users.id == payload.id)
                 .where(Users.telegram_id == payload.telegram_id)
-                .options(selectinload(Users.client))
+                .options(*user_profile_plan())
             )
         ).scalar_one_or_none()
 
@@ -304,6 +458,64 @@ async def get_one_user(
     except Exception as err:
         return await handle_exceptions(session, {}, err, "Get profile error!")
 
+@router.get("/posts", description="Barlıq túrdegi postlar bir dizimde: lenta, moderaciya gezegi, avtor tariyxı")
+async def get_posts_feed(
+        author_id: int | None = Query(None),
+        vacancy_status: StatusEnum | None = Query(None, alias="status"),
+        country_id: int | None = Query(None),
+        region_id: int | None = Query(None),
+        vacancy_type: str | None = Query(None, alias="type", description="job_vacancies | internship | one_time_task | opportunities_grants"),
+        cursor: str | None = Query(None, description="Aldıńǵı bettiń next_cursor mánisi"),
+        limit: int = Query(50, ge=1, le=500),
+        session: AsyncSession = Depends(get_async_session),
+        authorized: bool = Depends(require_api_key),
+    ):
+    if vacancy_type is not None and vacancy_type not in ELEMENTARY_MODELS:
+        return {'data': [], 'status': 404, 'message': "Wrong vacancy type.", 'error': None}
+    after = decode_cursor(cursor, datetime.fromisoformat, str, int) if cursor else None
+
+    try:
+        # один диапазон по индексам post_index вместо четырёх запросов к таблицам вакансий
+        stmt = select(PostIndex).order_by(
+            PostIndex.created_at.desc(), PostIndex.type.desc(), PostIndex.id.desc()
+        )
+        if author_id is not None:
+            stmt = stmt.where(PostIndex.author_id == author_id)
+        if vacancy_status is not None:
+            stmt = stmt.where(PostIndex.status == vacancy_status)
+        if country_id is not None:
+            stmt = stmt.where(PostIndex.country_id == country_id)
+        if region_id is not None:
+            stmt = stmt.where(PostIndex.region_id == region_id)
+        if vacancy_type is not None:
+            stmt = stmt.where(PostIndex.type == vacancy_type)
+        if after is not None:
+            stmt = stmt.where(tuple_(PostIndex.created_at, PostIndex.type, PostIndex.id) < tuple_(*after))
+
+        rows = (await session.execute(stmt.limit(limit + 1))).scalars().all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        result = [
+            {
+                "type": post.type,
+                "id": post.id,
+                "author_id": post.author_id,
+                "country_id": post.country_id,
+                "region_id": post.region_id,
+                "status": post.status.value,
+                "created_at": post.created_at,
+                "title": post.title_snippet,
+            }
+            for post in rows
+        ]
+        last = rows[-1] if has_more else None
+        next_cursor = encode_cursor(last.created_at.isoformat(), last.type, last.id) if last else None
+
+        return {'data': result, 'next_cursor': next_cursor, 'status': 200, 'message': None, 'error': None}
+    except Exception as err:
+        return await handle_exceptions(session, {}, err, "Get posts feed error!")
+
 @router.post("/client/posts")
 async def get_client_posts_list(
         payload: GetUserProfile,
@@ -311,50 +523,70 @@ async def get_client_posts_list(
         authorized: bool = Depends(require_api_key),
     ):
     try:
-        user = (await session.execute(
-                select(Users)
-                .where(Users.id == payload.id)
-                .where(Users.telegram_id == payload.telegram_id)
-                .options(selectinload(Users.client))
+        # Один запрос: по каждому типу LATERAL — последний живой пост автора и
+        # счётчики по статусам (удалённые не считаются, как и в /posts).
+        # Оба читаются из частичного (author_id, id DESC) INCLUDE (status).
+        columns = [Users.id.label("user_id")]
+        laterals = []
+        for name, model in ELEMENTARY_MODELS.items():
+            latest = (
+                select(
+                    model.id,
+                    func.left(TITLE_COLUMNS[name], CLIENT_POST_SNIPPET).label("name"),
+                    model.created_at,
+                )
+                .where(model.author_id == Users.id)
+                .where(model.is_delete == False)
+                .order_by(model.id.desc())
+                .limit(1)
+                .lateral(f"{name}_latest")
             )
-        ).scalar_one_or_none()
-
-        if not user or not user.client:
-            return {'data': {}, 'status': 404, 'message': "Client not found.", 'error': None}
-        
-        MODELS = [JobVacancy, Internship, OneTimeTask, OpportunitiesGrants]
-        result = {}
-
-        for model in MODELS:
-            slt = slice(15)
-
-            job = (
-                await session.execute(
-                    select(model)
-                    .where(model.author_id == user.id)
-                    .order_by(model.id.desc())
-                    .limit(1)
+            counts = (
+                select(
+                    func.count().label("total"),
+                    *(func.count().filter(model.status == st).label(st.value) for st in StatusEnum),
                 )
-            ).scalars().first()
+                .where(model.author_id == Users.id)
+                .where(model.is_delete == False)
+                .lateral(f"{name}_counts")
+            )
+            laterals.append((latest, counts))
+            columns += [
+                latest.c.id.label(f"{name}_id"),
+                latest.c.name.label(f"{name}_name"),
+                latest.c.created_at.label(f"{name}_created_at"),
+                counts.c.total.label(f"{name}_total"),
+                *(counts.c[st.value].label(f"{name}_{st.value}") for st in StatusEnum),
+            ]
 
-            if job:
-                name_field = (
-                    getattr(job, "position_title", None)
-                    or getattr(job, "who_needed", None)
-                    or getattr(job, "content", None)
-                )
+        stmt = (
+            select(*columns)
+            .select_from(Users)
+            .join(Clients, Clients.user_id == Users.id)
+            .where(Users.id == payload.id)
+            .where(Users.telegram_id == payload.telegram_id)
+        )
+        for latest, counts in laterals:
+            stmt = stmt.outerjoin(latest, true()).join(counts, true())
 
-                name = name_field[slt] if name_field else "Untitled"
+        row = (await session.execute(stmt)).mappings().one_or_none()
+        if row is None:
+            return {'data': {}, 'status': 404, 'message': "Client not found.", 'error': None}
 
-                result[model.__tablename__] = {
-                    "id": job.id,
-                    "name": name,
-                    "created_at": job.created_at,
-                }
-            else:
-                result[model.__tablename__] = None
+        result = {}
+        counts = {}
+        for name in ELEMENTARY_MODELS:
+            result[name] = {
+                "id": row[f"{name}_id"],
+                "name": row[f"{name}_name"] or "Untitled",
+                "created_at": row[f"{name}_created_at"],
+            } if row[f"{name}_id"] is not None else None
+            counts[name] = {
+                "total": row[f"{name}_total"],
+                **{st.value: row[f"{name}_{st.value}"] for st in StatusEnum},
+            }
 
-        return {'data': result, 'status': 200, 'message': None, 'error': None}
+        return {'data': result, 'counts': counts, 'status': 200, 'message': None, 'error': None}
     except Exception as err:
         return await handle_exceptions(session, {}, err, "Get posts error!")
     
@@ -373,6 +605,7 @@ async def get_client_post(
             await session.execute(
                 select(MODEL)
                 .where(MODEL.id == payload.id)
+                .options(*vacancy_detail_plan(MODEL))
                 .limit(1)
             )
         ).scalars().first()
@@ -3,16 +3,18 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from pydantic import BaseModel
 
 from src.core.bot import BotConfig, get_bot_config
 from src.database import get_async_session
 from src.core.telegram_webapp import verify_init_data
-from src.core.jwt import create_access_token, create_refresh_token
+from src.core.tokens import issue_token_pair, rotate_refresh_token
 from src.models.users import Users, Clients
-from src.schemas.users import CreateAccountForm, IsAuthUser, TelegramWebAppAuthIn, TokenPairOut, UpdateProfile, UpdateUserLanguage, GeneralProfileOut
-from src.core.auth import get_current_user, require_api_key
+from src.models.load_plans import user_profile_plan
+from src.schemas.users import CreateAccountForm, IsAuthUser, TelegramWebAppAuthIn, RefreshTokenIn, TokenPairOut, UpdateProfile, UpdateUserLanguage, GeneralProfileOut
+from src.core.auth import Principal, get_current_principal, get_current_user, invalidate_principal, require_api_key
 from src.logs.error_handler import handle_exceptions
 
 router = APIRouter(prefix="/users", tags=['Authorization'])
@@ -23,40 +25,81 @@ class ResponseOut(BaseModel):
     message: str | None
     error: str | None
 
+async def load_user_profile(session: AsyncSession, user_id: int) -> Users:
+    res = await session.execute(
+        select(Users)
+        .where(Users.id == user_id)
+        .options(*user_profile_plan())
+        .execution_options(populate_existing=True)
+    )
+    return res.scalar_one()
+
+async def upsert_telegram_user(session: AsyncSession, telegram_id: int, language_code: str | None = None):
+    # Повторный вход — только чтение: пользователь и его Clients уже есть.
+    # Первый вход — INSERT ... ON CONFLICT DO NOTHING RETURNING. Если строку
+    # вставил параллельный запрос, RETURNING пуст, и её находит повторный SELECT
+    # (в READ COMMITTED у него новый снимок). Существующие строки не перезаписываются.
+    found = (
+        select(Users.id, Users.telegram_id, Clients.id.label("client_id"))
+        .outerjoin(Clients, Clients.user_id == Users.id)
+        .where(Users.telegram_id == telegram_id)
+    )
+    user = (await session.execute(found)).one_or_none()
+    if user is None:
+        inserted = (await session.execute(
+            pg_insert(Users)
+            .values(telegram_id=telegram_id, language_code=language_code)
+            .on_conflict_do_nothing(index_elements=[Users.telegram_id])
+            .returning(Users.id, Users.telegram_id)
+        )).one_or_none()
+        if inserted is not None:
+            await session.execute(
+                pg_insert(Clients)
+                .values(user_id=inserted.id)
+                .on_conflict_do_nothing(index_elements=[Clients.user_id])
+            )
+            return inserted
+        user = (await session.execute(found)).one()
+    if user.client_id is None:
+        await session.execute(
+            pg_insert(Clients)
+            .values(user_id=user.id)
+            .on_conflict_do_nothing(index_elements=[Clients.user_id])
+        )
+    return user
+
 @router.post("/telegram/webapp/auth", description="InitData ja'rdeminde access token ha'm refresh token alinadi", response_model=TokenPairOut)
 async def telegram_webapp_auth(body: TelegramWebAppAuthIn, session: AsyncSession = Depends(get_async_session)):
     try:
         verified = verify_init_data(body.init_data)
         tg = verified.get("user")
         tg_id = int(tg["id"])
-        res = await session.execute(select(Users).where(Users.telegram_id == tg_id))
-        user = res.scalar_one_or_none()
+        user = await upsert_telegram_user(session, tg_id)
 
-        if not user:
-            try:
-                user = Users(telegram_id=tg_id)
-                session.add(user)
-                await session.flush()
-                session.add(Clients(user_id=user.id))
-                await session.commit()
-            except Exception as err:
-                print(f"Server error: {err}")
-                await session.rollback()
-                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Cannot create user")
-        else:
-            cres = await session.execute(select(Clients).where(Clients.user_id == user.id))
-            if not cres.scalar_one_or_none():
-                session.add(Clients(user_id=user.id))
-                await session.commit()
-        
-        access = await create_access_token({"user_id": user.id, "telegram_id": user.telegram_id})
-        refresh = await create_refresh_token({"user_id": user.id, "telegram_id": user.telegram_id})
-        return {"access_token": access, "refresh_token": refresh, "token_type": "bearer"}
+        tokens = await issue_token_pair(session, user.id, user.telegram_id)
+        await session.commit()
+        return tokens
     except Exception as err:
         await session.rollback()
         print(f"Server error: {err}")
         raise HTTPException(status_code=500, detail=f"Internal server error.")
 
+@router.post("/token/refresh", description="Refresh token ja'rdeminde jan'a access token ha'm refresh token alinadi", response_model=TokenPairOut)
+async def refresh_token_pair(body: RefreshTokenIn, session: AsyncSession = Depends(get_async_session)):
+    try:
+        tokens = await rotate_refresh_token(session, body.refresh_token)
+    except SQLAlchemyError as err:
+        await session.rollback()
+        print(f"Server error: {err}")
+        raise HTTPException(status_code=500, detail="Internal database error.")
+    if not tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token is invalid, expired or already used",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return tokens
+
 @router.post("/telegram/bot/auth", description="Bot ushin api")
 async def telegram_auth(
         payload: CreateAccountForm,
@@ -68,16 +111,7 @@ async def telegram_auth(
         bot_id = await botcfg.get_id()
         if payload.bot_id != bot_id:
             raise HTTPException(status_code=400, detail="Siz basqa bottan soraw jolladin'iz!")
-        user = Users(
-            telegram_id=payload.user_id,
-            language_code=payload.language_code
-        )
-        session.add(user)
-        await session.flush()
-        client = Clients(
-            user_id=user.id
-        )
-        session.add(client)
+        await upsert_telegram_user(session, payload.user_id, language_code=payload.language_code)
         await session.commit()
         return {'data': 'successfull', 'status': True}
     except Exception as err:
@@ -130,6 +164,7 @@ async def update_user_language(
             raise HTTPException(status_code=400, detail="Bul paydalaniwshi dizimnen o'tpegen!")
         user_data.language_code = payload.code
         await session.commit()
+        invalidate_principal(telegram_id=user_data.telegram_id)
         return {'data': True}
     except HTTPException:
         await session.rollback()
@@ -174,7 +209,8 @@ async def get_user_language(
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 @router.get("/me", description="Paydalaniwshi haqqinda mag'liwmatlardi aliw", response_model=GeneralProfileOut)
-async def get_me(user: Users = Depends(get_current_user), session: AsyncSession = Depends(get_async_session)):
+async def get_me(principal: Principal = Depends(get_current_principal), session: AsyncSession = Depends(get_async_session)):
+    user = await load_user_profile(session, principal.id)
     client = user.client
 
     country = {
@@ -214,6 +250,8 @@ async def update_me(
         session: AsyncSession = Depends(get_async_session)
     ):
     try:
+        # client и его связи — lazy="raise", подгружаем профиль целиком
+        user = await load_user_profile(session, user.id)
         if payload.full_name is not None:
             user.full_name = payload.full_name
 
@@ -245,7 +283,9 @@ async def update_me(
 
         await session.flush()
         await session.commit()
+        invalidate_principal(user_id=user.id)
 
+        user = await load_user_profile(session, user.id)
         client = user.client
 
         country = {
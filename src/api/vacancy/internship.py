@@ -1,17 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 
-from src.core.auth import get_current_user
+from src.core.auth import Principal, get_current_principal
 from src.database import get_async_session
-from src.models.users import Users
-from src.models.vacancy import Internship
+from src.models.vacancy import Internship, StatusEnum
+from src.models.load_plans import vacancy_list_plan
 from src.schemas.vacancy import CreateInternship
 from src.core.i18n.notification import get_notification_format
-from src.core.bot import BotConfig, get_bot_config
+from src.core.outbox import enqueue_message, enqueue_moderation
 from src.core.i18n.vacancy.internship import get_vacancy_group_format
 
 router = APIRouter(prefix="/internship")
@@ -19,15 +18,14 @@ router = APIRouter(prefix="/internship")
 @router.post("/", description="Jan'a internship jaratiw")
 async def create_new_internship(
         payload: CreateInternship,
-        user: Users = Depends(get_current_user),
-        session: AsyncSession = Depends(get_async_session),
-        botcfg: BotConfig = Depends(get_bot_config)
+        user: Principal = Depends(get_current_principal),
+        session: AsyncSession = Depends(get_async_session)
     ):
     try:
         non_auth = HTTPException(status_code=401, detail="You have not filled out the form on your profile.")
         if (
-            not user.client.country_id or
-            not user.client.region_id or 
+            not user.country_id or
+            not user.region_id or 
             not user.contact
             ):
             raise non_auth
@@ -47,19 +45,15 @@ async def create_new_internship(
         )
         session.add(job)
         await session.flush()
-        try:
-            msg = get_notification_format(request_id=job.id, lang_code=user.language_code)
-            await botcfg.send_message(chat_id=user.telegram_id, message=msg)
-        except Exception as e:
-            print(f"Bot send error: {e}")
+        await session.refresh(job, ["country", "region"])
+        msg = get_notification_format(request_id=job.id, lang_code=user.language_code)
+        enqueue_message(session, chat_id=user.telegram_id, text=msg)
 
         try:
             moderation_msg = await get_vacancy_group_format(post=job)
-            moderation_cfg = await botcfg.send_message_group(post_id=job.id, text=moderation_msg, vacancy_type="intern")
-            job.group_message_id = moderation_cfg.message_id
-            job.group_chat_id = moderation_cfg.chat_id
+            enqueue_moderation(session, vacancy_type="intern", vacancy_id=job.id, text=moderation_msg)
         except Exception as e:
-            print(f"Bot send error: {e}")
+            print(f"Moderation format error: {e}")
 
         await session.commit()
         return {"data": "Successfull", "ok": True, "id": job.id}
@@ -73,21 +67,36 @@ async def create_new_internship(
 
 @router.get("/mine", description="My vacances list")
 async def get_my_vacancies(
-        user: Users = Depends(get_current_user),
+        before_id: int | None = Query(None, description="Aldıńǵı bettiń next_before_id mánisi"),
+        limit: int = Query(50, ge=1, le=200),
+        vacancy_status: StatusEnum | None = Query(None, alias="status"),
+        user: Principal = Depends(get_current_principal),
         session: AsyncSession = Depends(get_async_session),
     ):
     try:
-        exiting = await session.execute(
-            select(Internship)
+        # keyset по id: id страницы берём только из ix_internship_author_live_status
+        # (index-only, status там в INCLUDE), строки — по pkey. С select(Internship) целиком
+        # планировщик для автора со старыми постами шёл назад по pkey через чужие строки.
+        page_ids = (
+            select(Internship.id)
             .where(Internship.author_id == user.id)
-            .where(Internship.is_delete.is_(False))
-            .options(
-                selectinload(Internship.country),
-                selectinload(Internship.region),
-            )
+            .where(Internship.is_delete == False)
+            .order_by(Internship.id.desc())
+            .limit(limit + 1)
+        )
+        if before_id is not None:
+            page_ids = page_ids.where(Internship.id < before_id)
+        if vacancy_status is not None:
+            page_ids = page_ids.where(Internship.status == vacancy_status)
+        stmt = (
+            select(Internship)
+            .where(Internship.id.in_(page_ids.scalar_subquery()))
+            .options(*vacancy_list_plan(Internship))
             .order_by(Internship.id.desc())
         )
-        items = exiting.scalars().all()
+        items = (await session.execute(stmt)).scalars().all()
+        has_more = len(items) > limit
+        items = items[:limit]
         return {'data': [
             {
                 'id': item.id,
@@ -120,7 +129,7 @@ async def get_my_vacancies(
                 }
             }
             for item in items
-        ]}
+        ], 'next_before_id': items[-1].id if has_more else None}
     except Exception as err:
         print(f"Server error: {err}")
         raise HTTPException(status_code=500, detail="Internal server error.")
@@ -129,18 +138,14 @@ async def get_my_vacancies(
 async def update_vacancy(
         vacancy_id: int,
         payload: CreateInternship,
-        user: Users = Depends(get_current_user),
+        user: Principal = Depends(get_current_principal),
         session: AsyncSession = Depends(get_async_session),
     ):
     try:
         exiting = await session.execute(
             select(Internship)
             .where(Internship.id == vacancy_id)
-            .where(Internship.is_delete.is_(False))
-            .options(
-                selectinload(Internship.country),
-                selectinload(Internship.region),
-            )
+            .where(Internship.is_delete == False)
             .order_by(Internship.id.desc())
         )
         job = exiting.scalar_one_or_none()
@@ -174,14 +179,14 @@ async def update_vacancy(
 @router.delete("/{vacancy_id}")
 async def delete_vacancy(
         vacancy_id: int,
-        user: Users = Depends(get_current_user),
+        user: Principal = Depends(get_current_principal),
         session: AsyncSession = Depends(get_async_session),
     ):
     try:
         exiting = await session.execute(
             select(Internship)
             .where(Internship.id == vacancy_id)
-            .where(Internship.is_delete.is_(False))
+            .where(Internship.is_delete == False)
         )
         job = exiting.scalar_one_or_none()
         if not job:
@@ -2,17 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select, update
+from sqlalchemy import select, update, case
 
-from pydantic import BaseModel
-from typing import Literal, Type
+from pydantic import BaseModel, Field
+from typing import Literal
+import asyncio
+import os
 
-from src.core.bot import BotConfig, get_bot_config
+from src.core.bot import BotConfig, SendMessageConfig, get_bot_config
+from src.core.channels import get_channel_chat
+from src.core.outbox import enqueue_channel_post, enqueue_message
 from src.core.auth import require_api_key
 from src.database import get_async_session
-from src.models.vacancy import JobVacancy, StatusEnum, Internship, OneTimeTask, OpportunitiesGrants
-from src.models.channels import Channels
+from src.models.vacancy import StatusEnum, MODEL_BY_TYPE
+from src.models.load_plans import vacancy_moderation_plan
 from src.core.i18n.notification import get_reject_format, get_approve_format
 
 from src.core.i18n.vacancy.jobvacancy import get_vacancy_channel_format as fmt_job
@@ -20,6 +23,7 @@ from src.core.i18n.vacancy.internship import get_vacancy_channel_format as fmt_i
 from src.core.i18n.vacancy.one_time_task import get_vacancy_channel_format as fmt_ot
 from src.core.i18n.vacancy.opportunities_grants import get_vacancy_channel_format as fmt_opg
 from src.core.i18n.vacancy import make_channel_post
+from src.core.i18n.vacancy.vacancy_types import TgPost
 
 router = APIRouter(prefix="/moderation", tags=['Moderation'])
 
@@ -36,12 +40,23 @@ class RejectIn(BaseModel):
 
 VacancyType = Literal["job", "intern", "otits", "opgts"]
 
-MODEL_BY_TYPE: dict[VacancyType, Type] = {
-    "job": JobVacancy,
-    "intern": Internship,
-    "otits": OneTimeTask,
-    "opgts": OpportunitiesGrants,
-}
+class BatchItem(BaseModel):
+    vacancy_type: VacancyType
+    vacancy_id: int
+    action: Literal["approve", "reject"]
+    reason: str | None = None
+
+class BatchIn(BaseModel):
+    moderator_tid: int
+    items: list[BatchItem] = Field(..., min_length=1, max_length=500)
+
+PUBLISH_CONCURRENCY = int(os.getenv("MODERATION_PUBLISH_CONCURRENCY", "5"))
+
+def remember_file_id(job, sending: SendMessageConfig) -> None:
+    # если группа модерации не вернула file_id (пост без фото в группе, старая строка),
+    # берём его из первой публикации в канал — следующие каналы получат уже file_id
+    if sending.file_id and hasattr(job, "tg_file_id") and not job.tg_file_id:
+        job.tg_file_id = sending.file_id
 
 @router.post("/approve")
 async def approve_vacancy(
@@ -55,7 +70,11 @@ async def approve_vacancy(
         if model is None:
             raise HTTPException(status_code=400, detail="Wrong vacancy type")
 
-        res  = await session.execute(select(model).where(model.id == payload.vacancy_id))
+        res  = await session.execute(
+            select(model)
+            .where(model.id == payload.vacancy_id)
+            .options(*vacancy_moderation_plan(model))
+        )
         job = res.scalar_one_or_none()
         if not job:
             raise HTTPException(404, "Vacancy not found")
@@ -65,34 +84,47 @@ async def approve_vacancy(
         job.status = StatusEnum.APPROVED
         job.moderator_id = payload.moderator_tid
 
-        q = select(Channels).where(Channels.country_id == job.country_id)
-        if getattr(job, "region_id", None) is not None:
-            q = q.where(Channels.region_id == job.region_id)
-        channel = (await session.execute(q)).scalar_one_or_none()
-        
+        try:
+            channel = await get_channel_chat(session, botcfg, job.country_id, getattr(job, "region_id", None))
+        except Exception as e:
+            print(f"Bot send error: {e}")
+            await session.commit()
+            return {"ok": True, "published": False}
+
         if not channel:
             await session.commit()
             return {"ok": True, "published": False, "reason": "channel_not_found"}
 
         try:
-            chat_id = await botcfg.get_chat_id(channel.channel_url)
-            msgw = await make_channel_post(payload.vacancy_type, lang_code=chat_id, post=job)
-            sending = await botcfg.send_post(chat_id=chat_id, post=msgw)
-            
+            msgw = await make_channel_post(payload.vacancy_type, lang_code=channel.chat_id, post=job)
+        except Exception as e:
+            print(f"Channel post format error: {e}")
+            await session.commit()
+            return {"ok": True, "published": False, "reason": "publish_failed"}
 
-            job.channel_chat_id = sending.chat_id
-            job.channel_message_id = sending.message_id
+        try:
+            mod_text = get_approve_format(job.id, job.user.language_code, channel.username)
+        except Exception as err:
+            print(f"Approve Notification failed: {err}")
+            mod_text = None
 
-            try:
-                chat_cfg = await botcfg.get_user_with_chat_id(telegram_id=sending.chat_id)
-                mod_text = get_approve_format(job.id, job.user.language_code, chat_cfg.username)
-                await botcfg.send_message(chat_id=job.user.telegram_id, message=mod_text)
-            except Exception as err:
-                print(f"Approve Notification failed: {err}")
+        try:
+            sending = await botcfg.send_post(chat_id=channel.chat_id, post=msgw)
         except Exception as e:
+            # повторит outbox-воркер, он же уведомит автора после публикации
             print(f"Bot send error: {e}")
+            enqueue_channel_post(
+                session, payload.vacancy_type, job.id, channel.chat_id, msgw,
+                notify_chat_id=job.user.telegram_id, notify_text=mod_text,
+            )
             await session.commit()
-            return {"ok": True, "published": False}
+            return {"ok": True, "published": False, "reason": "publish_queued"}
+
+        job.channel_chat_id = sending.chat_id
+        job.channel_message_id = sending.message_id
+        remember_file_id(job, sending)
+        if mod_text:
+            enqueue_message(session, chat_id=job.user.telegram_id, text=mod_text)
 
         await session.commit()
         return {"ok": True, "published": True, "chat_id": job.channel_chat_id, "message_id": job.channel_message_id}
@@ -103,7 +135,6 @@ async def approve_vacancy(
 async def reject_vacancy(
         payload: RejectIn,
         session: AsyncSession = Depends(get_async_session),
-        botcfg: BotConfig = Depends(get_bot_config),
         req_api_key = Depends(require_api_key)
     ):
     try:
@@ -129,24 +160,22 @@ async def reject_vacancy(
                 raise HTTPException(status_code=409, detail="Already resolved")
             raise HTTPException(status_code=404, detail="Vacancy not found")
         
-        await session.commit()
-
         res = await session.execute(
             select(model)
             .where(model.id == payload.vacancy_id)
-            .options(selectinload(model.user))
+            .options(*vacancy_moderation_plan(model))
         )
         job = res.scalar_one_or_none()
-        if job is None or job.user is None:
-            return {"ok": True, "message": "Rejected", "notified": False}
-        try:
-            msg = get_reject_format(job.id, lang_code=job.user.language_code, reason=payload.reason)
-            await botcfg.send_message(chat_id=job.user.telegram_id, message=msg)
-            notified = True
-        except Exception as err:
-            print(f"Bot send error: {err}")
-            notified = False
+        notified = False
+        if job is not None and job.user is not None:
+            try:
+                msg = get_reject_format(job.id, lang_code=job.user.language_code, reason=payload.reason)
+                enqueue_message(session, chat_id=job.user.telegram_id, text=msg)
+                notified = True
+            except Exception as err:
+                print(f"Reject Notification failed: {err}")
 
+        await session.commit()
         return {"ok": True, "message": "Rejected", "notified": notified}
     except HTTPException:
         await session.rollback()
@@ -156,4 +185,179 @@ async def reject_vacancy(
         raise HTTPException(status_code=500, detail=f"db error: {err}")
     except Exception:
         await session.rollback()
-        raise HTTPException(status_code=500, detail="Server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Server error")
+
+@router.post("/batch", description="Bir neshe postti bir soraw menen tastiyqlaw/biykarlaw")
+async def moderate_batch(
+        payload: BatchIn,
+        session: AsyncSession = Depends(get_async_session),
+        botcfg: BotConfig = Depends(get_bot_config),
+        req_api_key = Depends(require_api_key)
+    ):
+    try:
+        results: dict[tuple[str, int], dict] = {}
+        wanted: dict[str, dict[int, BatchItem]] = {}
+        for item in payload.items:
+            key = (item.vacancy_type, item.vacancy_id)
+            if key in results:
+                continue
+            results[key] = {
+                'vacancy_type': item.vacancy_type,
+                'vacancy_id': item.vacancy_id,
+                'action': item.action,
+                'ok': False,
+                'status': None,
+                'published': False,
+                'message_id': None,
+                'reason': None,
+            }
+            if item.action == "reject" and not item.reason:
+                results[key]['status'] = "reason_required"
+            else:
+                wanted.setdefault(item.vacancy_type, {})[item.vacancy_id] = item
+
+        # 1. Захватываем всё одной транзакцией: UPDATE ... WHERE status='NEW' RETURNING
+        claimed: list[tuple[str, object]] = []
+        for vacancy_type, items in wanted.items():
+            model = MODEL_BY_TYPE[vacancy_type]
+            approve_ids = [i for i, it in items.items() if it.action == "approve"]
+            reject_ids = [i for i, it in items.items() if it.action == "reject"]
+            claimed_ids = []
+            if approve_ids:
+                rows = await session.execute(
+                    update(model)
+                    .where(model.id.in_(approve_ids), model.status == StatusEnum.NEW)
+                    .values(status=StatusEnum.APPROVED, moderator_id=payload.moderator_tid)
+                    .returning(model.id)
+                    .execution_options(synchronize_session=False)
+                )
+                claimed_ids += rows.scalars().all()
+            if reject_ids:
+                reasons = {i: items[i].reason for i in reject_ids}
+                rows = await session.execute(
+                    update(model)
+                    .where(model.id.in_(reject_ids), model.status == StatusEnum.NEW)
+                    .values(
+                        status=StatusEnum.REJECTED,
+                        moderator_id=payload.moderator_tid,
+                        reject_reason=case(reasons, value=model.id),
+                    )
+                    .returning(model.id)
+                    .execution_options(synchronize_session=False)
+                )
+                claimed_ids += rows.scalars().all()
+
+            missing = set(items) - set(claimed_ids)
+            if missing:
+                existing = set((await session.execute(select(model.id).where(model.id.in_(missing)))).scalars().all())
+                for vacancy_id in missing:
+                    results[(vacancy_type, vacancy_id)]['status'] = "already_resolved" if vacancy_id in existing else "not_found"
+
+            if claimed_ids:
+                jobs = (await session.execute(
+                    select(model)
+                    .where(model.id.in_(claimed_ids))
+                    .options(*vacancy_moderation_plan(model))
+                    .execution_options(populate_existing=True)
+                )).scalars().all()
+                claimed += [(vacancy_type, job) for job in jobs]
+
+        # 2. Отклонённые — только уведомление автору через outbox
+        to_publish: dict[int, list[tuple[str, object]]] = {}
+        channels = {}
+        for vacancy_type, job in claimed:
+            res = results[(vacancy_type, job.id)]
+            res['ok'] = True
+            if job.status == StatusEnum.REJECTED:
+                res['status'] = "rejected"
+                try:
+                    msg = get_reject_format(job.id, lang_code=job.user.language_code, reason=job.reject_reason)
+                    enqueue_message(session, chat_id=job.user.telegram_id, text=msg)
+                except Exception as err:
+                    print(f"Reject Notification failed: {err}")
+                continue
+
+            res['status'] = "approved"
+            try:
+                channel = await get_channel_chat(session, botcfg, job.country_id, getattr(job, "region_id", None))
+            except Exception as e:
+                print(f"Bot send error: {e}")
+                res['reason'] = "channel_error"
+                continue
+            if not channel:
+                res['reason'] = "channel_not_found"
+                continue
+            channels[channel.chat_id] = channel
+            to_publish.setdefault(channel.chat_id, []).append((vacancy_type, job))
+
+        await session.commit()
+
+        # 3. Публикация: каналы параллельно (не больше PUBLISH_CONCURRENCY),
+        #    внутри одного канала — по порядку. Неудачные отправки уходят в outbox:
+        #    воркер повторит их с бэкоффом и сам уведомит автора.
+        semaphore = asyncio.Semaphore(PUBLISH_CONCURRENCY)
+        retry: list[tuple[int, str, object, TgPost]] = []
+
+        async def publish_channel(chat_id: int, posts: list[tuple[str, object]]):
+            async with semaphore:
+                for vacancy_type, job in posts:
+                    res = results[(vacancy_type, job.id)]
+                    try:
+                        msgw = await make_channel_post(vacancy_type, lang_code=chat_id, post=job)
+                    except Exception as e:
+                        print(f"Channel post format error: {e}")
+                        res['reason'] = "publish_failed"
+                        continue
+                    try:
+                        sending = await botcfg.send_post(chat_id=chat_id, post=msgw)
+                    except Exception as e:
+                        print(f"Bot send error: {e}")
+                        res['reason'] = "publish_queued"
+                        retry.append((chat_id, vacancy_type, job, msgw))
+                        continue
+                    job.channel_chat_id = sending.chat_id
+                    job.channel_message_id = sending.message_id
+                    remember_file_id(job, sending)
+                    res['published'] = True
+                    res['message_id'] = sending.message_id
+
+        await asyncio.gather(*(publish_channel(chat_id, posts) for chat_id, posts in to_publish.items()))
+
+        for chat_id, posts in to_publish.items():
+            for vacancy_type, job in posts:
+                if not results[(vacancy_type, job.id)]['published']:
+                    continue
+                try:
+                    mod_text = get_approve_format(job.id, job.user.language_code, channels[chat_id].username)
+                    enqueue_message(session, chat_id=job.user.telegram_id, text=mod_text)
+                except Exception as err:
+                    print(f"Approve Notification failed: {err}")
+
+        for chat_id, vacancy_type, job, msgw in retry:
+            try:
+                mod_text = get_approve_format(job.id, job.user.language_code, channels[chat_id].username)
+            except Exception as err:
+                print(f"Approve Notification failed: {err}")
+                mod_text = None
+            enqueue_channel_post(
+                session, vacancy_type, job.id, chat_id, msgw,
+                notify_chat_id=job.user.telegram_id, notify_text=mod_text,
+            )
+
+        await session.commit()
+        # одобрены, но не опубликованы; publish_queued ещё уйдут через outbox
+        failed = [
+            {'vacancy_type': res['vacancy_type'], 'vacancy_id': res['vacancy_id'], 'reason': res['reason']}
+            for res in results.values()
+            if res['status'] == "approved" and not res['published']
+        ]
+        return {"ok": True, "results": list(results.values()), "failed": failed}
+    except HTTPException:
+        await session.rollback()
+        raise
+    except SQLAlchemyError as err:
+        await session.rollback()
+        raise HTTPException(status_code=500, detail=f"db error: {err}")
+    except Exception:
+        await session.rollback()
+        raise HTTPException(status_code=500, detail="Server error")
@@ -1,17 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Query
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from pathlib import Path
 
-from src.core.auth import get_current_user
-from src.database import get_async_session
-from src.models.users import Users
-from src.models.vacancy import OpportunitiesGrants
-from src.core.bot import get_bot_config, BotConfig
-from src.core.files import save_image
+from src.core.auth import Principal, get_current_principal
+from src.database import get_async_session, get_session_factory
+from src.models.vacancy import OpportunitiesGrants, StatusEnum
+from src.models.load_plans import vacancy_list_plan
+from src.core.outbox import enqueue_message, enqueue_moderation
+from src.core.files import rendition_of, remove_legacy_image
+from src.core.media import store_image, acquire_media, release_media
 from src.core.i18n.notification import get_notification_format
 from src.core.i18n.vacancy.opportunities_grants import get_vacancy_group_format
 
@@ -19,20 +18,23 @@ router = APIRouter(prefix="/opportunities_grants")
 
 @router.post("/")
 async def create_opportunities_grants(
-        request: Request,
         country_id: int = Form(...),
         region_id: int | None = Form(None),
         content: str = Form(...),
         contact: str = Form(...),
         img: UploadFile | None = File(None),
-        user: Users = Depends(get_current_user),
+        user: Principal = Depends(get_current_principal),
         session: AsyncSession = Depends(get_async_session),
-        botcfg: BotConfig = Depends(get_bot_config)
+        session_factory: async_sessionmaker = Depends(get_session_factory),
     ):
     try:
         img_path: str | None = None
+        photo_path: str | None = None
         if img is not None:
-            img_path = await save_image(img, max_mb=20)
+            stored = await store_image(session_factory, img, max_mb=20)
+            img_path = stored.path
+            photo_path = stored.renditions["tg"]
+            await acquire_media(session, stored.digest)
 
         job = OpportunitiesGrants(
             country_id = country_id,
@@ -44,30 +46,29 @@ async def create_opportunities_grants(
         )
         session.add(job)
         await session.flush()
+        await session.refresh(job, ["country", "region"])
+
+        msg = get_notification_format(request_id=job.id, lang_code=user.language_code)
+        enqueue_message(session, chat_id=user.telegram_id, text=msg)
 
-        try:
-            msg = get_notification_format(request_id=job.id, lang_code=user.language_code)
-            await botcfg.send_message(chat_id=user.telegram_id, message=msg)
-        except Exception as e:
-            print(f"Bot send error: {e}")
-        
         try:
             moderation_msg = await get_vacancy_group_format(post=job)
-            moderation_cfg = await botcfg.send_photo_group(
-                post_id=job.id,
-                text=moderation_msg, 
-                vacancy_type="opgts", 
-                photo_url=(f"{request.base_url}{img_path}" if img_path is not None else None)
+            enqueue_moderation(
+                session,
+                vacancy_type="opgts",
+                vacancy_id=job.id,
+                text=moderation_msg,
+                photo_path=photo_path
             )
-
-            job.group_message_id = moderation_cfg.message_id
-            job.group_chat_id = moderation_cfg.chat_id
         except Exception as e:
-            print(f"Bot send error: {e}")
+            print(f"Moderation format error: {e}")
 
         await session.commit()
         await session.refresh(job)
         return {'data': "Successfull", 'status': True}
+    except HTTPException:
+        await session.rollback()
+        raise
     except Exception as err:
         await session.rollback()
         print(f"Server error: {err}")
@@ -76,21 +77,36 @@ async def create_opportunities_grants(
 @router.get("/mine", description="My vacances list")
 async def get_my_vacancies(
         request: Request,
-        user: Users = Depends(get_current_user),
+        before_id: int | None = Query(None, description="Aldıńǵı bettiń next_before_id mánisi"),
+        limit: int = Query(50, ge=1, le=200),
+        vacancy_status: StatusEnum | None = Query(None, alias="status"),
+        user: Principal = Depends(get_current_principal),
         session: AsyncSession = Depends(get_async_session),
     ):
     try:
-        exiting = await session.execute(
-            select(OpportunitiesGrants)
+        # keyset по id: id страницы берём только из ix_opportunities_grants_author_live_status
+        # (index-only, status там в INCLUDE), строки — по pkey. С select(OpportunitiesGrants) целиком
+        # планировщик для автора со старыми постами шёл назад по pkey через чужие строки.
+        page_ids = (
+            select(OpportunitiesGrants.id)
             .where(OpportunitiesGrants.author_id == user.id)
-            .where(OpportunitiesGrants.is_delete.is_(False))
-            .options(
-                selectinload(OpportunitiesGrants.country),
-                selectinload(OpportunitiesGrants.region),
-            )
+            .where(OpportunitiesGrants.is_delete == False)
             .order_by(OpportunitiesGrants.id.desc())
+            .limit(limit + 1)
         )
-        items = exiting.scalars().all()
+        if before_id is not None:
+            page_ids = page_ids.where(OpportunitiesGrants.id < before_id)
+        if vacancy_status is not None:
+            page_ids = page_ids.where(OpportunitiesGrants.status == vacancy_status)
+        stmt = (
+            select(OpportunitiesGrants)
+            .where(OpportunitiesGrants.id.in_(page_ids.scalar_subquery()))
+            .options(*vacancy_list_plan(OpportunitiesGrants))
+            .order_by(OpportunitiesGrants.id.desc())
+        )
+        items = (await session.execute(stmt)).scalars().all()
+        has_more = len(items) > limit
+        items = items[:limit]
         return {'data': [
             {
                 'id': item.id,
@@ -103,6 +119,10 @@ async def get_my_vacancies(
                 },
                 "content": item.content,
                 "img": (f"{request.base_url}{item.img_path}" if item.img_path is not None else None),
+                "img_preview": (
+                    f"{request.base_url}{preview}"
+                    if (preview := rendition_of(item.img_path, 'list')) is not None else None
+                ),
                 "contact": item.contact,
                 'status': {
                     'status': item.status,
@@ -117,7 +137,7 @@ async def get_my_vacancies(
                 }
             }
             for item in items
-        ]}
+        ], 'next_before_id': items[-1].id if has_more else None}
     except Exception as err:
         raise HTTPException(status_code=500, detail="server error")
     
@@ -130,18 +150,15 @@ async def update_vacancy(
         content: str = Form(...),
         contact: str = Form(...),
         img: UploadFile | None = File(None),
-        user: Users = Depends(get_current_user),
-        session: AsyncSession = Depends(get_async_session)
+        user: Principal = Depends(get_current_principal),
+        session: AsyncSession = Depends(get_async_session),
+        session_factory: async_sessionmaker = Depends(get_session_factory),
     ):
     try:
         exiting = await session.execute(
             select(OpportunitiesGrants)
             .where(OpportunitiesGrants.id == vacancy_id)
-            .where(OpportunitiesGrants.is_delete.is_(False))
-            .options(
-                selectinload(OpportunitiesGrants.country),
-                selectinload(OpportunitiesGrants.region),
-            )
+            .where(OpportunitiesGrants.is_delete == False)
             .order_by(OpportunitiesGrants.id.desc())
         )
         job = exiting.scalar_one_or_none()
@@ -154,17 +171,17 @@ async def update_vacancy(
             job.region_id = region_id
         job.content = content
         job.contact = contact
-        new_img_path: str | None = None
-        if new_img_path is not None:
-            new_img_path = await save_image(img, max_mb=20)
-            try:
-                if job.img_path:
-                    old = Path(job.img_path)
-                    if old.exists():
-                        old.unlink(missing_ok=True)
-            except Exception:
-                pass
+        replaced: str | None = None
+        if img is not None:
+            # старый файл не удаляем сразу: его освободит GC, когда ссылок не останется
+            stored = await store_image(session_factory, img, max_mb=20)
+            if stored.path != job.img_path:
+                await acquire_media(session, stored.digest)
+                await release_media(session, job.img_path)
+                replaced, job.img_path = job.img_path, stored.path
+                job.tg_file_id = None
         await session.commit()
+        remove_legacy_image(replaced)
         return {"data": "Successfull", "ok": True, "id": job.id}
     except HTTPException:
         await session.rollback()
@@ -177,14 +194,14 @@ async def update_vacancy(
 @router.delete("/{vacancy_id}")
 async def delete_vacancy(
         vacancy_id: int,
-        user: Users = Depends(get_current_user),
+        user: Principal = Depends(get_current_principal),
         session: AsyncSession = Depends(get_async_session),
     ):
     try:
         exiting = await session.execute(
             select(OpportunitiesGrants)
             .where(OpportunitiesGrants.id == vacancy_id)
-            .where(OpportunitiesGrants.is_delete.is_(False))
+            .where(OpportunitiesGrants.is_delete == False)
         )
         job = exiting.scalar_one_or_none()
         if not job:
@@ -193,6 +210,7 @@ async def delete_vacancy(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This vacancy does not belong to you")
         
         job.is_delete = True
+        await release_media(session, job.img_path)
         await session.commit()
         return {"data": "Successfull", "ok": True, "id": job.id}
     except HTTPException:
@@ -7,6 +7,7 @@ from src.models.locations import Country, Region
 from src.schemas.locations import ActiveCountry, CreateCountry, CreateRegion
 from src.database import get_async_session
 from src.core.auth import require_api_key
+from src.core.reference import refresh_reference
 
 router = APIRouter(prefix="/manage/countries", tags=['Countries for Admin'])
 
@@ -29,6 +30,7 @@ async def add_new_country(
         )
         session.add(item)
         await session.commit()
+        await refresh_reference()
 
         return {'data': {'id': item.id, 'name': item.name, 'is_active': item.is_active}, 'status': 201, 'message': "Country saved successfully! 🎉", 'error': None}
     except Exception as err:
@@ -63,6 +65,7 @@ async def add_new_region(
 
         session.add(item)
         await session.commit()
+        await refresh_reference()
         return {'data': {'id': item.id, 'name': item.name, 'is_active': item.is_active}, 'status': 201, 'message': "Region saved successfully! 🎉", 'error': None}
     except Exception as err:
         await session.rollback()
@@ -83,6 +86,7 @@ async def activate_country(
         
         country.is_active = payload.activate
         await session.commit()
+        await refresh_reference()
         await session.refresh(country)
         return {'data': True, 'status': 200, 'message': "Status updated succesfully!", 'error': None}
     except Exception as err:
@@ -105,6 +109,7 @@ async def activate_country(
         region.is_active = payload.activate
 
         await session.commit()
+        await refresh_reference()
         await session.refresh(region)
         return {'data': True, 'status': 200, 'message': "Status updated succesfully!", 'error': None}
     except Exception as err:
@@ -176,6 +181,7 @@ async def delete_country(country_id: int, session: AsyncSession = Depends(get_as
         
         await session.delete(item)
         await session.commit()
+        await refresh_reference()
         return {'data': True, 'status': 200, 'message': "Country successfully removed", 'error': None}
     except ValueError:
         await session.rollback()
@@ -197,6 +203,7 @@ async def delete_region(region_id: int, session: AsyncSession = Depends(get_asyn
         
         await session.delete(item)
         await session.commit()
+        await refresh_reference()
         return {'data': True, 'status': 200, 'message': "Region successfully removed", 'error': None}
     except ValueError:
         await session.rollback()
@@ -3,11 +3,13 @@ from fastapi import Depends, HTTPException, Header, status
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.users import Users
+from src.models.users import Users, Clients
+from src.core.cache import TTLCache
 from src.database import get_async_session
 from src.core.jwt import verify_access_token
 
 from dotenv import load_dotenv
+from dataclasses import dataclass
 import os
 load_dotenv()
 
@@ -16,50 +18,92 @@ API_KEY = os.getenv("API_KEY")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/telegram/webapp/auth")
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
-async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_async_session)) -> Users:
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+@dataclass(frozen=True)
+class Principal:
+    # То, что нужно большинству роутов, без ORM-объекта и его связей
+    id: int
+    telegram_id: int
+    language_code: str | None
+    contact: str | None
+    country_id: int | None
+    region_id: int | None
+
+# ключ — (user_id, telegram_id, iat): новый токен всегда идёт мимо старой записи
+principal_cache = TTLCache(ttl=PRINCIPAL_CACHE_TTL, maxsize=PRINCIPAL_CACHE_SIZE)
+
+def invalidate_principal(user_id: int | None = None, telegram_id: int | None = None) -> None:
+    principal_cache.pop_matching(
+        lambda key: key[0] == user_id or key[1] == telegram_id
+    )
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def get_current_principal(
+        token: str = Depends(oauth2_scheme),
+        session: AsyncSession = Depends(get_async_session)
+    ) -> Principal:
     payload = await verify_access_token(token)
     if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token is invalid or expired",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Token is invalid or expired")
     
     user_id = payload.get("user_id")
     telegram_id = payload.get("telegram_id")
     if user_id is None or telegram_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Bad token payload",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Bad token payload")
 
     try:
         user_id = int(user_id)
         telegram_id = int(telegram_id)
     except (TypeError, ValueError):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Bad token payload types",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Bad token payload types")
+
+    key = (user_id, telegram_id, payload.get("iat"))
+    principal = principal_cache.get(key)
+    if principal is not None:
+        return principal
 
     res = await session.execute(
-        select(Users)
+        select(
+            Users.id,
+            Users.telegram_id,
+            Users.language_code,
+            Users.contact,
+            Clients.country_id,
+            Clients.region_id,
+        )
+        .outerjoin(Clients, Clients.user_id == Users.id)
         .where(
             and_(
-                Users.id == int(user_id),
-                Users.telegram_id == int(telegram_id)
+                Users.id == user_id,
+                Users.telegram_id == telegram_id
             )
         )
     )
-    user = res.scalar_one_or_none()
+    row = res.one_or_none()
+    if not row:
+        raise _unauthorized("User not found")
+
+    principal = Principal(*row)
+    principal_cache.set(key, principal)
+    return principal
+
+async def get_current_user(
+        principal: Principal = Depends(get_current_principal),
+        session: AsyncSession = Depends(get_async_session)
+    ) -> Users:
+    # полный ORM-объект — только там, где пользователя меняют (/users/me)
+    user = await session.get(Users, principal.id)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        invalidate_principal(user_id=principal.id)
+        raise _unauthorized("User not found")
     return user
 
 async def require_api_key(x_api_key: str = Depends(api_key_header)):
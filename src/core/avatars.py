@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+
+from aiogram import Bot
+
+from src.core.cache import TTLCache
+from src.core.files import BASE_DIR, MEDIA_ROOT
+
+# вне /media: фото пользователей отдаются только через /stats/photo с API-ключом
+AVATAR_CACHE_DIR = Path(os.getenv("AVATAR_CACHE_DIR", str(BASE_DIR / ".avatar_cache")))
+AVATAR_CACHE_MAX_BYTES = int(os.getenv("AVATAR_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+AVATAR_CACHE_MAX_AGE = int(os.getenv("AVATAR_CACHE_MAX_AGE", str(7 * 86400)))
+AVATAR_SWEEP_INTERVAL = float(os.getenv("AVATAR_SWEEP_INTERVAL", "3600"))
+# попадание в кэш обновляет mtime не чаще раза в AVATAR_TOUCH_INTERVAL — очистка
+# идёт по mtime, и часто запрашиваемые фото не должны вытесняться первыми
+AVATAR_TOUCH_INTERVAL = int(os.getenv("AVATAR_TOUCH_INTERVAL", "3600"))
+# сколько доверяем связке telegram_id -> file_unique_id, прежде чем снова спросить get_chat
+AVATAR_TTL = int(os.getenv("AVATAR_TTL", "21600"))
+AVATAR_INDEX_SIZE = int(os.getenv("AVATAR_INDEX_SIZE", "50000"))
+AVATAR_CACHE_CONTROL = f"private, max-age={min(AVATAR_TTL, 3600)}"
+
+# заглушка читается один раз при импорте, а не на каждый запрос
+DEFAULT_AVATAR = (MEDIA_ROOT / "userprofile.png").read_bytes()
+DEFAULT_AVATAR_ETAG = f'"default-{hashlib.sha1(DEFAULT_AVATAR).hexdigest()[:16]}"'
+
+_NO_PHOTO = ""
+
+# telegram_id -> file_unique_id ("" — фото нет)
+avatar_index = TTLCache(ttl=AVATAR_TTL, maxsize=AVATAR_INDEX_SIZE)
+_inflight: dict[int, asyncio.Task] = {}
+
+def avatar_path(file_unique_id: str) -> Path:
+    # file_unique_id меняется вместе с фото, поэтому файл неизменяем
+    return AVATAR_CACHE_DIR / f"{file_unique_id}.jpg"
+
+def avatar_etag(file_unique_id: str) -> str:
+    return f'"{file_unique_id}"'
+
+def touch_avatar(path: Path) -> bool:
+    # False — файла нет (удалён очисткой)
+    try:
+        mtime = path.stat().st_mtime
+        now = time.time()
+        if now - mtime > AVATAR_TOUCH_INTERVAL:
+            os.utime(path, (now, now))
+        return True
+    except FileNotFoundError:
+        return False
+
+async def _fetch_avatar(bot: Bot, telegram_id: int) -> str | None:
+    chat = await bot.get_chat(telegram_id)
+    if not chat.photo:
+        avatar_index.set(telegram_id, _NO_PHOTO)
+        return None
+
+    file_unique_id = chat.photo.big_file_unique_id
+    path = avatar_path(file_unique_id)
+    if not touch_avatar(path):
+        AVATAR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.part")
+        try:
+            # скачивание через сессию бота, потоково, сразу на диск
+            await bot.download(chat.photo.big_file_id, destination=tmp)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    avatar_index.set(telegram_id, file_unique_id)
+    return file_unique_id
+
+async def get_avatar(bot: Bot, telegram_id: int) -> str | None:
+    # Возвращает file_unique_id закэшированного файла или None (показать заглушку)
+    file_unique_id = avatar_index.get(telegram_id)
+    if file_unique_id == _NO_PHOTO:
+        return None
+    if file_unique_id and touch_avatar(avatar_path(file_unique_id)):
+        return file_unique_id
+
+    # single-flight: одновременные промахи по одному пользователю ждут один запрос
+    task = _inflight.get(telegram_id)
+    if task is None:
+        task = asyncio.create_task(_fetch_avatar(bot, telegram_id))
+        _inflight[telegram_id] = task
+        task.add_done_callback(lambda _: _inflight.pop(telegram_id, None))
+    return await asyncio.shield(task)
+
+# ---------------------------------------------------------------------------
+# Очистка кэша: файлы старше AVATAR_CACHE_MAX_AGE удаляются, затем самые старые —
+# пока каталог не уложится в AVATAR_CACHE_MAX_BYTES. mtime обновляется при
+# попаданиях (touch_avatar), так что это LRU с точностью до AVATAR_TOUCH_INTERVAL.
+# Удалённое фото скачается заново при следующем запросе.
+
+def sweep_avatar_cache(max_bytes: int = AVATAR_CACHE_MAX_BYTES, max_age: int = AVATAR_CACHE_MAX_AGE) -> tuple[int, int]:
+    now = time.time()
+    files = []
+    with os.scandir(AVATAR_CACHE_DIR) as entries:
+        for entry in entries:
+            if entry.is_file():
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+
+    files.sort()
+    total = sum(size for _, size, _ in files)
+    removed = reclaimed = 0
+    for mtime, size, path in files:
+        # .part моложе max_age — скорее всего идёт скачивание
+        if now - mtime <= max_age and (total <= max_bytes or path.endswith(".part")):
+            continue
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+        reclaimed += size
+    return removed, reclaimed
+
+async def avatar_sweep_loop(interval: float = AVATAR_SWEEP_INTERVAL) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if AVATAR_CACHE_DIR.exists():
+                removed, reclaimed = await asyncio.to_thread(sweep_avatar_cache)
+                if removed:
+                    print(f"[avatars] sweep removed {removed} files, {reclaimed} bytes")
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            print(f"[avatars] sweep error: {err}")
@@ -1,13 +1,19 @@
 from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
 from dotenv import load_dotenv
-from typing import AsyncIterator, Union
-from aiogram.types import FSInputFile
+from typing import Union
+from aiogram.types import FSInputFile, InputFile
+from dataclasses import dataclass, field
 from pathlib import Path
+import asyncio
+import time
 import os
 load_dotenv()
 
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from typing import Union
 
 from src.core.i18n.notification import get_approve_format, get_notification_format
 from src.core.callbacks import ModAction
@@ -23,10 +29,11 @@ def get_group_id() -> int:
         raise RuntimeError(f"GROUP_ID must be integer, got: {raw}")
 
 class SendMessageConfig:
-    def __init__(self, chat_id: int, message: str, message_id: int) -> None:
+    def __init__(self, chat_id: int, message: str, message_id: int, file_id: str | None = None) -> None:
         self.chat_id = chat_id
         self.message = message
         self.message_id = message_id
+        self.file_id = file_id
 
 class UserTelegramData:
     def __init__(self, full_name: str, chat_id: int, lastname: str, username: str) -> None:
@@ -42,9 +49,9 @@ class BotConfig:
     async def getBot(self) -> Bot:
         return self.bot
     
-    async def get_id(self):
-        me = await self.bot.get_me()
-        return me.id
+    async def get_id(self) -> int:
+        identity = await get_bot_identity(self.bot)
+        return identity.id
     
     async def send_message(self, chat_id: Union[int, str], message: str) -> SendMessageConfig:
         msg = await self.bot.send_message(chat_id=chat_id, text=message, parse_mode='HTML')
@@ -64,6 +71,17 @@ class BotConfig:
             channel_username = "@" + channel_username
         chat = await self.bot.get_chat(f"{channel_username}")
         return chat.id
+
+    async def get_channel(self, channel_username: str) -> UserTelegramData:
+        if not channel_username.startswith("@"):
+            channel_username = "@" + channel_username
+        chat = await self.bot.get_chat(channel_username)
+        return UserTelegramData(
+            full_name=chat.full_name,
+            chat_id=chat.id,
+            lastname=chat.last_name,
+            username=chat.username
+        )
     
     async def send_notification(self, request_id: int, chat_id: Union[int, str], lang_code: str):
         text = get_notification_format(request_id, lang_code)
@@ -86,7 +104,7 @@ class BotConfig:
         msg = await self.bot.send_message(chat_id=group_id, text=text, parse_mode='HTML', reply_markup=kb.as_markup())
         return SendMessageConfig(chat_id=msg.chat.id, message=msg.text, message_id=msg.message_id)
     
-    async def send_photo_group(self, post_id: int, text: str, vacancy_type: str, photo_url: str | None = None):
+    async def send_photo_group(self, post_id: int, text: str, vacancy_type: str, photo: str | InputFile | None = None):
         group_id = get_group_id()
         kb = InlineKeyboardBuilder()
         kb.button(text="✅ Принять",
@@ -94,11 +112,16 @@ class BotConfig:
         kb.button(text="❌ Отклонить",
                   callback_data=ModAction(action="reject", vacancy_type=vacancy_type, vacancy_id=post_id, token="...").pack())
         kb.adjust(2)
-        if photo_url is not None:
-            msg = await self.bot.send_photo(chat_id=group_id, caption=text, photo=photo_url, parse_mode='HTML', reply_markup=kb.as_markup())
+        if photo is not None:
+            msg = await self.bot.send_photo(chat_id=group_id, caption=text, photo=photo, parse_mode='HTML', reply_markup=kb.as_markup())
         else:
             msg = await self.bot.send_message(chat_id=group_id, text=text, parse_mode='HTML', reply_markup=kb.as_markup())
-        return SendMessageConfig(chat_id=msg.chat.id, message=msg.caption, message_id=msg.message_id)
+        return SendMessageConfig(
+            chat_id=msg.chat.id,
+            message=msg.caption,
+            message_id=msg.message_id,
+            file_id=msg.photo[-1].file_id if msg.photo else None,
+        )
     
     # ---------------------------------------------------------------------------
     async def send_post(self, chat_id: Union[int, str], post: TgPost) -> SendMessageConfig:
@@ -108,9 +131,11 @@ class BotConfig:
                 return text, None
             return text[:1020] + "…", text  # краткая подпись + полное сообщение следом
 
-        if post.photo_path:
-            # локальный файл или URL
-            if post.photo_path.startswith("http"):
+        if post.photo_file_id or post.photo_path:
+            # file_id, URL или локальный файл
+            if post.photo_file_id:
+                photo = post.photo_file_id
+            elif post.photo_path.startswith("http"):
                 photo = post.photo_path
             else:
                 photo = FSInputFile(post.photo_path)  # локальный путь
@@ -131,16 +156,154 @@ class BotConfig:
                 parse_mode=post.parse_mode,
             )
 
-        return SendMessageConfig(chat_id=msg.chat.id, message_id=msg.message_id, message=post.text)
+        return SendMessageConfig(
+            chat_id=msg.chat.id,
+            message_id=msg.message_id,
+            message=post.text,
+            file_id=msg.photo[-1].file_id if msg.photo else None,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Один Bot на процесс: aiohttp-сессия держит keep-alive соединения к Telegram,
+# семафор ограничивает число одновременных запросов.
+
+BOT_MAX_CONNECTIONS = int(os.getenv("BOT_MAX_CONNECTIONS", "20"))
+
+@dataclass
+class BotMetrics:
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    total_seconds: float = 0.0
+    by_method: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'in_flight': self.in_flight,
+            'avg_ms': round(self.total_seconds / self.requests * 1000, 2) if self.requests else 0.0,
+            'by_method': dict(self.by_method),
+        }
 
+class BotRequestLimiter(BaseRequestMiddleware):
+    def __init__(self, limit: int, metrics: BotMetrics) -> None:
+        self.semaphore = asyncio.Semaphore(limit)
+        self.metrics = metrics
 
-async def get_bot_config() -> AsyncIterator[BotConfig]:
-    token = os.getenv("BOT_TOKEN")
-    if not token:
-        raise RuntimeError("BOT_TOKEN not set in .env")
-    bot = Bot(token=token)
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        name = type(method).__name__
+        async with self.semaphore:
+            self.metrics.in_flight += 1
+            started = time.perf_counter()
+            try:
+                return await make_request(bot, method)
+            except Exception:
+                self.metrics.errors += 1
+                raise
+            finally:
+                self.metrics.in_flight -= 1
+                self.metrics.requests += 1
+                self.metrics.total_seconds += time.perf_counter() - started
+                self.metrics.by_method[name] = self.metrics.by_method.get(name, 0) + 1
+
+_bot: Bot | None = None
+bot_metrics = BotMetrics()
+
+# ---------------------------------------------------------------------------
+# getMe кэшируется: заполняется при старте, обновляется в фоне раз в TTL.
+# Пока идёт обновление, отдаётся старое значение — запрос в Telegram не ждём.
+# Если getMe не удался (в том числе при старте), повтор запускается при следующем
+# обращении, не чаще чем через BOT_IDENTITY_RETRY секунд, удваиваясь до TTL.
+
+BOT_IDENTITY_TTL = int(os.getenv("BOT_IDENTITY_TTL", "3600"))
+BOT_IDENTITY_RETRY = int(os.getenv("BOT_IDENTITY_RETRY", "5"))
+
+@dataclass(frozen=True)
+class BotIdentity:
+    id: int
+    username: str | None
+    full_name: str
+    fetched_at: float
+
+_identity: BotIdentity | None = None
+_identity_task: asyncio.Task | None = None
+_identity_failures: int = 0
+_identity_retry_at: float = 0.0
+
+async def refresh_bot_identity(bot: Bot) -> BotIdentity:
+    global _identity, _identity_failures, _identity_retry_at
     try:
-        yield BotConfig(bot)
+        me = await bot.get_me()
+    except Exception:
+        _identity_failures += 1
+        delay = min(BOT_IDENTITY_RETRY * 2 ** (_identity_failures - 1), BOT_IDENTITY_TTL)
+        _identity_retry_at = time.monotonic() + delay
+        raise
+    _identity = BotIdentity(id=me.id, username=me.username, full_name=me.full_name, fetched_at=time.monotonic())
+    _identity_failures = 0
+    _identity_retry_at = 0.0
+    return _identity
+
+async def _refresh_in_background(bot: Bot) -> None:
+    global _identity_task
+    try:
+        await refresh_bot_identity(bot)
+    except Exception as err:
+        print(f"Bot identity refresh failed: {err}")
     finally:
-        await bot.session.close()
-    
\ No newline at end of file
+        # отменённая в close_bot задача не должна затирать уже новую
+        if _identity_task is asyncio.current_task():
+            _identity_task = None
+
+def _schedule_refresh(bot: Bot) -> None:
+    global _identity_task
+    if _identity_task is None and time.monotonic() >= _identity_retry_at:
+        _identity_task = asyncio.create_task(_refresh_in_background(bot))
+
+async def get_bot_identity(bot: Bot) -> BotIdentity:
+    if _identity is None:
+        _schedule_refresh(bot)
+        # id бота — префикс токена, его можно отдать без сети
+        return BotIdentity(id=bot.id, username=None, full_name="", fetched_at=0.0)
+    if time.monotonic() - _identity.fetched_at > BOT_IDENTITY_TTL:
+        _schedule_refresh(bot)
+    return _identity
+
+async def start_bot() -> Bot:
+    global _bot
+    if _bot is None:
+        token = os.getenv("BOT_TOKEN")
+        if not token:
+            raise RuntimeError("BOT_TOKEN not set in .env")
+        session = AiohttpSession(limit=BOT_MAX_CONNECTIONS)
+        session.middleware(BotRequestLimiter(BOT_MAX_CONNECTIONS, bot_metrics))
+        _bot = Bot(token=token, session=session)
+        try:
+            await refresh_bot_identity(_bot)
+        except Exception as err:
+            print(f"Bot identity fetch failed: {err}")
+    return _bot
+
+async def close_bot() -> None:
+    global _bot, _identity, _identity_task, _identity_failures, _identity_retry_at
+    if _identity_task is not None:
+        _identity_task.cancel()
+        _identity_task = None
+    _identity = None
+    _identity_failures = 0
+    _identity_retry_at = 0.0
+    if _bot is not None:
+        await _bot.session.close()
+        _bot = None
+
+async def get_bot_config() -> BotConfig:
+    if _bot is None:
+        raise RuntimeError("Bot is not started, check lifespan")
+    return BotConfig(_bot)
@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+import os
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.bot import BotConfig
+from src.core.cache import TTLCache
+from src.models.channels import Channels
+
+CHANNEL_CACHE_TTL = int(os.getenv("CHANNEL_CACHE_TTL", "600"))
+
+@dataclass(frozen=True)
+class ChannelChat:
+    channel_id: int
+    chat_id: int
+    username: str | None
+
+# (country_id, region_id) -> ChannelChat; сбрасывается при изменениях в /bot/channels
+channel_chat_cache = TTLCache(ttl=CHANNEL_CACHE_TTL, maxsize=4096)
+
+def invalidate_channel_chats() -> None:
+    channel_chat_cache.clear()
+
+async def get_channel_chat(
+        session: AsyncSession,
+        botcfg: BotConfig,
+        country_id: int,
+        region_id: int | None
+    ) -> ChannelChat | None:
+    key = (country_id, region_id)
+    cached = channel_chat_cache.get(key)
+    if cached is not None:
+        return cached
+
+    q = select(Channels).where(Channels.country_id == country_id)
+    if region_id is not None:
+        q = q.where(Channels.region_id == region_id)
+    channel = (await session.execute(q)).scalar_one_or_none()
+    if not channel:
+        return None
+
+    # getChat вызывается один раз на канал, результат хранится в строке
+    if channel.chat_id is None:
+        tg = await botcfg.get_channel(channel.channel_url)
+        channel.chat_id = tg.chat_id
+        channel.chat_username = tg.username
+
+    chat = ChannelChat(channel_id=channel.id, chat_id=channel.chat_id, username=channel.chat_username)
+    channel_chat_cache.set(key, chat)
+    return chat
@@ -0,0 +1,22 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, status
+
+# Непрозрачный курсор для keyset-пагинации: значения ключа сортировки
+# последней строки страницы, JSON в base64. Даты кодируются строкой isoformat.
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    # types — по конвертеру на каждое значение: decode_cursor(c, float, str, int)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
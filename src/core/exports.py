@@ -0,0 +1,92 @@
+import asyncio
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date, datetime
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+from fastapi.responses import FileResponse, StreamingResponse
+from openpyxl import Workbook
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.background import BackgroundTask
+
+EXPORT_CHUNK_SIZE = 1000
+
+class ExportFormat(str, Enum):
+    json = "json"
+    ndjson = "ndjson"
+    csv = "csv"
+    xlsx = "xlsx"
+
+async def stream_rows(
+        session_factory: async_sessionmaker, stmt: Select, chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[Sequence]:
+    # Своя сессия: зависимость get_async_session закрывается раньше, чем
+    # StreamingResponse дочитает генератор. stream() открывает серверный курсор.
+    async with session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+        async for partition in result.partitions():
+            yield partition
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+async def _ndjson(session_factory: async_sessionmaker, stmt: Select, columns: list[str]) -> AsyncIterator[str]:
+    async for rows in stream_rows(session_factory, stmt):
+        yield "".join(
+            json.dumps({c: _plain(v) for c, v in zip(columns, row)}, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+async def _csv(session_factory: async_sessionmaker, stmt: Select, columns: list[str]) -> AsyncIterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    async for rows in stream_rows(session_factory, stmt):
+        writer.writerows([[_plain(v) for v in row] for row in rows])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+def ndjson_response(session_factory: async_sessionmaker, stmt: Select, columns: list[str], filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        _ndjson(session_factory, stmt, columns),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'},
+    )
+
+def csv_response(session_factory: async_sessionmaker, stmt: Select, columns: list[str], filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        _csv(session_factory, stmt, columns),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+    )
+
+async def xlsx_response(session_factory: async_sessionmaker, stmt: Select, columns: list[str], filename: str) -> FileResponse:
+    # write_only: строки сразу уходят во временный файл openpyxl, а не в память
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(filename[:31])
+    ws.append(columns)
+    async for rows in stream_rows(session_factory, stmt):
+        for row in rows:
+            ws.append([_plain(v) for v in row])
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    await asyncio.to_thread(wb.save, path)
+    return FileResponse(
+        path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=f"{filename}.xlsx",
+        background=BackgroundTask(os.unlink, path),
+    )
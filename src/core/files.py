@@ -1,42 +1,183 @@
-# helpers/files.py
-import io, uuid, datetime
+# core/files.py
+import asyncio, hashlib, os, uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 import aiofiles
 from fastapi import UploadFile, HTTPException, status
-from PIL import Image
+from PIL import Image, ImageOps
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 MEDIA_ROOT = BASE_DIR / "media"
+IMAGES_ROOT = MEDIA_ROOT / "img"
+UPLOAD_TMP = BASE_DIR / ".media_tmp"   # вне /media, чтобы недокачанное не раздавалось
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Производные копии: для Telegram (sendPhoto ужимает до 1280) и для списка в WebApp.
+# Копии одного размера делят имя и отличаются только расширением — так их
+# выбирает по Accept раздача /media/img (src/api/media.py).
+RENDITIONS = {
+    "tg": ("_tg", 1280, "JPEG", ".jpg"),
+    "list": ("_list", 480, "WEBP", ".webp"),
+    "list_jpg": ("_list", 480, "JPEG", ".jpg"),
+}
+FORMAT_EXT = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+
+# декодирование и ресайз — в отдельных потоках, Pillow отпускает GIL
+_image_pool = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image")
 
 def ext_by_ct(ct: str) -> str | None:
     return {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp"}.get(ct)
 
-async def save_image(img: UploadFile, max_mb: int = 20) -> str:
-    if not img.content_type or not img.content_type.startswith("image/"):
-        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Only images allowed")
+@dataclass(frozen=True)
+class StoredImage:
+    digest: str                  # sha256 исходных байт
+    path: str                    # оригинал без EXIF, относительно BASE_DIR
+    renditions: dict[str, str]
+    size: int                    # байт на диске: оригинал + копии
+
+def _relative(path: Path) -> str:
+    return str(path.relative_to(BASE_DIR)).replace("\\", "/")
+
+def image_dir(digest: str) -> Path:
+    # media/img/ab/cd/<sha256>… — не больше 65536 каталогов, в каждом немного файлов
+    return IMAGES_ROOT / digest[:2] / digest[2:4]
+
+def rendition_path(path: str, name: str) -> str:
+    # media/img/ab/cd/<hash>.jpg -> media/img/ab/cd/<hash>_list.webp
+    suffix, _, _, ext = RENDITIONS[name]
+    stem = path.rsplit(".", 1)[0]
+    return f"{stem}{suffix}{ext}"
 
-    ext = ext_by_ct(img.content_type)
-    if not ext:
+def rendition_of(path: str | None, name: str) -> str | None:
+    # у старых файлов (media/YYYY/MM/DD/uuid.ext) копий нет
+    if not path or not path.startswith("media/img/"):
+        return None
+    return rendition_path(path, name)
+
+def remove_legacy_image(path: str | None) -> None:
+    # файлы media/YYYY/MM/DD/uuid.ext не в индексе и ни с кем не делятся
+    if path and rendition_of(path, "list") is None:
+        (BASE_DIR / path).unlink(missing_ok=True)
+
+def _flatten(image: Image.Image) -> Image.Image:
+    # JPEG без альфы: прозрачность — на белый фон
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    if image.mode != "RGB":
+        return image.convert("RGB")
+    return image
+
+def _save(image: Image.Image, target: Path, fmt: str, **params) -> None:
+    # пишем во временный файл рядом и переименовываем — читатели не увидят половину
+    tmp = target.with_name(f".{uuid.uuid4().hex}{target.suffix}")
+    try:
+        if fmt == "JPEG":
+            _flatten(image).save(tmp, "JPEG", quality=params.get("quality", 85), optimize=True, progressive=True)
+        elif fmt == "WEBP":
+            image.save(tmp, "WEBP", quality=params.get("quality", 80), method=4)
+        else:
+            image.save(tmp, fmt, optimize=True)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+def _process_image(tmp_path: Path, digest: str) -> StoredImage:
+    # Выполняется в пуле: проверка, снятие EXIF, копии нужных размеров
+    try:
+        with Image.open(tmp_path) as probe:
+            probe.verify()
+        image = Image.open(tmp_path)
+        image.load()
+    except (Image.DecompressionBombError, OSError, SyntaxError, ValueError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid image")
+
+    try:
+        return _store_image(image, tmp_path, digest)
+    finally:
+        image.close()
+
+def _store_image(image: Image.Image, tmp_path: Path, digest: str) -> StoredImage:
+    fmt = image.format
+    if fmt not in FORMAT_EXT:
         raise HTTPException(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, "Unsupported image type")
 
-    raw = await img.read()
-    if len(raw) > max_mb * 1024 * 1024:
-        raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "File too large")
+    folder = image_dir(digest)
+    folder.mkdir(parents=True, exist_ok=True)
+    original = folder / f"{digest}{FORMAT_EXT[fmt]}"
+
+    has_exif = bool(image.getexif())
+    # поворот по EXIF применяем до того, как его выбросить
+    image = ImageOps.exif_transpose(image)
+    if original.exists():
+        pass
+    elif has_exif:
+        _save(image, original, fmt, quality=95)
+    else:
+        os.replace(tmp_path, original)
+
+    renditions = {}
+    size = original.stat().st_size
+    for name, (_, max_side, rfmt, _) in RENDITIONS.items():
+        target = BASE_DIR / rendition_path(_relative(original), name)
+        if not target.exists():
+            copy = image.copy()
+            copy.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            _save(copy, target, rfmt)
+        renditions[name] = _relative(target)
+        size += target.stat().st_size
+
+    return StoredImage(digest=digest, path=_relative(original), renditions=renditions, size=size)
 
-    # проверим, что это реально картинка
+async def spool_upload(img: UploadFile, max_bytes: int) -> tuple[Path, str]:
+    # Пишем поток на диск кусками, считая хэш и размер по ходу — в памяти только один кусок
+    UPLOAD_TMP.mkdir(parents=True, exist_ok=True)
+    tmp_path = UPLOAD_TMP / uuid.uuid4().hex
+    hasher = hashlib.sha256()
+    total = 0
     try:
-        Image.open(io.BytesIO(raw)).verify()
-    except Exception:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            while chunk := await img.read(UPLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if total > max_bytes:
+                    raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "File too large")
+                hasher.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if total == 0:
+        tmp_path.unlink(missing_ok=True)
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid image")
+    return tmp_path, hasher.hexdigest()
+
+def check_upload(img: UploadFile, max_mb: int) -> int:
+    if not img.content_type or not img.content_type.startswith("image/"):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Only images allowed")
+
+    if not ext_by_ct(img.content_type):
+        raise HTTPException(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, "Unsupported image type")
+
+    max_bytes = max_mb * 1024 * 1024
+    if img.size is not None and img.size > max_bytes:
+        raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "File too large")
+    return max_bytes
 
-    # media/YYYY/MM/DD/uuid.ext
-    subdir = MEDIA_ROOT / datetime.date.today().strftime("%Y/%m/%d")
-    subdir.mkdir(parents=True, exist_ok=True)
-    filename = f"{uuid.uuid4().hex}{ext}"
-    file_location = subdir / filename
+async def process_upload(tmp_path: Path, digest: str) -> StoredImage:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_image_pool, _process_image, tmp_path, digest)
 
-    async with aiofiles.open(file_location, "wb") as f:
-        await f.write(raw)
+def stored_from_path(digest: str, path: str, size: int) -> StoredImage | None:
+    # уже обработанный файл: если оригинал и все копии на месте — декодировать заново не нужно
+    if not all(file.exists() for file in media_files(path)):
+        return None
+    renditions = {name: rendition_path(path, name) for name in RENDITIONS}
+    return StoredImage(digest=digest, path=path, renditions=renditions, size=size)
 
-    relative_path = file_location.relative_to(BASE_DIR)
-    return str(relative_path).replace("\\", "/")
+def media_files(path: str) -> list[Path]:
+    return [BASE_DIR / path, *(BASE_DIR / rendition_path(path, name) for name in RENDITIONS)]
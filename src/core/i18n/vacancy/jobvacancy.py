@@ -1,19 +1,47 @@
 # eng, rus, kaa, uzb, kaz, kgz, tjk, aze, tkm
 from src.models.vacancy import JobVacancy
 from src.core.i18n.vacancy.vacancy_types import TgPost
-from src.core.i18n.vacancy.converter import read_json_file
-
-def _lbl(labels: dict, code: str, key: str) -> str:
-    return labels.get(code, labels["eng"]).get(key, key)
+from src.core.i18n.vacancy.registry import template_registry
+
+FIELD_ICONS = {
+    "position_title": "👨‍💼",
+    "organization_name": "🏛",
+    "address": "📍",
+    "requirements": "📌",
+    "duties": "📑",
+    "work_schedule": "⏰",
+    "salary": "💰",
+    "contact": "☎️",
+    "additional_info": "📎",
+}
+template_registry.register("jobvacancy", FIELD_ICONS)
 
 def esc(s: str | None) -> str:
     return (s or "").strip()
 
+def _body(t, post: JobVacancy) -> str:
+    ln = t.lines
+    lines = [
+        t.hashtag,
+        ln["position_title"] + esc(post.position_title),
+    ]
+    if post.organization_name:
+        lines.append(ln["organization_name"] + esc(post.organization_name))
+    lines.append(ln["address"] + esc(post.address))
+    lines.append(ln["requirements"] + esc(post.requirements))
+    if post.duties:
+        lines.append(ln["duties"] + esc(post.duties))
+    lines.append(ln["work_schedule"] + esc(post.work_schedule))
+    lines.append(ln["salary"] + esc(post.salary))
+    lines.append(ln["contact"] + esc(post.contact))
+    if post.additional_info:
+        lines.append(ln["additional_info"] + esc(post.additional_info))
+    return "\n".join(lines)
+
 async def get_vacancy_group_format(post: JobVacancy, lang_code: str = "kaa") -> str:
-    LABELS_JSON = await read_json_file("./i18n_jsons/jobvacancy.json")
-    d = LABELS_JSON.get(lang_code, LABELS_JSON["eng"])
+    t = template_registry.get("jobvacancy", lang_code)
 
-    header = f"# {d['title']} ID: {post.id}\n\n"
+    header = f"{t.header}{post.id}\n\n"
 
     # Локация
     loc = f"🌎 {esc(post.country.name) if post.country else ''}"
@@ -21,40 +49,8 @@ async def get_vacancy_group_format(post: JobVacancy, lang_code: str = "kaa") ->
         loc += f" | {esc(post.region.name)}"
     loc += "\n\n"
 
-    lines = []
-    lines.append(f"{d['hashtag']}\n")
-    lines.append(f"👨‍💼 <b>{d['position_title']}</b>: {esc(post.position_title)}")
-    if post.organization_name:
-        lines.append(f"🏛 <b>{d['organization_name']}</b>: {esc(post.organization_name)}")
-    lines.append(f"📍 <b>{d['address']}</b>: {esc(post.address)}")
-    lines.append(f"📌 <b>{d['requirements']}</b>: {esc(post.requirements)}")
-    if post.duties:
-        lines.append(f"📑 <b>{d['duties']}</b>: {esc(post.duties)}")
-    lines.append(f"⏰ <b>{d['work_schedule']}</b>: {esc(post.work_schedule)}")
-    lines.append(f"💰 <b>{d['salary']}</b>: {esc(post.salary)}")
-    lines.append(f"☎️ <b>{d['contact']}</b>: {esc(post.contact)}")
-    if post.additional_info:
-        lines.append(f"📎 <b>{d['additional_info']}</b>: {esc(post.additional_info)}")
-
-    return header + loc + "\n".join(lines)
+    return header + loc + _body(t, post)
 
 async def get_vacancy_channel_format(lang_code: str, post: JobVacancy) -> TgPost:
-    LABELS_JSON = await read_json_file("./i18n_jsons/jobvacancy.json")
-    d = LABELS_JSON.get(lang_code, LABELS_JSON["eng"])
-    lines = [
-        f"{d['hashtag']}\n",
-        f"👨‍💼 <b>{d['position_title']}</b>: {esc(post.position_title)}",
-    ]
-    if post.organization_name:
-        lines.append(f"🏛 <b>{d['organization_name']}</b>: {esc(post.organization_name)}")
-    lines.append(f"📍 <b>{d['address']}</b>: {esc(post.address)}")
-    lines.append(f"📌 <b>{d['requirements']}</b>: {esc(post.requirements)}")
-    if post.duties:
-        lines.append(f"📑 <b>{d['duties']}</b>: {esc(post.duties)}")
-    lines.append(f"⏰ <b>{d['work_schedule']}</b>: {esc(post.work_schedule)}")
-    lines.append(f"💰 <b>{d['salary']}</b>: {esc(post.salary)}")
-    lines.append(f"☎️ <b>{d['contact']}</b>: {esc(post.contact)}")
-    if post.additional_info:
-        lines.append(f"📎 <b>{d['additional_info']}</b>: {esc(post.additional_info)}")
-    result = "\n".join(lines)
-    return TgPost(text=result)
\ No newline at end of file
+    t = template_registry.get("jobvacancy", lang_code)
+    return TgPost(text=_body(t, post))
@@ -1,25 +1,32 @@
 from src.models.vacancy import OpportunitiesGrants
 from src.core.i18n.vacancy.vacancy_types import TgPost
-from src.core.i18n.vacancy.converter import read_json_file
+from src.core.i18n.vacancy.registry import template_registry
+from src.core.files import BASE_DIR, rendition_of
+
+template_registry.register("opportunities_grants", {})
 
 def esc(s: str | None) -> str:
     return (s or "").strip()
 
 async def get_vacancy_channel_format(lang_code: str, post: OpportunitiesGrants) -> TgPost:
-    LABELS_JSON = await read_json_file("./i18n_jsons/opportunities_grants.json")
-    d = LABELS_JSON.get(lang_code, LABELS_JSON["eng"])
+    d = template_registry.get("opportunities_grants", lang_code).labels
 
     text = (
         f"{post.content}\n\n"
         f"{d.get('contact')}"
     )
-    return TgPost(text=text, photo_path=post.img_path)
+    photo = rendition_of(post.img_path, "tg") or post.img_path
+    return TgPost(
+        text=text,
+        photo_path=str(BASE_DIR / photo) if photo else None,
+        photo_file_id=post.tg_file_id,
+    )
 
 async def get_vacancy_group_format(post: OpportunitiesGrants, lang_code: str = "kaa") -> str:
-    LABELS_JSON = await read_json_file("./i18n_jsons/opportunities_grants.json")
-    d = LABELS_JSON.get(lang_code, LABELS_JSON["kaa"])
+    t = template_registry.get("opportunities_grants", lang_code, fallback="kaa")
+    d = t.labels
 
-    header = f"# {d['title']} ID: {post.id}\n\n"
+    header = f"{t.header}{post.id}\n\n"
 
     # Локация
     loc = f"🌎 {esc(post.country.name) if post.country else ''}"
@@ -30,4 +37,4 @@ async def get_vacancy_group_format(post: OpportunitiesGrants, lang_code: str = "
         f"{post.content}\n\n"
         f"{d.get('contact')}: {post.contact}"
     )
-    return header + loc + text
\ No newline at end of file
+    return header + loc + text
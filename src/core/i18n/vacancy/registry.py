@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+I18N_DIR = Path(__file__).resolve().parent / "i18n_jsons"
+TEMPLATES_WATCH_INTERVAL = float(os.getenv("TEMPLATES_WATCH_INTERVAL", "5"))
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    header: str                  # "# {title} ID: "
+    hashtag: str                 # "{hashtag}\n"
+    labels: Mapping[str, str]    # сырые подписи из json
+    lines: Mapping[str, str]     # "{icon} <b>{label}</b>: " для каждого поля
+
+class TemplateRegistry:
+    # Подписи читаются с диска один раз и компилируются в готовые префиксы строк.
+    # При изменении mtime файла снимок пересобирается целиком и подменяется
+    # одним присваиванием — читатели всегда видят согласованную версию.
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._icons: dict[str, Mapping[str, str]] = {}
+        self._templates: Mapping[str, Mapping[str, CompiledTemplate]] = MappingProxyType({})
+        self._mtimes: dict[str, float] = {}
+
+    def register(self, name: str, icons: Mapping[str, str]) -> None:
+        self._icons[name] = MappingProxyType(dict(icons))
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.json"
+
+    def _compile(self, name: str) -> Mapping[str, CompiledTemplate]:
+        raw = json.loads(self._path(name).read_text(encoding="utf-8"))
+        icons = self._icons[name]
+        compiled = {}
+        for lang, labels in raw.items():
+            flat = {k: v for k, v in labels.items() if isinstance(v, str)}
+            compiled[lang] = CompiledTemplate(
+                header=f"# {flat.get('title', '')} ID: ",
+                hashtag=f"{flat.get('hashtag', '')}\n",
+                labels=MappingProxyType(flat),
+                lines=MappingProxyType({
+                    field: f"{icon} <b>{flat.get(field, field)}</b>: "
+                    for field, icon in icons.items()
+                }),
+            )
+        return MappingProxyType(compiled)
+
+    def load(self) -> None:
+        templates = {}
+        mtimes = {}
+        for name in self._icons:
+            mtimes[name] = self._path(name).stat().st_mtime
+            templates[name] = self._compile(name)
+        self._templates = MappingProxyType(templates)
+        self._mtimes = mtimes
+
+    def reload_if_changed(self) -> bool:
+        try:
+            changed = any(
+                self._path(name).stat().st_mtime != self._mtimes.get(name)
+                for name in self._icons
+            )
+            if changed:
+                self.load()
+            return changed
+        except (OSError, ValueError) as err:
+            # битый или недописанный файл — остаёмся на прошлой версии
+            print(f"[i18n] reload failed: {err}")
+            return False
+
+    async def watch(self, interval: float = TEMPLATES_WATCH_INTERVAL) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.reload_if_changed()
+
+    def get(self, name: str, lang_code: str | None, fallback: str = "eng") -> CompiledTemplate:
+        if name not in self._templates:
+            self.load()
+        templates = self._templates[name]
+        return templates.get(lang_code, templates[fallback])
+
+template_registry = TemplateRegistry(I18N_DIR)
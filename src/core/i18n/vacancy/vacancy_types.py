@@ -5,4 +5,5 @@ from typing import Optional
 class TgPost:
     text: str
     photo_path: Optional[str] = None
+    photo_file_id: Optional[str] = None   # уже загруженное в Telegram фото
     parse_mode: str = "HTML"
\ No newline at end of file
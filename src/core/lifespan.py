@@ -1,14 +1,35 @@
+import asyncio
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
-from src.database import async_main, engine
+from src.database import check_schema_revision, engine, async_session
 from src.core.set_countries_base import set_countries_to_base_with_file
+from src.core.bot import start_bot, close_bot
+from src.core.outbox import start_outbox_worker, stop_outbox_worker
+from src.core.i18n.vacancy.registry import template_registry
+from src.core.media import media_gc_loop
+from src.core.avatars import avatar_sweep_loop
+from src.core.reference import reference_store
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Start...")
-    await async_main()
+    await check_schema_revision()
     await set_countries_to_base_with_file()
+    await reference_store.rebuild()
+    reference_refresh = asyncio.create_task(reference_store.refresh_loop())
+    bot = await start_bot()
+    template_registry.load()
+    templates_watcher = asyncio.create_task(template_registry.watch())
+    start_outbox_worker(bot, async_session)
+    media_gc = asyncio.create_task(media_gc_loop(async_session))
+    avatar_sweep = asyncio.create_task(avatar_sweep_loop())
     yield
+    await stop_outbox_worker()
+    media_gc.cancel()
+    avatar_sweep.cancel()
+    reference_refresh.cancel()
+    templates_watcher.cancel()
+    await close_bot()
     await engine.dispose()
     print("End...")
\ No newline at end of file
@@ -0,0 +1,156 @@
+import asyncio
+import os
+from datetime import timedelta
+
+from fastapi import UploadFile
+from sqlalchemy import select, update, delete, func, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.files import StoredImage, check_upload, spool_upload, process_upload, stored_from_path, media_files
+from src.models.media import MediaObject, MediaGcRun
+
+MEDIA_GC_INTERVAL = float(os.getenv("MEDIA_GC_INTERVAL", "3600"))
+MEDIA_GC_GRACE = int(os.getenv("MEDIA_GC_GRACE", "86400"))
+MEDIA_GC_BATCH = int(os.getenv("MEDIA_GC_BATCH", "500"))
+
+# ---------------------------------------------------------------------------
+# Загрузка. Строка индекса создаётся сразу в отдельной транзакции с refcount=0,
+# ссылку добавляет уже транзакция поста (acquire_media). Если пост не сохранился,
+# файл станет сиротой и уйдёт в GC после выдержки.
+
+async def _register(session_factory: async_sessionmaker, stored: StoredImage) -> None:
+    stmt = pg_insert(MediaObject).values(
+        digest=stored.digest, path=stored.path, size=stored.size, released_at=func.now()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[MediaObject.digest],
+        # продлеваем выдержку, чтобы GC не снёс файл до коммита поста
+        set_={"released_at": case((MediaObject.refcount == 0, func.now()), else_=MediaObject.released_at)},
+    )
+    async with session_factory() as session:
+        await session.execute(stmt)
+        await session.commit()
+
+async def store_image(session_factory: async_sessionmaker, img: UploadFile, max_mb: int = 20) -> StoredImage:
+    max_bytes = check_upload(img, max_mb)
+    tmp_path, digest = await spool_upload(img, max_bytes)
+    try:
+        async with session_factory() as session:
+            known = (await session.execute(
+                select(MediaObject.path, MediaObject.size).where(MediaObject.digest == digest)
+            )).one_or_none()
+
+        if known is not None:
+            # тот же файл уже есть — только продлеваем жизнь строке индекса
+            await _register(session_factory, StoredImage(digest, known.path, {}, known.size))
+            stored = stored_from_path(digest, known.path, known.size)
+            if stored is not None:
+                return stored
+
+        stored = await process_upload(tmp_path, digest)
+        await _register(session_factory, stored)
+        return stored
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+async def acquire_media(session: AsyncSession, digest: str) -> None:
+    await session.execute(
+        update(MediaObject)
+        .where(MediaObject.digest == digest)
+        .values(refcount=MediaObject.refcount + 1, released_at=None)
+    )
+
+async def release_media(session: AsyncSession, path: str | None) -> None:
+    # старые файлы (media/YYYY/MM/DD) в индексе не числятся — для них это no-op
+    if not path:
+        return
+    await session.execute(
+        update(MediaObject)
+        .where(MediaObject.path == path, MediaObject.refcount > 0)
+        .values(
+            refcount=MediaObject.refcount - 1,
+            released_at=case((MediaObject.refcount == 1, func.now()), else_=None),
+        )
+    )
+
+# ---------------------------------------------------------------------------
+# Сборка мусора
+
+def _unlink(path: str) -> int:
+    freed = 0
+    for file in media_files(path):
+        try:
+            freed += file.stat().st_size
+            file.unlink()
+        except FileNotFoundError:
+            pass
+    return freed
+
+async def collect_media_garbage(session_factory: async_sessionmaker, batch_size: int = MEDIA_GC_BATCH) -> MediaGcRun:
+    async with session_factory() as session:
+        run = MediaGcRun()
+        session.add(run)
+        await session.commit()
+
+    files_removed = 0
+    bytes_reclaimed = 0
+    while True:
+        async with session_factory() as session:
+            # строки удаляем и коммитим до работы с диском — блокировки не висят,
+            # пока поток стирает файлы
+            expired = (
+                select(MediaObject.digest)
+                .where(
+                    MediaObject.refcount == 0,
+                    MediaObject.released_at < func.now() - timedelta(seconds=MEDIA_GC_GRACE),
+                )
+                .order_by(MediaObject.released_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = (await session.execute(
+                delete(MediaObject)
+                .where(MediaObject.digest.in_(expired.scalar_subquery()))
+                .returning(MediaObject.digest, MediaObject.path)
+            )).all()
+            await session.commit()
+        if not rows:
+            break
+
+        async with session_factory() as session:
+            # загрузка того же хэша могла успеть заново зарегистрировать файл — его не трогаем
+            revived = set((await session.execute(
+                select(MediaObject.digest).where(MediaObject.digest.in_([r.digest for r in rows]))
+            )).scalars())
+        for row in rows:
+            if row.digest in revived:
+                continue
+            freed = await asyncio.to_thread(_unlink, row.path)
+            files_removed += 1
+            bytes_reclaimed += freed
+        if len(rows) < batch_size:
+            break
+
+    async with session_factory() as session:
+        await session.execute(
+            update(MediaGcRun)
+            .where(MediaGcRun.id == run.id)
+            .values(finished_at=func.now(), files_removed=files_removed, bytes_reclaimed=bytes_reclaimed)
+        )
+        await session.commit()
+    run.files_removed = files_removed
+    run.bytes_reclaimed = bytes_reclaimed
+    return run
+
+async def media_gc_loop(session_factory: async_sessionmaker, interval: float = MEDIA_GC_INTERVAL) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            run = await collect_media_garbage(session_factory)
+            if run.files_removed:
+                print(f"[media] gc removed {run.files_removed} objects, {run.bytes_reclaimed} bytes")
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            print(f"[media] gc error: {err}")
@@ -0,0 +1,340 @@
+import asyncio
+import os
+import time
+from datetime import timedelta
+
+from aiogram import Bot
+from aiogram.types import FSInputFile
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+    TelegramUnauthorizedError,
+)
+from sqlalchemy import delete, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.bot import BotConfig, SendMessageConfig, get_group_id
+from src.core.files import BASE_DIR
+from src.core.i18n.vacancy.vacancy_types import TgPost
+from src.models.outbox import TelegramOutbox, OutboxStatus
+from src.models.vacancy import MODEL_BY_TYPE
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+# отправленные строки хранятся OUTBOX_RETENTION_HOURS и удаляются раз в OUTBOX_PRUNE_INTERVAL;
+# FAILED остаются для разбора
+OUTBOX_RETENTION_HOURS = int(os.getenv("OUTBOX_RETENTION_HOURS", "168"))
+OUTBOX_PRUNE_INTERVAL = float(os.getenv("OUTBOX_PRUNE_INTERVAL", "3600"))
+OUTBOX_PRUNE_BATCH = int(os.getenv("OUTBOX_PRUNE_BATCH", "5000"))
+
+# Лимиты Telegram: ~30 сообщений/с на бота, 1/с в личный чат, ~20/мин в группу
+TG_GLOBAL_PER_SECOND = float(os.getenv("TG_GLOBAL_PER_SECOND", "25"))
+TG_CHAT_INTERVAL = 1.0
+TG_GROUP_INTERVAL = 3.0
+
+# ошибки, после которых повтор бессмыслен
+PERMANENT_ERRORS = (TelegramBadRequest, TelegramForbiddenError, TelegramNotFound, TelegramUnauthorizedError)
+
+# ---------------------------------------------------------------------------
+# Постановка в очередь: строка добавляется в текущую транзакцию вызывающего,
+# поэтому сообщение уйдёт только если его транзакция закоммитилась.
+
+def enqueue_message(session: AsyncSession, chat_id: int, text: str) -> TelegramOutbox:
+    item = TelegramOutbox(kind="message", chat_id=chat_id, payload={"text": text})
+    session.add(item)
+    return item
+
+def enqueue_moderation(
+        session: AsyncSession,
+        vacancy_type: str,
+        vacancy_id: int,
+        text: str,
+        photo_path: str | None = None
+    ) -> TelegramOutbox:
+    # photo_path — локальный файл относительно src/; Telegram получит его загрузкой,
+    # а возвращённый file_id сохранится в вакансии (см. finish)
+    item = TelegramOutbox(
+        kind="moderation",
+        chat_id=get_group_id(),
+        payload={"text": text, "photo_path": photo_path},
+        vacancy_type=vacancy_type,
+        vacancy_id=vacancy_id,
+    )
+    session.add(item)
+    return item
+
+def enqueue_channel_post(
+        session: AsyncSession,
+        vacancy_type: str,
+        vacancy_id: int,
+        chat_id: int,
+        post: TgPost,
+        notify_chat_id: int | None = None,
+        notify_text: str | None = None
+    ) -> TelegramOutbox:
+    # публикация в канал, которая не прошла сразу: после отправки finish запишет
+    # channel_chat_id/channel_message_id и поставит в очередь уведомление автору
+    item = TelegramOutbox(
+        kind="channel",
+        chat_id=chat_id,
+        payload={
+            "text": post.text,
+            "photo_path": post.photo_path,
+            "photo_file_id": post.photo_file_id,
+            "parse_mode": post.parse_mode,
+            "notify": {"chat_id": notify_chat_id, "text": notify_text} if notify_text else None,
+        },
+        vacancy_type=vacancy_type,
+        vacancy_id=vacancy_id,
+    )
+    session.add(item)
+    return item
+
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    # Резервирует слот отправки: общий на бота и отдельный на каждый чат.
+    def __init__(self, per_second: float, chat_interval: float, group_interval: float) -> None:
+        self.global_interval = 1.0 / per_second
+        self.chat_interval = chat_interval
+        self.group_interval = group_interval
+        self._next_global = 0.0
+        self._next_chat: dict[int, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, chat_id: int) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next_global, self._next_chat.get(chat_id, 0.0))
+            self._next_global = at + self.global_interval
+            self._next_chat[chat_id] = at + (self.group_interval if chat_id < 0 else self.chat_interval)
+            if len(self._next_chat) > 10_000:
+                self._next_chat = {k: v for k, v in self._next_chat.items() if v > now}
+        if at > now:
+            await asyncio.sleep(at - now)
+
+    def pause(self, chat_id: int, seconds: float) -> None:
+        resume_at = time.monotonic() + seconds
+        self._next_chat[chat_id] = max(self._next_chat.get(chat_id, 0.0), resume_at)
+
+def backoff_seconds(attempts: int) -> int:
+    return min(5 * 2 ** attempts, 600)
+
+class OutboxWorker:
+    def __init__(
+            self,
+            bot: Bot,
+            session_factory: async_sessionmaker,
+            batch_size: int = OUTBOX_BATCH_SIZE,
+            poll_interval: float = OUTBOX_POLL_INTERVAL
+        ) -> None:
+        self.botcfg = BotConfig(bot)
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.limiter = RateLimiter(TG_GLOBAL_PER_SECOND, TG_CHAT_INTERVAL, TG_GROUP_INTERVAL)
+        self.next_prune_at = 0.0
+
+    async def run(self) -> None:
+        while True:
+            try:
+                if time.monotonic() >= self.next_prune_at:
+                    self.next_prune_at = time.monotonic() + OUTBOX_PRUNE_INTERVAL
+                    pruned = await self.prune()
+                    if pruned:
+                        print(f"[outbox] pruned {pruned} sent items")
+                processed = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                print(f"[outbox] worker error: {err}")
+                processed = 0
+            if not processed:
+                await asyncio.sleep(self.poll_interval)
+
+    async def claim(self) -> list:
+        # SKIP LOCKED — несколько процессов не возьмут одну строку;
+        # next_attempt_at служит арендой: если процесс упал, строка вернётся.
+        due = (
+            select(TelegramOutbox.id)
+            .where(TelegramOutbox.status.in_([OutboxStatus.PENDING, OutboxStatus.SENDING]))
+            .where(TelegramOutbox.next_attempt_at <= func.now())
+            .order_by(TelegramOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(TelegramOutbox)
+            .where(TelegramOutbox.id.in_(due.scalar_subquery()))
+            .values(
+                status=OutboxStatus.SENDING,
+                next_attempt_at=func.now() + timedelta(seconds=OUTBOX_LEASE_SECONDS),
+            )
+            .returning(
+                TelegramOutbox.id,
+                TelegramOutbox.kind,
+                TelegramOutbox.chat_id,
+                TelegramOutbox.payload,
+                TelegramOutbox.vacancy_type,
+                TelegramOutbox.vacancy_id,
+                TelegramOutbox.attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        async with self.session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+            await session.commit()
+        return rows
+
+    async def prune(self, retention: timedelta = timedelta(hours=OUTBOX_RETENTION_HOURS)) -> int:
+        # порциями, чтобы не держать блокировки на всей таблице
+        total = 0
+        while True:
+            expired = (
+                select(TelegramOutbox.id)
+                .where(TelegramOutbox.status == OutboxStatus.SENT)
+                .where(TelegramOutbox.updated_at < func.now() - retention)
+                .limit(OUTBOX_PRUNE_BATCH)
+            )
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    delete(TelegramOutbox)
+                    .where(TelegramOutbox.id.in_(expired.scalar_subquery()))
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+            total += result.rowcount
+            if result.rowcount < OUTBOX_PRUNE_BATCH:
+                return total
+
+    async def process_batch(self) -> int:
+        rows = await self.claim()
+        if rows:
+            # ошибка записи результата в БД не должна прерывать остальные отправки;
+            # строка с такой ошибкой вернётся в работу после аренды
+            results = await asyncio.gather(*(self.deliver(row) for row in rows), return_exceptions=True)
+            for row, result in zip(rows, results):
+                if isinstance(result, Exception):
+                    print(f"[outbox] item {row.id} delivery error: {result}")
+        return len(rows)
+
+    async def dispatch(self, row) -> SendMessageConfig:
+        text = row.payload["text"]
+        if row.kind == "moderation":
+            photo = None
+            if row.payload.get("photo_path"):
+                photo = FSInputFile(BASE_DIR / row.payload["photo_path"])
+            elif row.payload.get("photo_url"):
+                # строки, поставленные в очередь до перехода на photo_path
+                photo = row.payload["photo_url"]
+            if photo is not None:
+                return await self.botcfg.send_photo_group(
+                    post_id=row.vacancy_id, text=text, vacancy_type=row.vacancy_type, photo=photo
+                )
+            return await self.botcfg.send_message_group(post_id=row.vacancy_id, text=text, vacancy_type=row.vacancy_type)
+        if row.kind == "channel":
+            post = TgPost(
+                text=text,
+                photo_path=row.payload.get("photo_path"),
+                photo_file_id=row.payload.get("photo_file_id"),
+                parse_mode=row.payload.get("parse_mode") or "HTML",
+            )
+            return await self.botcfg.send_post(chat_id=row.chat_id, post=post)
+        return await self.botcfg.send_message(chat_id=row.chat_id, message=text)
+
+    async def deliver(self, row) -> None:
+        await self.limiter.wait(row.chat_id)
+        try:
+            result = await self.dispatch(row)
+        except TelegramRetryAfter as err:
+            # flood control не считается неудачной попыткой
+            self.limiter.pause(row.chat_id, err.retry_after)
+            await self.reschedule(row.id, row.attempts, err.retry_after, str(err))
+        except PERMANENT_ERRORS as err:
+            await self.finish(row.id, OutboxStatus.FAILED, row.attempts + 1, error=str(err))
+        except Exception as err:
+            attempts = row.attempts + 1
+            if attempts >= OUTBOX_MAX_ATTEMPTS:
+                await self.finish(row.id, OutboxStatus.FAILED, attempts, error=str(err))
+            else:
+                await self.reschedule(row.id, attempts, backoff_seconds(attempts), str(err))
+        else:
+            await self.finish(row.id, OutboxStatus.SENT, row.attempts + 1, result=result, row=row)
+
+    async def reschedule(self, item_id: int, attempts: int, delay: float, error: str) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                update(TelegramOutbox)
+                .where(TelegramOutbox.id == item_id)
+                .values(
+                    status=OutboxStatus.PENDING,
+                    attempts=attempts,
+                    next_attempt_at=func.now() + timedelta(seconds=delay),
+                    last_error=error[:1000],
+                )
+            )
+            await session.commit()
+
+    async def finish(
+            self,
+            item_id: int,
+            status: OutboxStatus,
+            attempts: int,
+            error: str | None = None,
+            result: SendMessageConfig | None = None,
+            row=None
+        ) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                update(TelegramOutbox)
+                .where(TelegramOutbox.id == item_id)
+                .values(
+                    status=status,
+                    attempts=attempts,
+                    last_error=error[:1000] if error else None,
+                    result_message_id=result.message_id if result else None,
+                )
+            )
+            model = MODEL_BY_TYPE.get(row.vacancy_type) if (result and row.kind in ("moderation", "channel")) else None
+            if model is not None:
+                if row.kind == "moderation":
+                    values = {"group_chat_id": result.chat_id, "group_message_id": result.message_id}
+                    if result.file_id and hasattr(model, "tg_file_id"):
+                        values["tg_file_id"] = result.file_id
+                else:
+                    values = {"channel_chat_id": result.chat_id, "channel_message_id": result.message_id}
+                    if result.file_id and hasattr(model, "tg_file_id"):
+                        values["tg_file_id"] = func.coalesce(model.tg_file_id, result.file_id)
+                await session.execute(
+                    update(model)
+                    .where(model.id == row.vacancy_id)
+                    .values(**values)
+                )
+                notify = row.payload.get("notify") if row.kind == "channel" else None
+                if notify:
+                    enqueue_message(session, chat_id=notify["chat_id"], text=notify["text"])
+            await session.commit()
+        if status == OutboxStatus.FAILED:
+            print(f"[outbox] item {item_id} failed after {attempts} attempts: {error}")
+
+_worker_task: asyncio.Task | None = None
+
+def start_outbox_worker(bot: Bot, session_factory: async_sessionmaker) -> OutboxWorker:
+    global _worker_task
+    worker = OutboxWorker(bot, session_factory)
+    _worker_task = asyncio.create_task(worker.run())
+    return worker
+
+async def stop_outbox_worker() -> None:
+    global _worker_task
+    if _worker_task is not None:
+        _worker_task.cancel()
+        try:
+            await _worker_task
+        except asyncio.CancelledError:
+            pass
+        _worker_task = None
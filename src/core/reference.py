@@ -0,0 +1,158 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.core.http_cache import etag_matches, not_modified
+from src.database import async_session
+from src.models.industry import Industry
+from src.models.locations import Country, Region
+
+# Справочники (страны, регионы, индустрии, языки) меняются только из админки,
+# а читаются каждой сессией WebApp. Держим их в памяти процесса готовыми
+# байтами (JSON и gzip), пересобираем после записи в worldAdmin.py/industry.py.
+# Другие процессы подхватят изменения через REFERENCE_REFRESH_INTERVAL.
+
+REFERENCE_REFRESH_INTERVAL = float(os.getenv("REFERENCE_REFRESH_INTERVAL", "60"))
+# клиент всегда переспрашивает, но получает 304, пока версия не сменилась
+REFERENCE_CACHE_CONTROL = "no-cache"
+
+# eng, rus, kaa, uzb, kaz, kgz, tjk, aze, tkm
+LANGUAGES = [
+    {'code': "eng", "official_name": "English"},
+    {'code': "rus", "official_name": "Русский"},
+    {'code': "uzb", "official_name": "Oʻzbekcha"},
+    {'code': "kaz", "official_name": "Қазақша"},
+    {'code': "kaa", "official_name": "Qaraqalpaqsha"},
+    {'code': "kgz", "official_name": "Кыргызча"},
+    {'code': "tjk", "official_name": "Тоҷикӣ"},
+    {'code': "aze", "official_name": "Azərbaycan"},
+    {'code': "tkm", "official_name": "Türkmençe"},
+]
+
+@dataclass(frozen=True)
+class Prepared:
+    # готовый ответ: тело, его gzip (если он короче) и ETag по содержимому
+    body: bytes
+    gzipped: bytes | None
+    etag: str
+
+def prepare(content) -> Prepared:
+    # тот же формат, что у JSONResponse FastAPI
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    return Prepared(body, gzipped if len(gzipped) < len(body) else None, etag)
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    version: str                          # хэш содержимого всех справочников
+    bundle: Prepared                      # /reference
+    countries: Prepared                   # /countries/
+    country_details: dict[int, Prepared]  # /countries/{id}
+    industries_asc: Prepared              # /industry/
+    industries_desc: Prepared             # /industry/?order=desc
+    languages: Prepared                   # /languages/
+
+def _ok(data) -> dict:
+    return {'data': data, 'status': 200, 'message': None, 'error': None}
+
+async def load_snapshot(session_factory: async_sessionmaker) -> ReferenceSnapshot:
+    async with session_factory() as session:
+        countries = (await session.execute(
+            select(Country.id, Country.name, Country.is_active).order_by(Country.id)
+        )).all()
+        regions = (await session.execute(
+            select(Region.id, Region.name, Region.country_id)
+            .where(Region.is_active.is_(True))
+            .order_by(Region.id)
+        )).all()
+        industries = (await session.execute(
+            select(Industry.id, Industry.name).order_by(Industry.id)
+        )).all()
+
+    regions_by_country: dict[int, list[dict]] = {}
+    for region in regions:
+        regions_by_country.setdefault(region.country_id, []).append({'id': region.id, 'name': region.name})
+
+    # /countries/{id} отдаёт и неактивную страну (как раньше), регионы — только активные
+    details = {
+        country.id: {'id': country.id, 'name': country.name, 'regions': regions_by_country.get(country.id, [])}
+        for country in countries
+    }
+    active = [details[country.id] for country in countries if country.is_active]
+    industry_list = [{'id': item.id, 'name': item.name} for item in industries]
+
+    content = {'countries': active, 'industries': industry_list, 'languages': LANGUAGES}
+    version = hashlib.sha256(
+        json.dumps([content, details], ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+
+    return ReferenceSnapshot(
+        version=version,
+        bundle=prepare(_ok({'version': version, **content})),
+        countries=prepare({'data': [{'id': c['id'], 'name': c['name']} for c in active]}),
+        country_details={country_id: prepare(_ok(detail)) for country_id, detail in details.items()},
+        industries_asc=prepare(_ok(industry_list)),
+        industries_desc=prepare(_ok(industry_list[::-1])),
+        languages=prepare(LANGUAGES),
+    )
+
+class ReferenceStore:
+    def __init__(self, session_factory: async_sessionmaker) -> None:
+        self.snapshot: ReferenceSnapshot | None = None
+        self._session_factory = session_factory
+        self._lock = asyncio.Lock()
+
+    async def rebuild(self) -> ReferenceSnapshot:
+        # сборки не накладываются: последняя всегда видит закоммиченную запись
+        async with self._lock:
+            snapshot = await load_snapshot(self._session_factory)
+            if self.snapshot is None or snapshot.version != self.snapshot.version:
+                self.snapshot = snapshot
+                print(f"[reference] snapshot {snapshot.version}")
+            return self.snapshot
+
+    async def get(self) -> ReferenceSnapshot:
+        # собирается в lifespan; здесь — только если запрос пришёл раньше
+        if self.snapshot is None:
+            return await self.rebuild()
+        return self.snapshot
+
+    async def refresh_loop(self, interval: float = REFERENCE_REFRESH_INTERVAL) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebuild()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                print(f"[reference] refresh error: {err}")
+
+reference_store = ReferenceStore(async_session)
+
+async def refresh_reference() -> None:
+    # вызывается после коммита в админских роутах; ошибка не должна ломать ответ админке
+    try:
+        await reference_store.rebuild()
+    except Exception as err:
+        print(f"[reference] rebuild error: {err}")
+
+def prepared_response(request: Request, prepared: Prepared) -> Response:
+    if etag_matches(request, prepared.etag):
+        response = not_modified(prepared.etag, REFERENCE_CACHE_CONTROL)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    headers = {"ETag": prepared.etag, "Cache-Control": REFERENCE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    body = prepared.body
+    if prepared.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        body = prepared.gzipped
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, media_type="application/json", headers=headers)
@@ -1,36 +1,96 @@
+from dataclasses import dataclass
 from pathlib import Path
+import hashlib
 import re
-from sqlalchemy import text
+import time
 from src.database import engine
 
-COUNTRY_SQL = Path("src/models/country.sql")
-REGION_SQL  = Path("src/models/region.sql")
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+COUNTRY_SQL = MODELS_DIR / "country.sql"
+REGION_SQL  = MODELS_DIR / "region.sql"
 
-async def run_sql_file_line_by_line(conn, path: Path):
-    if not path.exists():
-        print(f"[seed] Файл не найден: {path}")
-        return
+@dataclass(frozen=True)
+class SeedFile:
+    path: Path
+    table: str
+    columns: tuple[str, ...]
 
-    needs_on_conflict = re.compile(r";\s*$", re.IGNORECASE)
-    has_on_conflict = re.compile(r"\bon\s+conflict\b", re.IGNORECASE)
+# порядок важен: region ссылается на country
+SEED_FILES = (
+    SeedFile(COUNTRY_SQL, "country", ("id", "en", "name", "time_zoneutc")),
+    SeedFile(REGION_SQL, "region", ("id", "name", "country_id")),
+)
 
-    count = 0
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        async with conn.begin():
-            for line in f:
-                ln = line.strip()
-                if not ln or not ln.lower().startswith("insert into"):
-                    continue
-                if not has_on_conflict.search(ln):
-                    if needs_on_conflict.search(ln):
-                        ln = needs_on_conflict.sub(" ON CONFLICT DO NOTHING;", ln)
-                    else:
-                        ln = ln + " ON CONFLICT DO NOTHING;"
-                await conn.execute(text(ln))
-                count += 1
-    print(f"[seed] {path.name}: вставлено (или пропущено из-за конфликта) строк: {count}")
+# один ключ на все процессы: при одновременном старте грузит только первый
+SEED_LOCK_KEY = 7310452
+
+INSERT_RE = re.compile(r"^\s*insert\s+into\s+(\w+)\s*\(([^)]*)\)\s*values\s*\((.*)\)\s*;?\s*$", re.IGNORECASE)
+VALUE_RE = re.compile(r"'((?:[^']|'')*)'|(NULL)|(-?\d+(?:\.\d+)?)", re.IGNORECASE)
+
+def parse_value(match: re.Match):
+    text_value, null, number = match.groups()
+    if null:
+        return None
+    if number is not None:
+        return float(number) if "." in number else int(number)
+    return text_value.replace("''", "'")
+
+def parse_seed_file(seed: SeedFile, content: str) -> list[tuple]:
+    # Файлы — по одному INSERT ... VALUES (...) на строку
+    records = []
+    for line in content.splitlines():
+        m = INSERT_RE.match(line)
+        if not m:
+            continue
+        table, columns, values = m.groups()
+        columns = tuple(c.strip() for c in columns.split(","))
+        if table.lower() != seed.table or columns != seed.columns:
+            raise ValueError(f"[seed] {seed.path.name}: unexpected insert into {table} {columns}")
+        records.append(tuple(parse_value(v) for v in VALUE_RE.finditer(values)))
+    return records
+
+async def load_seed(conn, seed: SeedFile, content: str) -> int:
+    # COPY во временную таблицу и один INSERT ... SELECT в основную.
+    # ON CONFLICT DO NOTHING, как и раньше: правки из админки не перетираются.
+    records = parse_seed_file(seed, content)
+    staging = f"_seed_{seed.table}"
+    columns = ", ".join(seed.columns)
+    await conn.execute(
+        f"CREATE TEMP TABLE {staging} (LIKE {seed.table} INCLUDING DEFAULTS) ON COMMIT DROP"
+    )
+    await conn.copy_records_to_table(staging, records=records, columns=list(seed.columns))
+    status = await conn.execute(
+        f"INSERT INTO {seed.table} ({columns}) SELECT {columns} FROM {staging} "
+        f"ON CONFLICT DO NOTHING"
+    )
+    # id задаются явно — сдвигаем последовательность, иначе следующий insert из админки упадёт
+    await conn.execute(
+        f"SELECT setval(pg_get_serial_sequence('{seed.table}', 'id'), "
+        f"GREATEST((SELECT max(id) FROM {seed.table}), 1))"
+    )
+    return int(status.rsplit(" ", 1)[-1])
 
 async def set_countries_to_base_with_file():
-    async with engine.connect() as conn:
-        await run_sql_file_line_by_line(conn, COUNTRY_SQL)
-        await run_sql_file_line_by_line(conn, REGION_SQL)
\ No newline at end of file
+    started = time.perf_counter()
+    async with engine.connect() as sa_conn:
+        raw = await sa_conn.get_raw_connection()
+        conn = raw.driver_connection  # asyncpg.Connection
+        async with conn.transaction():
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", SEED_LOCK_KEY)
+            stored = dict(await conn.fetch("SELECT name, checksum FROM seed_checksums"))
+            for seed in SEED_FILES:
+                if not seed.path.exists():
+                    print(f"[seed] Файл не найден: {seed.path}")
+                    continue
+                raw_bytes = seed.path.read_bytes()
+                checksum = hashlib.sha256(raw_bytes).hexdigest()
+                if stored.get(seed.path.name) == checksum:
+                    continue
+                inserted = await load_seed(conn, seed, raw_bytes.decode("utf-8", errors="ignore"))
+                await conn.execute(
+                    "INSERT INTO seed_checksums (name, checksum) VALUES ($1, $2) "
+                    "ON CONFLICT (name) DO UPDATE SET checksum = EXCLUDED.checksum, loaded_at = now()",
+                    seed.path.name, checksum,
+                )
+                print(f"[seed] {seed.path.name}: новых строк {inserted}")
+    print(f"[seed] готово за {(time.perf_counter() - started) * 1000:.1f} ms")
@@ -0,0 +1,88 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import TTLCache
+from src.core.jwt import create_access_token, create_refresh_token, verify_refresh_token, REFRESH_TOKEN_EXPIRE_DAYS
+from src.models.tokens import RefreshToken
+
+import os
+
+REFRESH_DENYLIST_SIZE = int(os.getenv("REFRESH_DENYLIST_SIZE", "100000"))
+
+# Отозванные цепочки: ключ — 16 байт family_id, живёт не дольше самого
+# refresh-токена. Промах по памяти (рестарт, другой процесс) решает БД.
+refresh_denylist = TTLCache(ttl=REFRESH_TOKEN_EXPIRE_DAYS * 86400, maxsize=REFRESH_DENYLIST_SIZE)
+
+async def issue_token_pair(
+        session: AsyncSession,
+        user_id: int,
+        telegram_id: int,
+        family_id: uuid.UUID | None = None
+    ) -> dict:
+    # Строка добавляется в сессию вызывающего — commit за ним
+    jti = uuid.uuid4()
+    family_id = family_id or uuid.uuid4()
+    session.add(RefreshToken(
+        jti=jti,
+        family_id=family_id,
+        user_id=user_id,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    access = await create_access_token({"user_id": user_id, "telegram_id": telegram_id})
+    refresh = await create_refresh_token({
+        "user_id": user_id,
+        "telegram_id": telegram_id,
+        "jti": jti.hex,
+        "fid": family_id.hex,
+    })
+    return {"access_token": access, "refresh_token": refresh, "token_type": "bearer"}
+
+async def revoke_family(session: AsyncSession, family_id: uuid.UUID) -> None:
+    await session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+    )
+    refresh_denylist.set(family_id.bytes, True)
+
+async def rotate_refresh_token(session: AsyncSession, token: str) -> dict | None:
+    payload = await verify_refresh_token(token)
+    if not payload:
+        return None
+    try:
+        jti = uuid.UUID(payload["jti"])
+        family_id = uuid.UUID(payload["fid"])
+        telegram_id = int(payload["telegram_id"])
+    except (KeyError, TypeError, ValueError):
+        # токены, выданные до ротации, без jti — только повторный вход
+        return None
+
+    if refresh_denylist.get(family_id.bytes):
+        return None
+
+    # Одна индексированная операция: погасить токен, если он ещё действителен
+    res = await session.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now(),
+        )
+        .values(used_at=func.now())
+        .returning(RefreshToken.user_id)
+    )
+    user_id = res.scalar_one_or_none()
+    if user_id is None:
+        # подпись верна, но токен уже использован — цепочка скомпрометирована
+        print(f"[auth] refresh token reuse, family {family_id.hex} revoked")
+        await revoke_family(session, family_id)
+        await session.commit()
+        return None
+
+    pair = await issue_token_pair(session, user_id, telegram_id, family_id=family_id)
+    await session.commit()
+    return pair
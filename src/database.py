@@ -1,6 +1,9 @@
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine, AsyncSession
 from typing import AsyncGenerator
+from pathlib import Path
 from dotenv import load_dotenv
 load_dotenv()
 import os
@@ -18,12 +21,42 @@ from src.models.industry import Industry
 from src.models.users import Users, Clients
 from src.models.channels import Channels
 from src.models.vacancy import JobVacancy, Internship, OneTimeTask, OpportunitiesGrants, StatusEnum
+from src.models.outbox import TelegramOutbox
+from src.models.tokens import RefreshToken
+from src.models.media import MediaObject, MediaGcRun
+from src.models.seed import SeedChecksum
+from src.models.statistic import VacancyCounters
+from src.models.post_index import PostIndex
 
-# Use connection
-async def async_main():
-    async with engine.begin() as connect:
-        await connect.run_sync(Base.metadata.create_all)
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+# Схемой управляет Alembic (alembic upgrade head). При старте только сверяем
+# ревизию базы с последней ревизией в src/migrations — один SELECT, без отражения таблиц.
+def schema_head() -> str:
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+async def check_schema_revision():
+    head = schema_head()
+    async with engine.connect() as connect:
+        try:
+            current = (await connect.execute(text("SELECT version_num FROM alembic_version"))).scalar_one_or_none()
+        except ProgrammingError:
+            current = None
+    if current != head:
+        raise RuntimeError(
+            f"Database schema is at {current}, expected {head}. Run `alembic upgrade head` "
+            f"(databases created by create_all before migrations: `alembic stamp 0001_baseline` first)."
+        )
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+# Для кода, которому нужны свои транзакции помимо сессии запроса
+# (индекс медиа, потоковые выгрузки). В тестах подменяется через dependency_overrides.
+def get_session_factory() -> async_sessionmaker:
+    return async_session
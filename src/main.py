@@ -12,9 +12,10 @@ BASE_DIR = Path(__file__).resolve().parent
 MEDIA_ROOT = BASE_DIR / "media"
 
 app = FastAPI(title="AumetaJobs",lifespan=lifespan, version="1.5.2")
-app.mount("/media", StaticFiles(directory=MEDIA_ROOT), name="static")
 
 app.include_router(routers)
+# после роутеров: /media/img/* обслуживает src/api/media.py, остальное — StaticFiles
+app.mount("/media", StaticFiles(directory=MEDIA_ROOT), name="static")
 
 # middlewares
 setup_cors(app)
@@ -0,0 +1,229 @@
+"""baseline: исходная схема, которую создавал create_all до перехода на миграции
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 12:00:00
+
+Только таблицы и колонки исходных моделей. Всё, что добавлялось позже
+(outbox, счётчики, refresh-токены, медиа, новые колонки и индексы), — в
+следующих ревизиях, и они идемпотентны. Поэтому любая база, созданная
+раньше через create_all (+ SCHEMA_PATCHES), независимо от того, с какой
+версии кода она последний раз стартовала, помечается и догоняется так:
+
+    alembic stamp 0001_baseline && alembic upgrade head
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+status_type = postgresql.ENUM('NEW', 'IN_REVIEW', 'APPROVED', 'REJECTED', name='status_type')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    status_type.create(bind, checkfirst=True)
+
+    op.create_table('country',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('en', sa.String(length=255), nullable=True),
+    sa.Column('name', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.Column('time_zoneutc', sa.String(length=255), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('industry',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('name', sa.String(length=256), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+    sa.Column('language_code', sa.String(length=12), nullable=True),
+    sa.Column('full_name', sa.String(length=256), nullable=True),
+    sa.Column('contact', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_telegram_id'), 'users', ['telegram_id'], unique=True)
+    op.create_table('region',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=True),
+    sa.Column('country_id', sa.BigInteger(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.ForeignKeyConstraint(['country_id'], ['country.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('channels',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('country_id', sa.BigInteger(), nullable=False),
+    sa.Column('region_id', sa.BigInteger(), nullable=True),
+    sa.Column('channel_url', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['country_id'], ['country.id'], ),
+    sa.ForeignKeyConstraint(['region_id'], ['region.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('clients',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('company_name', sa.String(length=300), nullable=True),
+    sa.Column('industry_id', sa.BigInteger(), nullable=True),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('country_id', sa.BigInteger(), nullable=True),
+    sa.Column('region_id', sa.BigInteger(), nullable=True),
+    sa.ForeignKeyConstraint(['country_id'], ['country.id'], ),
+    sa.ForeignKeyConstraint(['industry_id'], ['industry.id'], ),
+    sa.ForeignKeyConstraint(['region_id'], ['region.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_table('internship',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('author_id', sa.BigInteger(), nullable=False),
+    sa.Column('country_id', sa.BigInteger(), nullable=False),
+    sa.Column('region_id', sa.BigInteger(), nullable=True),
+    sa.Column('position_title', sa.String(), nullable=False),
+    sa.Column('organization_name', sa.String(length=255), nullable=True),
+    sa.Column('requirements', sa.String(), nullable=False),
+    sa.Column('duties', sa.String(), nullable=False),
+    sa.Column('conditions', sa.String(), nullable=True),
+    sa.Column('address', sa.String(length=255), nullable=False),
+    sa.Column('salary', sa.String(), nullable=False),
+    sa.Column('contact', sa.String(), nullable=False),
+    sa.Column('additional_info', sa.String(), nullable=True),
+    sa.Column('status', postgresql.ENUM('NEW', 'IN_REVIEW', 'APPROVED', 'REJECTED', name='status_type', create_type=False), server_default=sa.text("'NEW'"), nullable=False),
+    sa.Column('reject_reason', sa.String(), nullable=True),
+    sa.Column('is_delete', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.Column('group_chat_id', sa.BigInteger(), nullable=True),
+    sa.Column('group_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('channel_chat_id', sa.BigInteger(), nullable=True),
+    sa.Column('channel_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('moderator_id', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['country_id'], ['country.id'], ),
+    sa.ForeignKeyConstraint(['region_id'], ['region.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_internship_author_id'), 'internship', ['author_id'], unique=False)
+    op.create_index(op.f('ix_internship_country_id'), 'internship', ['country_id'], unique=False)
+    op.create_index(op.f('ix_internship_region_id'), 'internship', ['region_id'], unique=False)
+    op.create_index(op.f('ix_internship_status'), 'internship', ['status'], unique=False)
+    op.create_table('job_vacancies',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('author_id', sa.BigInteger(), nullable=False),
+    sa.Column('country_id', sa.BigInteger(), nullable=False),
+    sa.Column('region_id', sa.BigInteger(), nullable=True),
+    sa.Column('position_title', sa.String(), nullable=False),
+    sa.Column('organization_name', sa.String(length=255), nullable=True),
+    sa.Column('address', sa.String(length=255), nullable=False),
+    sa.Column('requirements', sa.String(), nullable=False),
+    sa.Column('duties', sa.String(), nullable=True),
+    sa.Column('work_schedule', sa.String(), nullable=False),
+    sa.Column('salary', sa.String(), nullable=False),
+    sa.Column('contact', sa.String(), nullable=False),
+    sa.Column('additional_info', sa.String(), nullable=True),
+    sa.Column('status', postgresql.ENUM('NEW', 'IN_REVIEW', 'APPROVED', 'REJECTED', name='status_type', create_type=False), server_default=sa.text("'NEW'"), nullable=False),
+    sa.Column('reject_reason', sa.String(), nullable=True),
+    sa.Column('is_delete', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.Column('group_chat_id', sa.BigInteger(), nullable=True),
+    sa.Column('group_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('channel_chat_id', sa.BigInteger(), nullable=True),
+    sa.Column('channel_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('moderator_id', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['country_id'], ['country.id'], ),
+    sa.ForeignKeyConstraint(['region_id'], ['region.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_vacancies_author_id'), 'job_vacancies', ['author_id'], unique=False)
+    op.create_index(op.f('ix_job_vacancies_country_id'), 'job_vacancies', ['country_id'], unique=False)
+    op.create_index(op.f('ix_job_vacancies_region_id'), 'job_vacancies', ['region_id'], unique=False)
+    op.create_index(op.f('ix_job_vacancies_status'), 'job_vacancies', ['status'], unique=False)
+    op.create_table('one_time_task',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('author_id', sa.BigInteger(), nullable=False),
+    sa.Column('country_id', sa.BigInteger(), nullable=False),
+    sa.Column('region_id', sa.BigInteger(), nullable=True),
+    sa.Column('who_needed', sa.String(), nullable=False),
+    sa.Column('task_description', sa.String(), nullable=False),
+    sa.Column('deadline', sa.String(), nullable=True),
+    sa.Column('salary', sa.String(), nullable=False),
+    sa.Column('contact', sa.String(), nullable=False),
+    sa.Column('address', sa.String(length=255), nullable=True),
+    sa.Column('additional_info', sa.String(), nullable=True),
+    sa.Column('status', postgresql.ENUM('NEW', 'IN_REVIEW', 'APPROVED', 'REJECTED', name='status_type', create_type=False), server_default=sa.text("'NEW'"), nullable=False),
+    sa.Column('reject_reason', sa.String(), nullable=True),
+    sa.Column('is_delete', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.Column('group_chat_id', sa.BigInteger(), nullable=True),
+    sa.Column('group_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('channel_chat_id', sa.BigInteger(), nullable=True),
+    sa.Column('channel_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('moderator_id', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['country_id'], ['country.id'], ),
+    sa.ForeignKeyConstraint(['region_id'], ['region.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_one_time_task_author_id'), 'one_time_task', ['author_id'], unique=False)
+    op.create_index(op.f('ix_one_time_task_country_id'), 'one_time_task', ['country_id'], unique=False)
+    op.create_index(op.f('ix_one_time_task_region_id'), 'one_time_task', ['region_id'], unique=False)
+    op.create_index(op.f('ix_one_time_task_status'), 'one_time_task', ['status'], unique=False)
+    op.create_table('opportunities_grants',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('author_id', sa.BigInteger(), nullable=False),
+    sa.Column('country_id', sa.BigInteger(), nullable=False),
+    sa.Column('region_id', sa.BigInteger(), nullable=True),
+    sa.Column('img_path', sa.String(length=256), nullable=True),
+    sa.Column('content', sa.String(), nullable=False),
+    sa.Column('contact', sa.String(length=256), nullable=False),
+    sa.Column('status', postgresql.ENUM('NEW', 'IN_REVIEW', 'APPROVED', 'REJECTED', name='status_type', create_type=False), server_default=sa.text("'NEW'"), nullable=False),
+    sa.Column('reject_reason', sa.String(), nullable=True),
+    sa.Column('is_delete', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.Column('group_chat_id', sa.BigInteger(), nullable=True),
+    sa.Column('group_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('channel_chat_id', sa.BigInteger(), nullable=True),
+    sa.Column('channel_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('moderator_id', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['country_id'], ['country.id'], ),
+    sa.ForeignKeyConstraint(['region_id'], ['region.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_opportunities_grants_author_id'), 'opportunities_grants', ['author_id'], unique=False)
+    op.create_index(op.f('ix_opportunities_grants_country_id'), 'opportunities_grants', ['country_id'], unique=False)
+    op.create_index(op.f('ix_opportunities_grants_region_id'), 'opportunities_grants', ['region_id'], unique=False)
+    op.create_index(op.f('ix_opportunities_grants_status'), 'opportunities_grants', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('opportunities_grants')
+    op.drop_table('one_time_task')
+    op.drop_table('job_vacancies')
+    op.drop_table('internship')
+    op.drop_table('clients')
+    op.drop_table('channels')
+    op.drop_table('region')
+    op.drop_table('users')
+    op.drop_table('industry')
+    op.drop_table('country')
+
+    bind = op.get_bind()
+    status_type.drop(bind, checkfirst=True)
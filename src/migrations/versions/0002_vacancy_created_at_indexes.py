@@ -0,0 +1,39 @@
+"""индексы по created_at для статистики по периодам
+
+Revision ID: 0002_vacancy_created_at_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 12:00:00
+
+CONCURRENTLY не держит блокировку записи на таблицах вакансий. На базах,
+где индексы уже создал старый SCHEMA_PATCHES, IF NOT EXISTS их пропустит.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_vacancy_created_at_indexes'
+down_revision: Union[str, None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("job_vacancies", "internship", "one_time_task", "opportunities_grants")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f"ix_{table}_created_at", table, ["created_at"],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(
+                f"ix_{table}_created_at", table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
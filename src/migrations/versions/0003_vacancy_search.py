@@ -0,0 +1,81 @@
+"""полнотекстовый поиск: search_vector и GIN-индексы на таблицах вакансий
+
+Revision ID: 0003_vacancy_search
+Revises: 0002_vacancy_created_at_indexes
+Create Date: 2026-10-18 14:00:00
+
+ADD COLUMN ... GENERATED ALWAYS AS ... STORED переписывает таблицу целиком
+под ACCESS EXCLUSIVE — на больших базах запускать в окно обслуживания.
+Индексы после этого строятся CONCURRENTLY. Выражения скопированы из
+SEARCH_DOCUMENTS (src/models/vacancy.py) и должны совпадать с ними.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_vacancy_search'
+down_revision: Union[str, None] = '0002_vacancy_created_at_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_DOCUMENTS = {
+    "job_vacancies": (
+        "setweight(to_tsvector('simple'::regconfig, coalesce(position_title, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(organization_name, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(requirements, '')), 'B') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(duties, '')), 'B') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(address, '')), 'C') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(work_schedule, '')), 'C') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(salary, '')), 'C') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(additional_info, '')), 'C')"
+    ),
+    "internship": (
+        "setweight(to_tsvector('simple'::regconfig, coalesce(position_title, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(organization_name, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(requirements, '')), 'B') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(duties, '')), 'B') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(conditions, '')), 'B') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(address, '')), 'C') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(salary, '')), 'C') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(additional_info, '')), 'C')"
+    ),
+    "one_time_task": (
+        "setweight(to_tsvector('simple'::regconfig, coalesce(who_needed, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(task_description, '')), 'B') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(address, '')), 'C') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(deadline, '')), 'C') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(salary, '')), 'C') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(additional_info, '')), 'C')"
+    ),
+    "opportunities_grants": (
+        "setweight(to_tsvector('simple'::regconfig, coalesce(content, '')), 'A')"
+    ),
+}
+
+
+def upgrade() -> None:
+    for table, document in SEARCH_DOCUMENTS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({document}) STORED"
+        )
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_DOCUMENTS:
+            op.create_index(
+                f"ix_{table}_search", table, ["search_vector"],
+                postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in SEARCH_DOCUMENTS:
+            op.drop_index(
+                f"ix_{table}_search", table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
+    for table in SEARCH_DOCUMENTS:
+        op.drop_column(table, "search_vector")
@@ -0,0 +1,119 @@
+"""post_index: общая узкая таблица по всем типам вакансий, ведётся триггерами
+
+Revision ID: 0004_post_index
+Revises: 0003_vacancy_search
+Create Date: 2026-10-18 15:00:00
+
+Триггеры создаются до переноса существующих строк в той же транзакции:
+CREATE TRIGGER держит SHARE ROW EXCLUSIVE до коммита, поэтому записи,
+пришедшие во время миграции, не потеряются. Индексы строятся после
+заполнения — так быстрее, таблица новая и ещё никем не читается.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_post_index'
+down_revision: Union[str, None] = '0003_vacancy_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+status_type = postgresql.ENUM('NEW', 'IN_REVIEW', 'APPROVED', 'REJECTED', name='status_type', create_type=False)
+
+SNIPPET_LENGTH = 120
+
+# колонка, из которой берётся title_snippet
+TITLE_COLUMNS = {
+    "job_vacancies": "position_title",
+    "internship": "position_title",
+    "one_time_task": "who_needed",
+    "opportunities_grants": "content",
+}
+
+INDEXED_COLUMNS = ("author_id", "country_id", "region_id", "status", "created_at")
+
+INDEXES = {
+    "ix_post_index_status_created": ["status", "created_at", "type", "id"],
+    "ix_post_index_country_status_created": ["country_id", "status", "created_at", "type", "id"],
+    "ix_post_index_region_status_created": ["region_id", "status", "created_at", "type", "id"],
+    "ix_post_index_author_created": ["author_id", "created_at", "type", "id"],
+}
+
+# По функции на таблицу: колонка заголовка у каждой своя, а обращаться
+# к NEW через to_jsonb ради одного поля дороже, чем держать четыре функции.
+POST_INDEX_FUNCTION = """
+CREATE OR REPLACE FUNCTION post_index_{table}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM post_index WHERE type = TG_TABLE_NAME AND id = OLD.id;
+        RETURN NULL;
+    END IF;
+    IF NEW.is_delete THEN
+        DELETE FROM post_index WHERE type = TG_TABLE_NAME AND id = NEW.id;
+        RETURN NULL;
+    END IF;
+    INSERT INTO post_index (type, id, author_id, country_id, region_id, status, created_at, title_snippet)
+    VALUES (
+        TG_TABLE_NAME, NEW.id, NEW.author_id, NEW.country_id, NEW.region_id,
+        NEW.status, NEW.created_at, left(NEW.{title}, {snippet})
+    )
+    ON CONFLICT (type, id) DO UPDATE SET
+        author_id = EXCLUDED.author_id,
+        country_id = EXCLUDED.country_id,
+        region_id = EXCLUDED.region_id,
+        status = EXCLUDED.status,
+        created_at = EXCLUDED.created_at,
+        title_snippet = EXCLUDED.title_snippet;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_table('post_index',
+    sa.Column('type', sa.String(length=32), nullable=False),
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('author_id', sa.BigInteger(), nullable=False),
+    sa.Column('country_id', sa.BigInteger(), nullable=False),
+    sa.Column('region_id', sa.BigInteger(), nullable=True),
+    sa.Column('status', status_type, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('title_snippet', sa.String(length=SNIPPET_LENGTH), nullable=True),
+    sa.PrimaryKeyConstraint('type', 'id')
+    )
+
+    for table, title in TITLE_COLUMNS.items():
+        op.execute(POST_INDEX_FUNCTION.format(table=table, title=title, snippet=SNIPPET_LENGTH))
+        op.execute(
+            f"""CREATE TRIGGER {table}_post_index_ins_del AFTER INSERT OR DELETE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION post_index_{table}()"""
+        )
+        watched = (*INDEXED_COLUMNS, "is_delete", title)
+        old = ", ".join(f"OLD.{column}" for column in watched)
+        new = ", ".join(f"NEW.{column}" for column in watched)
+        op.execute(
+            f"""CREATE TRIGGER {table}_post_index_upd AFTER UPDATE OF {", ".join(watched)} ON {table}
+                FOR EACH ROW WHEN (({old}) IS DISTINCT FROM ({new}))
+                EXECUTE FUNCTION post_index_{table}()"""
+        )
+        op.execute(
+            f"""INSERT INTO post_index (type, id, {", ".join(INDEXED_COLUMNS)}, title_snippet)
+                SELECT '{table}', id, {", ".join(INDEXED_COLUMNS)}, left({title}, {SNIPPET_LENGTH})
+                FROM {table} WHERE NOT is_delete
+                ON CONFLICT (type, id) DO NOTHING"""
+        )
+
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'post_index', columns, unique=False)
+
+
+def downgrade() -> None:
+    for table in TITLE_COLUMNS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_post_index_ins_del ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_post_index_upd ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS post_index_{table}()")
+    op.drop_table('post_index')
@@ -0,0 +1,49 @@
+"""индексы (author_id, id DESC) INCLUDE (status) вместо ix_*_author_id
+
+Revision ID: 0005_vacancy_author_indexes
+Revises: 0004_post_index
+Create Date: 2026-10-18 16:00:00
+
+Последний пост автора (LATERAL ... ORDER BY id DESC LIMIT 1) и счётчики
+по статусам в /stats/client/posts читаются из одного индекса. Старый
+индекс по author_id им полностью покрыт (в т.ч. для FK) — удаляем.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_vacancy_author_indexes'
+down_revision: Union[str, None] = '0004_post_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("job_vacancies", "internship", "one_time_task", "opportunities_grants")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f"ix_{table}_author_id_desc", table, ["author_id", sa.text("id DESC")],
+                postgresql_include=["status"],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+            op.drop_index(
+                f"ix_{table}_author_id", table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f"ix_{table}_author_id", table, ["author_id"],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+            op.drop_index(
+                f"ix_{table}_author_id_desc", table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
@@ -0,0 +1,40 @@
+"""частичные индексы (author_id, id DESC) WHERE NOT is_delete для /mine
+
+Revision ID: 0006_vacancy_author_live
+Revises: 0005_vacancy_author_indexes
+Create Date: 2026-10-18 17:00:00
+
+Страница /mine (keyset по id) — один диапазон по индексу без удалённых
+постов; индекс меньше общего ix_*_author_id_desc на долю удалённых.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_vacancy_author_live'
+down_revision: Union[str, None] = '0005_vacancy_author_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("job_vacancies", "internship", "one_time_task", "opportunities_grants")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f"ix_{table}_author_live", table, ["author_id", sa.text("id DESC")],
+                postgresql_where=sa.text("is_delete = false"),
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(
+                f"ix_{table}_author_live", table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
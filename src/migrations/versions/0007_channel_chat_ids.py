@@ -0,0 +1,30 @@
+"""channels.chat_id / chat_username: id и username канала, полученные от Telegram
+
+Revision ID: 0007_channel_chat_ids
+Revises: 0006_vacancy_author_live
+Create Date: 2026-10-18 18:00:00
+
+Эта и следующие ревизии до 0013 переносят в миграции то, что раньше
+добавлялось через create_all и SCHEMA_PATCHES. Всё через IF NOT EXISTS:
+база, помеченная 0001_baseline, может уже иметь часть этих объектов.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_channel_chat_ids'
+down_revision: Union[str, None] = '0006_vacancy_author_live'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE channels ADD COLUMN IF NOT EXISTS chat_id BIGINT")
+    op.execute("ALTER TABLE channels ADD COLUMN IF NOT EXISTS chat_username VARCHAR(256)")
+
+
+def downgrade() -> None:
+    op.drop_column('channels', 'chat_username')
+    op.drop_column('channels', 'chat_id')
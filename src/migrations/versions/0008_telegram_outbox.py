@@ -0,0 +1,46 @@
+"""telegram_outbox: очередь исходящих сообщений бота
+
+Revision ID: 0008_telegram_outbox
+Revises: 0007_channel_chat_ids
+Create Date: 2026-10-18 18:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_telegram_outbox'
+down_revision: Union[str, None] = '0007_channel_chat_ids'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+outbox_status = postgresql.ENUM('PENDING', 'SENDING', 'SENT', 'FAILED', name='outbox_status')
+
+
+def upgrade() -> None:
+    outbox_status.create(op.get_bind(), checkfirst=True)
+    op.create_table('telegram_outbox',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('kind', sa.String(length=32), nullable=False),
+    sa.Column('chat_id', sa.BigInteger(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('vacancy_type', sa.String(length=16), nullable=True),
+    sa.Column('vacancy_id', sa.BigInteger(), nullable=True),
+    sa.Column('status', postgresql.ENUM('PENDING', 'SENDING', 'SENT', 'FAILED', name='outbox_status', create_type=False), server_default=sa.text("'PENDING'"), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('result_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    if_not_exists=True
+    )
+    op.create_index('ix_telegram_outbox_due', 'telegram_outbox', ['status', 'next_attempt_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_table('telegram_outbox')
+    outbox_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,89 @@
+"""vacancy_counters: счётчики для /stats/vacancies, ведутся триггерами
+
+Revision ID: 0009_vacancy_counters
+Revises: 0008_telegram_outbox
+Create Date: 2026-10-18 18:00:00
+
+Триггеры создаются до пересчёта в той же транзакции: CREATE TRIGGER держит
+SHARE ROW EXCLUSIVE до коммита, записи в вакансии ждут, и пересчёт видит
+ровно те строки, от которых дальше считают триггеры. Пересчёт перезаписывает
+и счётчики, которые уже вёл старый SCHEMA_PATCHES.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_vacancy_counters'
+down_revision: Union[str, None] = '0008_telegram_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTED_TABLES = ("job_vacancies", "internship", "one_time_task", "opportunities_grants")
+
+VACANCY_COUNTERS_FUNCTION = """
+CREATE OR REPLACE FUNCTION vacancy_counters_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE vacancy_counters SET
+            total = total - 1,
+            approved = approved - (OLD.status = 'APPROVED')::int,
+            rejected = rejected - (OLD.status = 'REJECTED')::int
+        WHERE code = TG_TABLE_NAME;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE vacancy_counters SET
+            total = total + 1,
+            approved = approved + (NEW.status = 'APPROVED')::int,
+            rejected = rejected + (NEW.status = 'REJECTED')::int
+        WHERE code = TG_TABLE_NAME;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_table('vacancy_counters',
+    sa.Column('code', sa.String(length=64), nullable=False),
+    sa.Column('total', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('approved', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('rejected', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('code'),
+    if_not_exists=True
+    )
+
+    op.execute(VACANCY_COUNTERS_FUNCTION)
+    for table in COUNTED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_counters_ins_del ON {table}")
+        op.execute(
+            f"""CREATE TRIGGER {table}_counters_ins_del AFTER INSERT OR DELETE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION vacancy_counters_apply()"""
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_counters_upd ON {table}")
+        op.execute(
+            f"""CREATE TRIGGER {table}_counters_upd AFTER UPDATE OF status ON {table}
+                FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status)
+                EXECUTE FUNCTION vacancy_counters_apply()"""
+        )
+        op.execute(
+            f"""INSERT INTO vacancy_counters (code, total, approved, rejected)
+                SELECT '{table}', count(*),
+                       count(*) FILTER (WHERE status = 'APPROVED'),
+                       count(*) FILTER (WHERE status = 'REJECTED')
+                FROM {table}
+                ON CONFLICT (code) DO UPDATE SET
+                    total = EXCLUDED.total,
+                    approved = EXCLUDED.approved,
+                    rejected = EXCLUDED.rejected"""
+        )
+
+
+def downgrade() -> None:
+    for table in COUNTED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_counters_ins_del ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_counters_upd ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS vacancy_counters_apply()")
+    op.drop_table('vacancy_counters')
@@ -0,0 +1,45 @@
+"""media_objects / media_gc_runs: индекс загруженных файлов со счётчиком ссылок
+
+Revision ID: 0011_media_objects
+Revises: 0010_refresh_tokens
+Create Date: 2026-10-18 18:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0011_media_objects'
+down_revision: Union[str, None] = '0010_refresh_tokens'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('media_objects',
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.Column('path', sa.String(length=256), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('refcount', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('released_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('digest'),
+    sa.UniqueConstraint('path'),
+    if_not_exists=True
+    )
+    op.create_index('ix_media_objects_orphans', 'media_objects', ['released_at'], unique=False, postgresql_where=sa.text('refcount = 0'), if_not_exists=True)
+    op.create_table('media_gc_runs',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('files_removed', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('bytes_reclaimed', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('media_gc_runs')
+    op.drop_table('media_objects')
@@ -0,0 +1,24 @@
+"""opportunities_grants.tg_file_id: file_id фото после первой отправки в Telegram
+
+Revision ID: 0012_grants_tg_file_id
+Revises: 0011_media_objects
+Create Date: 2026-10-18 18:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0012_grants_tg_file_id'
+down_revision: Union[str, None] = '0011_media_objects'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE opportunities_grants ADD COLUMN IF NOT EXISTS tg_file_id VARCHAR(256)")
+
+
+def downgrade() -> None:
+    op.drop_column('opportunities_grants', 'tg_file_id')
@@ -0,0 +1,30 @@
+"""seed_checksums: контрольные суммы загруженных справочников
+
+Revision ID: 0013_seed_checksums
+Revises: 0012_grants_tg_file_id
+Create Date: 2026-10-18 18:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0013_seed_checksums'
+down_revision: Union[str, None] = '0012_grants_tg_file_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('seed_checksums',
+    sa.Column('name', sa.String(length=128), nullable=False),
+    sa.Column('checksum', sa.String(length=64), nullable=False),
+    sa.Column('loaded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name'),
+    if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seed_checksums')
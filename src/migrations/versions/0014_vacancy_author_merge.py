@@ -0,0 +1,55 @@
+"""один частичный индекс (author_id, id DESC) INCLUDE (status) WHERE NOT is_delete
+
+Revision ID: 0014_vacancy_author_merge
+Revises: 0013_seed_checksums
+Create Date: 2026-10-18 19:00:00
+
+Заменяет ix_*_author_id_desc (0005) и ix_*_author_live (0006) с теми же
+ключами. Все запросы по автору (/mine, /stats/client/posts) берут только
+живые посты, поэтому полный индекс больше не нужен. Пользователей не
+удаляют физически, так что проверке FK при удалении users он тоже не нужен.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0014_vacancy_author_merge'
+down_revision: Union[str, None] = '0013_seed_checksums'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("job_vacancies", "internship", "one_time_task", "opportunities_grants")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f"ix_{table}_author_live_status", table, ["author_id", sa.text("id DESC")],
+                postgresql_include=["status"],
+                postgresql_where=sa.text("is_delete = false"),
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+            for name in (f"ix_{table}_author_id_desc", f"ix_{table}_author_live"):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f"ix_{table}_author_id_desc", table, ["author_id", sa.text("id DESC")],
+                postgresql_include=["status"],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+            op.create_index(
+                f"ix_{table}_author_live", table, ["author_id", sa.text("id DESC")],
+                postgresql_where=sa.text("is_delete = false"),
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+            op.drop_index(
+                f"ix_{table}_author_live_status", table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
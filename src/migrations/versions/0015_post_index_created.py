@@ -0,0 +1,37 @@
+"""индекс (created_at, type, id) для общей ленты post_index без фильтров
+
+Revision ID: 0015_post_index_created
+Revises: 0014_vacancy_author_merge
+Create Date: 2026-10-18 20:00:00
+
+Все индексы из 0004 начинаются со status / country_id / region_id /
+author_id, поэтому /stats/posts без фильтров (и с фильтром только по
+type или стране) сортировал всю таблицу. Этот индекс отдаёт ленту в
+нужном порядке.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0015_post_index_created'
+down_revision: Union[str, None] = '0014_vacancy_author_merge'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_post_index_created", "post_index", ["created_at", "type", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_post_index_created", table_name="post_index",
+            postgresql_concurrently=True, if_exists=True,
+        )
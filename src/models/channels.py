@@ -12,9 +12,11 @@ class Channels(Base):
     country_id: Mapped[int] = mapped_column(ForeignKey("country.id"), nullable=False)
     region_id: Mapped[int | None] = mapped_column(ForeignKey("region.id"), nullable=True)
     channel_url: Mapped[str] = mapped_column(String, nullable=False)
+    chat_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    chat_username: Mapped[str | None] = mapped_column(String(256), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(default=func.now())
     updated_at: Mapped[datetime] = mapped_column(default=func.now(), onupdate=func.now())
 
-    country: Mapped["Country"] = relationship(lazy="selectin")
-    region: Mapped["Region"] = relationship(lazy="selectin")
\ No newline at end of file
+    country: Mapped["Country"] = relationship(lazy="raise")
+    region: Mapped["Region"] = relationship(lazy="raise")
\ No newline at end of file
@@ -15,5 +15,5 @@ class Industry(Base):
 
     client: Mapped[list["Clients"]] = relationship(
         back_populates="industry",
-        lazy="selectin",
+        lazy="raise",
     )
\ No newline at end of file
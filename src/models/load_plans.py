@@ -0,0 +1,45 @@
+from sqlalchemy.orm import joinedload, load_only
+
+from src.models.locations import Country, Region
+from src.models.industry import Industry
+from src.models.users import Users, Clients
+from src.models.channels import Channels
+
+# Все relationship по умолчанию lazy="raise": каждый эндпоинт явно говорит,
+# что ему нужно подгрузить, иначе обращение к связи падает, а не идёт в базу.
+
+def location_plan(model) -> tuple:
+    # Только id и name страны/региона, одним JOIN вместе с основной строкой
+    return (
+        joinedload(model.country).options(load_only(Country.id, Country.name)),
+        joinedload(model.region).options(load_only(Region.id, Region.name)),
+    )
+
+def vacancy_list_plan(model) -> tuple:
+    # /mine
+    return location_plan(model)
+
+def vacancy_detail_plan(model) -> tuple:
+    # /stats/client/post
+    return location_plan(model)
+
+def vacancy_moderation_plan(model) -> tuple:
+    # карточка модерации: локация + автор для уведомления
+    return (
+        *location_plan(model),
+        joinedload(model.user).options(load_only(Users.id, Users.telegram_id, Users.language_code)),
+    )
+
+def user_profile_plan() -> tuple:
+    # /users/me (GET и PUT), /stats/user/profile
+    return (
+        joinedload(Users.client).options(
+            joinedload(Clients.country).options(load_only(Country.id, Country.name)),
+            joinedload(Clients.region).options(load_only(Region.id, Region.name)),
+            joinedload(Clients.industry).options(load_only(Industry.id, Industry.name)),
+        ),
+    )
+
+def channel_card_plan() -> tuple:
+    # /bot/channels
+    return location_plan(Channels)
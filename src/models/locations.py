@@ -16,12 +16,12 @@ class Country(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("false"))
     time_zoneutc: Mapped[str | None] = mapped_column(String(255))
 
-    regions: Mapped[list["Region"]] = relationship(back_populates="country", lazy="selectin")
+    regions: Mapped[list["Region"]] = relationship(back_populates="country", lazy="raise")
 
-    job_vacancies: Mapped[list["JobVacancy"]] = relationship(back_populates="country", lazy="selectin")
-    internships: Mapped[list["Internship"]] = relationship(back_populates="country", lazy="selectin")
-    one_time_tasks: Mapped[list["OneTimeTask"]] = relationship(back_populates="country", lazy="selectin")
-    opportunities_grants: Mapped[list["OpportunitiesGrants"]] = relationship(back_populates="country", lazy="selectin")
+    job_vacancies: Mapped[list["JobVacancy"]] = relationship(back_populates="country", lazy="raise")
+    internships: Mapped[list["Internship"]] = relationship(back_populates="country", lazy="raise")
+    one_time_tasks: Mapped[list["OneTimeTask"]] = relationship(back_populates="country", lazy="raise")
+    opportunities_grants: Mapped[list["OpportunitiesGrants"]] = relationship(back_populates="country", lazy="raise")
 
 class Region(Base):
     __tablename__ = "region"
@@ -31,9 +31,9 @@ class Region(Base):
     country_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("country.id"), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("false"))
 
-    country: Mapped["Country"] = relationship(back_populates="regions", lazy="selectin")
+    country: Mapped["Country"] = relationship(back_populates="regions", lazy="raise")
 
-    job_vacancies: Mapped[list["JobVacancy"]] = relationship(back_populates="region", lazy="selectin")
-    internships: Mapped[list["Internship"]] = relationship(back_populates="region", lazy="selectin")
-    one_time_tasks: Mapped[list["OneTimeTask"]] = relationship(back_populates="region", lazy="selectin")
-    opportunities_grants: Mapped[list["OpportunitiesGrants"]] = relationship(back_populates="region", lazy="selectin")
\ No newline at end of file
+    job_vacancies: Mapped[list["JobVacancy"]] = relationship(back_populates="region", lazy="raise")
+    internships: Mapped[list["Internship"]] = relationship(back_populates="region", lazy="raise")
+    one_time_tasks: Mapped[list["OneTimeTask"]] = relationship(back_populates="region", lazy="raise")
+    opportunities_grants: Mapped[list["OpportunitiesGrants"]] = relationship(back_populates="region", lazy="raise")
\ No newline at end of file
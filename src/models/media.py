@@ -0,0 +1,32 @@
+from sqlalchemy import Index, String, BigInteger, Integer, DateTime, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from src.database import Base
+
+class MediaObject(Base):
+    __tablename__ = "media_objects"
+
+    # sha256 загруженных байт; файлы лежат в media/img/ab/cd/<digest>*
+    digest: Mapped[str] = mapped_column(String(64), primary_key=True)
+    path: Mapped[str] = mapped_column(String(256), nullable=False, unique=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)   # оригинал + копии
+
+    refcount: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    # когда счётчик стал нулевым; GC удаляет только после выдержки
+    released_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_media_objects_orphans", "released_at", postgresql_where=text("refcount = 0")),
+    )
+
+class MediaGcRun(Base):
+    __tablename__ = "media_gc_runs"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    files_removed: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    bytes_reclaimed: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
@@ -0,0 +1,40 @@
+from sqlalchemy import Index, String, BigInteger, Integer, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Enum as SQLEnum
+from datetime import datetime
+import enum
+
+from src.database import Base
+
+class OutboxStatus(enum.Enum):
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+class TelegramOutbox(Base):
+    __tablename__ = "telegram_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    kind: Mapped[str] = mapped_column(String(32), nullable=False) # message | moderation | channel
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # куда записать group_chat_id/group_message_id после отправки
+    vacancy_type: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    vacancy_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    status: Mapped[OutboxStatus] = mapped_column(SQLEnum(OutboxStatus, name="outbox_status"), server_default=text("'PENDING'"))
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    next_attempt_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    last_error: Mapped[str | None] = mapped_column(String, nullable=True)
+    result_message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_telegram_outbox_due", "status", "next_attempt_at"),
+    )
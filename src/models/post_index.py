@@ -0,0 +1,45 @@
+from sqlalchemy import Index, String, BigInteger
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from src.database import Base
+from src.models.vacancy import StatusEnum
+
+# длина title_snippet; left() в триггерах post_index_<table> (миграция 0004)
+POST_INDEX_SNIPPET = 120
+
+class PostIndex(Base):
+    # Узкая общая таблица по всем четырём типам вакансий, ведётся триггерами
+    # (функция и триггеры — в миграции 0004_post_index). Удалённых
+    # (is_delete) постов здесь нет. Сюда не пишем — только читаем.
+    __tablename__ = "post_index"
+
+    type: Mapped[str] = mapped_column(String(32), primary_key=True) # имя таблицы вакансий
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    author_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    country_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    region_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    status: Mapped[StatusEnum] = mapped_column(SQLEnum(StatusEnum, name="status_type"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
+    title_snippet: Mapped[str] = mapped_column(String(POST_INDEX_SNIPPET), nullable=True)
+
+    # (type, id) в конце каждого индекса — ключ keyset-пагинации целиком
+    # в индексе, страница читается одним диапазоном без досортировки.
+    # Одним диапазоном: status [+ country_id | region_id], author_id и лента
+    # без фильтров. Для остальных сочетаний (только type, только country_id /
+    # region_id без status) планировщик выбирает: идти по ix_post_index_created
+    # в порядке ленты, отбрасывая чужие строки, или взять строки по фильтру
+    # и досортировать — для редкого значения это дешевле.
+    __table_args__ = (
+        # общая лента без фильтров
+        Index("ix_post_index_created", "created_at", "type", "id"),
+        # лента и очередь модерации: статус + свежие сверху
+        Index("ix_post_index_status_created", "status", "created_at", "type", "id"),
+        # лента по стране / региону
+        Index("ix_post_index_country_status_created", "country_id", "status", "created_at", "type", "id"),
+        Index("ix_post_index_region_status_created", "region_id", "status", "created_at", "type", "id"),
+        # история автора
+        Index("ix_post_index_author_created", "author_id", "created_at", "type", "id"),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+
+from src.database import Base
+
+class SeedChecksum(Base):
+    __tablename__ = "seed_checksums"
+
+    # имя seed-файла (country.sql, region.sql) и sha256 его содержимого на момент загрузки
+    name: Mapped[str] = mapped_column(String(128), primary_key=True)
+    checksum: Mapped[str] = mapped_column(String(64), nullable=False)
+    loaded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,14 @@
+from sqlalchemy import String, BigInteger, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+class VacancyCounters(Base):
+    # Счётчики для /stats/vacancies, ведутся триггерами на таблицах вакансий
+    # (функция и триггеры — в миграции 0009_vacancy_counters)
+    __tablename__ = "vacancy_counters"
+
+    code: Mapped[str] = mapped_column(String(64), primary_key=True) # имя таблицы вакансий
+    total: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    approved: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    rejected: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
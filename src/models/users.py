@@ -24,7 +24,7 @@ class Users(Base):
 
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
-    client: Mapped["Clients"] = relationship(back_populates="user", uselist=False, lazy="joined")
+    client: Mapped["Clients"] = relationship(back_populates="user", uselist=False, lazy="raise")
     
 
 class Clients(Base):
@@ -39,10 +39,10 @@ class Clients(Base):
     country_id: Mapped[int | None] = mapped_column(BigInteger, ForeignKey("country.id"))
     region_id: Mapped[int | None] = mapped_column(BigInteger, ForeignKey("region.id"))
 
-    user: Mapped["Users"] = relationship(back_populates="client", lazy="joined")
-    country: Mapped["Country"] = relationship(lazy="selectin")
-    region: Mapped["Region"] = relationship(lazy="selectin")
+    user: Mapped["Users"] = relationship(back_populates="client", lazy="raise")
+    country: Mapped["Country"] = relationship(lazy="raise")
+    region: Mapped["Region"] = relationship(lazy="raise")
     industry: Mapped["Industry"] = relationship(
         back_populates="client",
-        lazy="selectin",
+        lazy="raise",
     )
\ No newline at end of file
@@ -1,4 +1,5 @@
-from sqlalchemy import Index, String, ForeignKey, BigInteger, func, Boolean, text
+from sqlalchemy import Index, String, ForeignKey, BigInteger, func, Boolean, text, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import Enum as SQLEnum
 from datetime import datetime
@@ -11,6 +12,36 @@ from src.models.users import Users
 if TYPE_CHECKING:
     from src.models.locations import Country, Region
 
+def search_document(weights: dict[str, tuple[str, ...]]) -> str:
+    # Выражение для generated-колонки search_vector. Конфигурация 'simple':
+    # тексты на каракалпакском/русском/узбекском, стемминга для них нет.
+    return " || ".join(
+        f"setweight(to_tsvector('simple'::regconfig, coalesce({column}, '')), '{weight}')"
+        for weight, columns in weights.items()
+        for column in columns
+    )
+
+SEARCH_DOCUMENTS = {
+    "job_vacancies": search_document({
+        "A": ("position_title", "organization_name"),
+        "B": ("requirements", "duties"),
+        "C": ("address", "work_schedule", "salary", "additional_info"),
+    }),
+    "internship": search_document({
+        "A": ("position_title", "organization_name"),
+        "B": ("requirements", "duties", "conditions"),
+        "C": ("address", "salary", "additional_info"),
+    }),
+    "one_time_task": search_document({
+        "A": ("who_needed",),
+        "B": ("task_description",),
+        "C": ("address", "deadline", "salary", "additional_info"),
+    }),
+    "opportunities_grants": search_document({
+        "A": ("content",),
+    }),
+}
+
 class StatusEnum(enum.Enum):
     NEW = "NEW"
     IN_REVIEW = "IN_REVIEW"
@@ -22,7 +53,7 @@ class JobVacancy(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
 
-    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     country_id: Mapped[int] = mapped_column(ForeignKey("country.id"), nullable=False, index=True)
     region_id: Mapped[int] = mapped_column(ForeignKey("region.id"), nullable=True, index=True)
 
@@ -46,12 +77,26 @@ class JobVacancy(Base):
     channel_message_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
     moderator_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), index=True)
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
-    country: Mapped["Country"] = relationship(lazy="selectin", back_populates="job_vacancies")
-    region: Mapped["Region"] = relationship(lazy="selectin", back_populates="job_vacancies")
-    user: Mapped["Users"] = relationship(lazy="selectin", foreign_keys=[author_id])
+    # deferred: tsvector не нужен при обычной загрузке строк
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_DOCUMENTS["job_vacancies"], persisted=True), nullable=True, deferred=True
+    )
+
+    country: Mapped["Country"] = relationship(lazy="raise", back_populates="job_vacancies")
+    region: Mapped["Region"] = relationship(lazy="raise", back_populates="job_vacancies")
+    user: Mapped["Users"] = relationship(lazy="raise", foreign_keys=[author_id])
+
+    __table_args__ = (
+        Index("ix_job_vacancies_search", "search_vector", postgresql_using="gin"),
+        # живые посты автора, свежие сверху: /mine, последний пост и счётчики по статусам
+        Index(
+            "ix_job_vacancies_author_live_status", "author_id", text("id DESC"),
+            postgresql_include=["status"], postgresql_where=text("is_delete = false"),
+        ),
+    )
 
 
 class Internship(Base):
@@ -59,7 +104,7 @@ class Internship(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
 
-    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     country_id: Mapped[int] = mapped_column(ForeignKey("country.id"), nullable=False, index=True)
     region_id: Mapped[int] = mapped_column(ForeignKey("region.id"), nullable=True, index=True)
 
@@ -83,12 +128,26 @@ class Internship(Base):
     channel_message_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
     moderator_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), index=True)
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
-    country: Mapped["Country"] = relationship(lazy="selectin", back_populates="internships")
-    region: Mapped["Region"] = relationship(lazy="selectin", back_populates="internships")
-    user: Mapped["Users"] = relationship(lazy="selectin", foreign_keys=[author_id])
+    # deferred: tsvector не нужен при обычной загрузке строк
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_DOCUMENTS["internship"], persisted=True), nullable=True, deferred=True
+    )
+
+    country: Mapped["Country"] = relationship(lazy="raise", back_populates="internships")
+    region: Mapped["Region"] = relationship(lazy="raise", back_populates="internships")
+    user: Mapped["Users"] = relationship(lazy="raise", foreign_keys=[author_id])
+
+    __table_args__ = (
+        Index("ix_internship_search", "search_vector", postgresql_using="gin"),
+        # живые посты автора, свежие сверху: /mine, последний пост и счётчики по статусам
+        Index(
+            "ix_internship_author_live_status", "author_id", text("id DESC"),
+            postgresql_include=["status"], postgresql_where=text("is_delete = false"),
+        ),
+    )
 
 
 class OneTimeTask(Base):
@@ -96,7 +155,7 @@ class OneTimeTask(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     
-    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     country_id: Mapped[int] = mapped_column(ForeignKey("country.id"), nullable=False, index=True)
     region_id: Mapped[int] = mapped_column(ForeignKey("region.id"), nullable=True, index=True)
 
@@ -118,12 +177,26 @@ class OneTimeTask(Base):
     channel_message_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
     moderator_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), index=True)
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
-    country: Mapped["Country"] = relationship(lazy="selectin", back_populates="one_time_tasks")
-    region: Mapped["Region"] = relationship(lazy="selectin", back_populates="one_time_tasks")
-    user: Mapped["Users"] = relationship(lazy="selectin", foreign_keys=[author_id])
+    # deferred: tsvector не нужен при обычной загрузке строк
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_DOCUMENTS["one_time_task"], persisted=True), nullable=True, deferred=True
+    )
+
+    country: Mapped["Country"] = relationship(lazy="raise", back_populates="one_time_tasks")
+    region: Mapped["Region"] = relationship(lazy="raise", back_populates="one_time_tasks")
+    user: Mapped["Users"] = relationship(lazy="raise", foreign_keys=[author_id])
+
+    __table_args__ = (
+        Index("ix_one_time_task_search", "search_vector", postgresql_using="gin"),
+        # живые посты автора, свежие сверху: /mine, последний пост и счётчики по статусам
+        Index(
+            "ix_one_time_task_author_live_status", "author_id", text("id DESC"),
+            postgresql_include=["status"], postgresql_where=text("is_delete = false"),
+        ),
+    )
 
 
 class OpportunitiesGrants(Base):
@@ -131,11 +204,13 @@ class OpportunitiesGrants(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     
-    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     country_id: Mapped[int] = mapped_column(ForeignKey("country.id"), nullable=False, index=True)
     region_id: Mapped[int] = mapped_column(ForeignKey("region.id"), nullable=True, index=True)
 
     img_path: Mapped[str | None] = mapped_column(String(256), nullable=True)
+    # file_id фото после первой отправки в группу модерации — дальше шлём его, а не файл
+    tg_file_id: Mapped[str | None] = mapped_column(String(256), nullable=True)
     content: Mapped[str] = mapped_column(String, nullable=False)
     contact: Mapped[str] = mapped_column(String(256), nullable=False)
 
@@ -149,9 +224,40 @@ class OpportunitiesGrants(Base):
     channel_message_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
     moderator_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), index=True)
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
-    country: Mapped["Country"] = relationship(lazy="selectin", back_populates="opportunities_grants")
-    region: Mapped["Region"] = relationship(lazy="selectin", back_populates="opportunities_grants")
-    user: Mapped["Users"] = relationship(lazy="selectin", foreign_keys=[author_id])
\ No newline at end of file
+    # deferred: tsvector не нужен при обычной загрузке строк
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_DOCUMENTS["opportunities_grants"], persisted=True), nullable=True, deferred=True
+    )
+
+    country: Mapped["Country"] = relationship(lazy="raise", back_populates="opportunities_grants")
+    region: Mapped["Region"] = relationship(lazy="raise", back_populates="opportunities_grants")
+    user: Mapped["Users"] = relationship(lazy="raise", foreign_keys=[author_id])
+
+    __table_args__ = (
+        Index("ix_opportunities_grants_search", "search_vector", postgresql_using="gin"),
+        # живые посты автора, свежие сверху: /mine, последний пост и счётчики по статусам
+        Index(
+            "ix_opportunities_grants_author_live_status", "author_id", text("id DESC"),
+            postgresql_include=["status"], postgresql_where=text("is_delete = false"),
+        ),
+    )
+
+
+# колонка-заголовок каждого типа, для коротких подписей в списках
+TITLE_COLUMNS = {
+    "job_vacancies": JobVacancy.position_title,
+    "internship": Internship.position_title,
+    "one_time_task": OneTimeTask.who_needed,
+    "opportunities_grants": OpportunitiesGrants.content,
+}
+
+# короткие коды типов — те же, что в callback_data модерации
+MODEL_BY_TYPE = {
+    "job": JobVacancy,
+    "intern": Internship,
+    "otits": OneTimeTask,
+    "opgts": OpportunitiesGrants,
+}
\ No newline at end of file
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from datetime import date
 
 class VacancyCard(BaseModel):
     code: str = Field(..., example="job_vacancies")
@@ -13,6 +14,10 @@ class MonthStat(BaseModel):
     month: int = Field(..., example=1)
     value: int = Field(..., example=42)
 
+class PeriodStat(BaseModel):
+    period: date = Field(..., example="2025-01-06")
+    value: int = Field(..., example=42)
+
 class StatVacancyOut(BaseModel):
     data: list[VacancyCard]= Field(
         ...,
@@ -23,7 +28,7 @@ class StatVacancyOut(BaseModel):
     error: str | None = Field(None, example=None)
 
 class StatVacancyMonthOut(BaseModel):
-    data: list[MonthStat] = Field(
+    data: list[MonthStat | PeriodStat] = Field(
         ...,
         description="List of statistic data (depends on endpoint)"
     )
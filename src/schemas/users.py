@@ -5,6 +5,9 @@ from src.schemas.industry import IndustryOut
 class TelegramWebAppAuthIn(BaseModel):
     init_data: str = Field(..., description="Telegram WebApp initData string")
 
+class RefreshTokenIn(BaseModel):
+    refresh_token: str
+
 class TokenPairOut(BaseModel):
     access_token: str
     refresh_token: str
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+# Бенчмарки медленные и печатают цифры — запускаются только с RUN_BENCH=1:
+# RUN_BENCH=1 python -m pytest tests/bench -s
+# Размеры задаются переменными BENCH_*, по умолчанию — масштаб из задач.
+RUN_BENCH = os.getenv("RUN_BENCH")
+
+def bench_size(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+@pytest.fixture(autouse=True)
+def bench_only():
+    if not RUN_BENCH:
+        pytest.skip("benchmarks run only with RUN_BENCH=1")
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def report(title: str, **values) -> None:
+    line = ", ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in values.items())
+    print(f"\n[bench] {title}: {line}")
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from aiohttp import web
+
+# Поддельный Bot API: отвечает на любой метод с задержкой, как настоящий Telegram
+# по сети. Считает запросы и TCP-соединения (по порту клиента).
+
+class FakeTelegram:
+    def __init__(self, latency: float = 0.02) -> None:
+        self.latency = latency
+        self.calls: dict[str, int] = {}
+        self.peers: set[tuple] = set()
+        self.url = ""
+
+    def result(self, method: str) -> object:
+        if method == "getme":
+            return {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+        return {
+            "message_id": sum(self.calls.values()),
+            "date": int(time.time()),
+            "chat": {"id": 1, "type": "private"},
+            "text": "ok",
+        }
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"].lower()
+        self.calls[method] = self.calls.get(method, 0) + 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(self.latency)
+        return web.json_response({"ok": True, "result": self.result(method)})
+
+    @property
+    def connections(self) -> int:
+        return len(self.peers)
+
+@asynccontextmanager
+async def fake_telegram(latency: float = 0.02):
+    server = FakeTelegram(latency)
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", server.handle)
+    runner = web.AppRunner(app, handle_signals=False, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    server.url = f"http://127.0.0.1:{port}"
+    try:
+        yield server
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,83 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Массовое заполнение для бенчмарков: generate_series на стороне базы.
+# Триггеры выключены (session_replication_role = replica) — иначе каждая строка
+# обновляет vacancy_counters и post_index, и заполнение становится квадратичным;
+# счётчики после этого пересчитываются одним запросом (refresh_counters).
+
+WORDS = (
+    "(array['Python developer','Accountant','Driver','English teacher','Nurse',"
+    "'Sales manager','Designer','Cook','Electrician','Translator'])"
+)
+TITLE = f"{WORDS}[1 + i % 10] || ' ' || i"
+STATUS = "(array['NEW','APPROVED','REJECTED','APPROVED'])[1 + i % 4]::status_type"
+
+VACANCY_VALUES = {
+    "job_vacancies": {
+        "position_title": TITLE, "address": "'Nukus'", "requirements": "'Experience ' || i % 7 || ' years'",
+        "work_schedule": "'9-18'", "salary": "(i % 50 * 100)::text", "contact": "'+998'",
+    },
+    "internship": {
+        "position_title": TITLE, "requirements": "'Student'", "duties": "'Assist the team'",
+        "address": "'Nukus'", "salary": "'0'", "contact": "'+998'",
+    },
+    "one_time_task": {
+        "who_needed": TITLE, "task_description": "'One day task ' || i", "salary": "'50'", "contact": "'+998'",
+    },
+    "opportunities_grants": {
+        "content": f"'Grant for ' || {TITLE}", "contact": "'+998'",
+    },
+}
+
+async def seed_place(conn: AsyncConnection) -> tuple[int, int]:
+    country_id = (await conn.execute(text(
+        "INSERT INTO country (name, en, is_active) VALUES ('Qaraqalpaqstan', 'Karakalpakstan', true) RETURNING id"
+    ))).scalar_one()
+    region_id = (await conn.execute(text(
+        "INSERT INTO region (name, country_id, is_active) VALUES ('Nukus', :country_id, true) RETURNING id"
+    ), {"country_id": country_id})).scalar_one()
+    return country_id, region_id
+
+async def seed_users(conn: AsyncConnection, count: int, start: int = 0) -> None:
+    await conn.execute(text(
+        "INSERT INTO users (telegram_id, language_code, full_name, contact) "
+        "SELECT 5000000 + i, 'kaa', 'User ' || i, '+998' FROM generate_series(CAST(:first AS int), CAST(:last AS int)) AS i"
+    ), {"first": start + 1, "last": start + count})
+
+async def seed_vacancies(
+        conn: AsyncConnection,
+        table: str,
+        rows: int,
+        author_sql: str,
+        country_id: int,
+        region_id: int
+    ) -> None:
+    # author_sql — выражение от i, например "1 + i % 1000"
+    values = VACANCY_VALUES[table]
+    columns = ", ".join(values)
+    exprs = ", ".join(values.values())
+    await conn.execute(text("SET LOCAL session_replication_role = replica"))
+    await conn.execute(text(
+        f"INSERT INTO {table} (author_id, country_id, region_id, status, is_delete, created_at, {columns}) "
+        f"SELECT {author_sql}, :country_id, :region_id, {STATUS}, i % 20 = 0, "
+        f"now() - make_interval(secs => i), {exprs} "
+        f"FROM generate_series(1, :rows) AS i"
+    ), {"country_id": country_id, "region_id": region_id, "rows": rows})
+    await conn.execute(text("SET LOCAL session_replication_role = origin"))
+
+async def refresh_counters(conn: AsyncConnection) -> None:
+    for table in VACANCY_VALUES:
+        await conn.execute(text(
+            f"UPDATE vacancy_counters SET "
+            f"total = (SELECT count(*) FROM {table}), "
+            f"approved = (SELECT count(*) FROM {table} WHERE status = 'APPROVED'), "
+            f"rejected = (SELECT count(*) FROM {table} WHERE status = 'REJECTED') "
+            f"WHERE code = '{table}'"
+        ))
+
+async def vacuum_analyze(engine) -> None:
+    # VACUUM нельзя выполнять внутри транзакции
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE"))
@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+from src.core.bot import BOT_MAX_CONNECTIONS, BotMetrics, BotRequestLimiter
+from tests.bench.conftest import bench_size, percentile, report
+from tests.bench.fake_telegram import fake_telegram
+
+pytestmark = pytest.mark.anyio
+
+TOKEN = "42:bench"
+REQUESTS = bench_size("BENCH_BOT_REQUESTS", 2000)
+CONCURRENCY = bench_size("BENCH_BOT_CONCURRENCY", 100)
+
+async def _run(send, total: int, concurrency: int) -> list[float]:
+    gate = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+
+    async def one(i: int) -> None:
+        async with gate:
+            started = time.perf_counter()
+            await send(i)
+            samples.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return samples
+
+async def test_shared_bot_vs_bot_per_request():
+    async with fake_telegram() as server:
+        api = TelegramAPIServer.from_base(server.url)
+
+        # как было: новый Bot (и aiohttp-сессия) на каждый запрос
+        async def per_request(i: int) -> None:
+            bot = Bot(token=TOKEN, session=AiohttpSession(api=api))
+            try:
+                await bot.send_message(chat_id=1, text=f"message {i}")
+            finally:
+                await bot.session.close()
+
+        started = time.perf_counter()
+        old = await _run(per_request, REQUESTS, CONCURRENCY)
+        old_total = time.perf_counter() - started
+        old_connections = server.connections
+        server.peers.clear()
+
+        # как стало: один Bot на процесс с keep-alive и ограничителем
+        metrics = BotMetrics()
+        session = AiohttpSession(api=api, limit=BOT_MAX_CONNECTIONS)
+        session.middleware(BotRequestLimiter(BOT_MAX_CONNECTIONS, metrics))
+        shared = Bot(token=TOKEN, session=session)
+
+        async def shared_bot(i: int) -> None:
+            await shared.send_message(chat_id=1, text=f"message {i}")
+
+        try:
+            started = time.perf_counter()
+            new = await _run(shared_bot, REQUESTS, CONCURRENCY)
+            new_total = time.perf_counter() - started
+        finally:
+            await shared.session.close()
+
+    report("bot per request", requests=REQUESTS, seconds=old_total, rps=REQUESTS / old_total,
+           p50_ms=percentile(old, 50) * 1000, p99_ms=percentile(old, 99) * 1000, connections=old_connections)
+    report("shared bot", requests=REQUESTS, seconds=new_total, rps=REQUESTS / new_total,
+           p50_ms=percentile(new, 50) * 1000, p99_ms=percentile(new, 99) * 1000,
+           connections=server.connections, limiter=metrics.as_dict())
+
+    assert metrics.requests == REQUESTS and metrics.errors == 0
+    assert metrics.in_flight == 0
+    # keep-alive: соединений не больше лимита, а не по одному на запрос
+    assert server.connections <= BOT_MAX_CONNECTIONS < old_connections
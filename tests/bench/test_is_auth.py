@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core import bot as bot_module
+from src.core.bot import BotConfig, get_bot_config
+from src.database import get_async_session
+from src.main import app
+from tests.bench.conftest import bench_size, percentile, report
+from tests.bench.fake_telegram import fake_telegram
+from tests.conftest import API_HEADERS
+
+pytestmark = pytest.mark.anyio
+
+REQUESTS = bench_size("BENCH_IS_AUTH_REQUESTS", 2000)
+CONCURRENCY = bench_size("BENCH_IS_AUTH_CONCURRENCY", 50)
+TELEGRAM_LATENCY_MS = bench_size("BENCH_TELEGRAM_LATENCY_MS", 50)
+
+class GetMePerRequest(BotConfig):
+    # как было до кэша: getMe на каждый запрос
+    async def get_id(self) -> int:
+        me = await self.bot.get_me()
+        return me.id
+
+async def _load(client: httpx.AsyncClient, payload: dict) -> list[float]:
+    gate = asyncio.Semaphore(CONCURRENCY)
+    samples: list[float] = []
+
+    async def one() -> None:
+        async with gate:
+            started = time.perf_counter()
+            response = await client.post("/users/telegram/bot/is_auth", json=payload, headers=API_HEADERS)
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200 and response.json()["is_auth"] is True
+
+    await asyncio.gather(*(one() for _ in range(REQUESTS)))
+    return samples
+
+async def test_is_auth_p99_with_cached_identity(pg_engine, seeded):
+    engine = create_async_engine(pg_engine.url, pool_size=CONCURRENCY)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_session
+    async with fake_telegram(latency=TELEGRAM_LATENCY_MS / 1000) as server:
+        bot = Bot(token="1:bench", session=AiohttpSession(api=TelegramAPIServer.from_base(server.url)))
+        payload = {"bot_id": bot.id, "user_id": seeded["telegram_id"]}
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                app.dependency_overrides[get_bot_config] = lambda: GetMePerRequest(bot)
+                old = await _load(client, payload)
+                old_calls = server.calls.get("getme", 0)
+
+                server.calls.clear()
+                await bot_module.refresh_bot_identity(bot)
+                app.dependency_overrides[get_bot_config] = lambda: BotConfig(bot)
+                new = await _load(client, payload)
+                new_calls = server.calls.get("getme", 0)
+        finally:
+            app.dependency_overrides.clear()
+            await bot_module.close_bot()
+            await bot.session.close()
+            await engine.dispose()
+
+    report("is_auth getMe per request", requests=REQUESTS, telegram_ms=TELEGRAM_LATENCY_MS,
+           p50_ms=percentile(old, 50) * 1000, p99_ms=percentile(old, 99) * 1000, getme=old_calls)
+    report("is_auth cached identity", requests=REQUESTS, telegram_ms=TELEGRAM_LATENCY_MS,
+           p50_ms=percentile(new, 50) * 1000, p99_ms=percentile(new, 99) * 1000, getme=new_calls)
+
+    assert old_calls == REQUESTS
+    # один getMe при старте, дальше только кэш
+    assert new_calls == 1
+    assert percentile(new, 99) < percentile(old, 99)
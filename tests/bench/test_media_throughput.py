@@ -0,0 +1,85 @@
+import asyncio
+import os
+import socket
+import time
+
+import aiohttp
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+
+from src.api import media as media_api
+from tests.bench.conftest import bench_size, report
+
+pytestmark = pytest.mark.anyio
+
+REQUESTS = bench_size("BENCH_MEDIA_REQUESTS", 5000)
+CONCURRENCY = bench_size("BENCH_MEDIA_CONCURRENCY", 32)
+# копия для списка (~30 КБ) и оригинал (~300 КБ)
+SIZES = {"list": 30 * 1024, "original": 300 * 1024}
+CHROME = "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8"
+
+def make_app(root) -> FastAPI:
+    # тот же роутер, что в src.main, и рядом StaticFiles по тому же каталогу —
+    # без middleware приложения, чтобы сравнивать только раздачу
+    app = FastAPI()
+    app.include_router(media_api.router)
+    app.mount("/plain", StaticFiles(directory=root), name="plain")
+    return app
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def hammer(url: str, headers: dict) -> tuple[float, int]:
+    queue = iter(range(REQUESTS))
+    received = 0
+
+    async def worker(session: aiohttp.ClientSession) -> None:
+        nonlocal received
+        for _ in queue:
+            async with session.get(url, headers=headers) as response:
+                assert response.status == 200
+                body = await response.read()
+            received += len(body)
+
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(CONCURRENCY)))
+        return time.perf_counter() - started, received
+
+async def test_media_route_throughput_vs_static_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_api, "_images_root", tmp_path)
+    for name, size in SIZES.items():
+        (tmp_path / f"{name}.jpg").write_bytes(os.urandom(size))
+        (tmp_path / f"{name}.webp").write_bytes(os.urandom(size * 2 // 3))
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(make_app(tmp_path), host="127.0.0.1", port=port,
+                                           log_level="warning", access_log=False, lifespan="off"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for name in SIZES:
+            results = {}
+            variants = (
+                ("static", f"{base}/plain/{name}.jpg", {}),
+                ("media", f"{base}/media/img/{name}.jpg", {}),
+                ("media_webp", f"{base}/media/img/{name}.jpg", {"Accept": CHROME}),
+            )
+            for variant, url, headers in variants:
+                seconds, received = await hammer(url, headers)
+                results[variant] = REQUESTS / seconds
+                report(f"media {name} {variant}", requests=REQUESTS, concurrency=CONCURRENCY,
+                       rps=results[variant], mb_per_s=received / seconds / 2 ** 20)
+            # свой роутер делает resolve + is_file + stat — допускаем разумную цену за это
+            assert results["media"] > results["static"] * 0.6
+    finally:
+        server.should_exit = True
+        await serving
@@ -0,0 +1,97 @@
+import time
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from src.core.auth import principal_cache
+from src.database import get_async_session
+from src.main import app
+from src.models.vacancy import JobVacancy
+from tests.bench.conftest import bench_size, percentile, report
+from tests.bench.seed import seed_place, seed_users, seed_vacancies, vacuum_analyze
+from tests.conftest import bearer_headers
+
+pytestmark = pytest.mark.anyio
+
+POWER_POSTS = bench_size("BENCH_MINE_POSTS", 50_000)
+OTHER_POSTS = bench_size("BENCH_MINE_OTHER_POSTS", 200_000)
+REPEATS = bench_size("BENCH_MINE_REPEATS", 20)
+
+# /mine до пагинации: все живые посты автора одним запросом. Сериализация
+# 50k элементов в JSON сюда не входит — это нижняя граница старого ответа.
+async def legacy_mine(session: AsyncSession, author_id: int) -> int:
+    items = (await session.execute(
+        select(JobVacancy)
+        .where(JobVacancy.author_id == author_id)
+        .where(JobVacancy.is_delete.is_(False))
+        .options(selectinload(JobVacancy.country), selectinload(JobVacancy.region))
+        .order_by(JobVacancy.id.desc())
+    )).scalars().all()
+    return len(items)
+
+async def timed(call) -> tuple[list[float], object]:
+    result = await call()   # прогрев
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = await call()
+        samples.append(time.perf_counter() - started)
+    return samples, result
+
+async def test_mine_power_user(pg_engine):
+    async with pg_engine.begin() as conn:
+        country_id, region_id = await seed_place(conn)
+        await seed_users(conn, 1000)
+        # пользователь 1 — автор всех POWER_POSTS, остальные делят фон
+        await seed_vacancies(conn, "job_vacancies", POWER_POSTS, "1", country_id, region_id)
+        await seed_vacancies(conn, "job_vacancies", OTHER_POSTS, "2 + i % 999", country_id, region_id)
+    await vacuum_analyze(pg_engine)
+
+    factory = async_sessionmaker(bind=pg_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    async with factory() as session:
+        live = (await session.execute(
+            select(JobVacancy.id)
+            .where(JobVacancy.author_id == 1, JobVacancy.is_delete.is_(False))
+            .order_by(JobVacancy.id.desc())
+        )).scalars().all()
+
+    app.dependency_overrides[get_async_session] = override_session
+    principal_cache.clear()
+    try:
+        headers = await bearer_headers(1, 5000001)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            async def page(before_id: int | None = None):
+                params = {"before_id": before_id} if before_id is not None else {}
+                response = await client.get("/vacancy/jobvacancy/mine", params=params, headers=headers)
+                assert response.status_code == 200
+                return response.json()
+
+            first_s, first = await timed(page)
+            # середина истории: keyset не зависит от глубины
+            deep_s, deep = await timed(lambda: page(live[len(live) // 2]))
+
+        async with factory() as session:
+            legacy_s, legacy_count = await timed(lambda: legacy_mine(session, 1))
+    finally:
+        app.dependency_overrides.clear()
+        principal_cache.clear()
+
+    assert legacy_count == len(live)
+    assert [item["id"] for item in first["data"]] == live[:50]
+    assert [item["id"] for item in deep["data"]] == live[len(live) // 2 + 1:len(live) // 2 + 51]
+
+    report("vacancy/jobvacancy/mine power user", posts=POWER_POSTS, live=len(live), other_posts=OTHER_POSTS,
+           legacy_rows=legacy_count, legacy_p50_ms=percentile(legacy_s, 50) * 1000,
+           first_page_p50_ms=percentile(first_s, 50) * 1000, first_page_p99_ms=percentile(first_s, 99) * 1000,
+           deep_page_p50_ms=percentile(deep_s, 50) * 1000, deep_page_p99_ms=percentile(deep_s, 99) * 1000)
+    assert percentile(first_s, 99) < percentile(legacy_s, 50)
+    assert percentile(deep_s, 99) < percentile(legacy_s, 50)
@@ -0,0 +1,88 @@
+import time
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.database import get_async_session
+from src.main import app
+from tests.bench.conftest import bench_size, percentile, report
+from tests.bench.seed import VACANCY_VALUES, seed_place, seed_users, seed_vacancies, vacuum_analyze
+from tests.conftest import API_HEADERS
+
+pytestmark = pytest.mark.anyio
+
+ROWS = bench_size("BENCH_SEARCH_ROWS", 1_000_000)   # всего, поровну на четыре таблицы
+REPEATS = bench_size("BENCH_SEARCH_REPEATS", 10)
+
+# заголовки вида "<слово> <i>" (tests/bench/seed.py): одно совпадение и каждая десятая строка
+QUERIES = {"rare": "Translator 99999", "common": "Python"}
+
+async def timed_search(client: httpx.AsyncClient, q: str) -> tuple[list[float], int]:
+    samples = []
+    found = 0
+    for _ in range(REPEATS + 1):
+        started = time.perf_counter()
+        response = await client.get("/search/", params={"q": q, "limit": 20}, headers=API_HEADERS)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200
+        found = len(response.json()["data"])
+    return samples[1:], found   # первый запрос — прогрев
+
+async def set_search_indexes(engine, present: bool) -> None:
+    async with engine.begin() as conn:
+        for table in VACANCY_VALUES:
+            if present:
+                await conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING gin (search_vector)"
+                ))
+            else:
+                await conn.execute(text(f"DROP INDEX IF EXISTS ix_{table}_search"))
+    await vacuum_analyze(engine)
+
+async def uses_index(engine) -> bool:
+    async with engine.connect() as conn:
+        plan = (await conn.execute(text(
+            "EXPLAIN SELECT id FROM job_vacancies "
+            "WHERE search_vector @@ websearch_to_tsquery('simple', 'Translator 99999')"
+        ))).scalars().all()
+    return any("ix_job_vacancies_search" in line for line in plan)
+
+async def test_search_with_and_without_gin(pg_engine):
+    started = time.perf_counter()
+    async with pg_engine.begin() as conn:
+        country_id, region_id = await seed_place(conn)
+        await seed_users(conn, 1000)
+        for table in VACANCY_VALUES:
+            await seed_vacancies(conn, table, ROWS // len(VACANCY_VALUES), "1 + i % 1000", country_id, region_id)
+    await vacuum_analyze(pg_engine)
+    seeded_in = time.perf_counter() - started
+
+    factory = async_sessionmaker(bind=pg_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_session
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for indexed in (True, False):
+                await set_search_indexes(pg_engine, indexed)
+                assert await uses_index(pg_engine) == indexed
+                label = "gin" if indexed else "seqscan"
+                for name, q in QUERIES.items():
+                    samples, found = await timed_search(client, q)
+                    results[label, name] = samples
+                    report(f"search {name} {label}", rows=ROWS, seed_s=seeded_in, q=q, found=found,
+                           p50_ms=percentile(samples, 50) * 1000, p99_ms=percentile(samples, 99) * 1000)
+    finally:
+        app.dependency_overrides.clear()
+        # индексы из миграции 0003 нужны остальным тестам сессии
+        await set_search_indexes(pg_engine, True)
+
+    for name in QUERIES:
+        assert percentile(results["gin", name], 50) < percentile(results["seqscan", name], 50)
@@ -0,0 +1,90 @@
+import re
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from src.core import set_countries_base
+from tests.bench.conftest import bench_size, report
+
+pytestmark = pytest.mark.anyio
+
+ROUNDS = bench_size("BENCH_SEED_ROUNDS", 5)
+
+# Загрузчик до перехода на COPY (как в src/core/set_countries_base.py раньше):
+# каждая строка файла — отдельный execute с дописанным ON CONFLICT DO NOTHING
+async def legacy_run_sql_file_line_by_line(conn, path: Path) -> int:
+    needs_on_conflict = re.compile(r";\s*$", re.IGNORECASE)
+    has_on_conflict = re.compile(r"\bon\s+conflict\b", re.IGNORECASE)
+
+    count = 0
+    with path.open("r", encoding="utf-8", errors="ignore") as f:
+        async with conn.begin():
+            for line in f:
+                ln = line.strip()
+                if not ln or not ln.lower().startswith("insert into"):
+                    continue
+                if not has_on_conflict.search(ln):
+                    if needs_on_conflict.search(ln):
+                        ln = needs_on_conflict.sub(" ON CONFLICT DO NOTHING;", ln)
+                    else:
+                        ln = ln + " ON CONFLICT DO NOTHING;"
+                await conn.execute(text(ln))
+                count += 1
+    return count
+
+async def legacy_seed(engine) -> None:
+    async with engine.connect() as conn:
+        await legacy_run_sql_file_line_by_line(conn, set_countries_base.COUNTRY_SQL)
+        await legacy_run_sql_file_line_by_line(conn, set_countries_base.REGION_SQL)
+
+async def clear(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE country, region, seed_checksums RESTART IDENTITY CASCADE"))
+
+async def snapshot(engine) -> tuple[list, list]:
+    async with engine.connect() as conn:
+        countries = (await conn.execute(text(
+            "SELECT id, en, name, time_zoneutc FROM country ORDER BY id"
+        ))).all()
+        regions = (await conn.execute(text("SELECT id, name, country_id FROM region ORDER BY id"))).all()
+    return countries, regions
+
+async def timed(seed, engine, fresh: bool) -> float:
+    samples = []
+    for _ in range(ROUNDS):
+        if fresh:
+            await clear(engine)
+        started = time.perf_counter()
+        await seed(engine)
+        samples.append(time.perf_counter() - started)
+    return min(samples) * 1000
+
+async def test_seed_startup_legacy_vs_bulk(pg_engine, monkeypatch):
+    monkeypatch.setattr(set_countries_base, "engine", pg_engine)
+
+    async def bulk_seed(engine) -> None:
+        await set_countries_base.set_countries_to_base_with_file()
+
+    await clear(pg_engine)
+    await legacy_seed(pg_engine)
+    legacy_rows = await snapshot(pg_engine)
+    await clear(pg_engine)
+    await bulk_seed(pg_engine)
+    assert await snapshot(pg_engine) == legacy_rows
+
+    rows = sum(map(len, legacy_rows))
+    results = {}
+    for name, seed in (("legacy", legacy_seed), ("bulk", bulk_seed)):
+        # первый старт на пустой базе и обычный рестарт, когда всё уже загружено
+        results[name, "empty"] = await timed(seed, pg_engine, fresh=True)
+        if name == "bulk":
+            await clear(pg_engine)
+            await bulk_seed(pg_engine)   # записываем контрольные суммы
+        results[name, "restart"] = await timed(seed, pg_engine, fresh=False)
+        report(f"seed startup {name}", rows=rows, rounds=ROUNDS,
+               empty_ms=results[name, "empty"], restart_ms=results[name, "restart"])
+
+    assert results["bulk", "empty"] < results["legacy", "empty"]
+    assert results["bulk", "restart"] < results["legacy", "restart"]
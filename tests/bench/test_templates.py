@@ -0,0 +1,123 @@
+import json
+import time
+from types import SimpleNamespace
+
+import aiofiles
+import pytest
+
+from src.core.i18n.vacancy import internship, jobvacancy, one_time_task, opportunities_grants
+from src.core.i18n.vacancy.registry import I18N_DIR, template_registry
+from tests.bench.conftest import bench_size, report
+
+pytestmark = pytest.mark.anyio
+
+ITERATIONS = bench_size("BENCH_TEMPLATE_ITERATIONS", 5000)
+
+# Старый путь: converter.read_json_file открывал и разбирал json на каждый вызов
+async def read_json_file(path) -> dict:
+    async with aiofiles.open(path, "r", encoding="utf-8") as f:
+        text = await f.read()
+    return json.loads(text)
+
+def esc(s: str | None) -> str:
+    return (s or "").strip()
+
+async def legacy_jobvacancy(lang_code: str, post) -> str:
+    labels = await read_json_file(I18N_DIR / "jobvacancy.json")
+    d = labels.get(lang_code, labels["eng"])
+    lines = [f"{d['hashtag']}\n", f"👨‍💼 <b>{d['position_title']}</b>: {esc(post.position_title)}"]
+    if post.organization_name:
+        lines.append(f"🏛 <b>{d['organization_name']}</b>: {esc(post.organization_name)}")
+    lines.append(f"📍 <b>{d['address']}</b>: {esc(post.address)}")
+    lines.append(f"📌 <b>{d['requirements']}</b>: {esc(post.requirements)}")
+    if post.duties:
+        lines.append(f"📑 <b>{d['duties']}</b>: {esc(post.duties)}")
+    lines.append(f"⏰ <b>{d['work_schedule']}</b>: {esc(post.work_schedule)}")
+    lines.append(f"💰 <b>{d['salary']}</b>: {esc(post.salary)}")
+    lines.append(f"☎️ <b>{d['contact']}</b>: {esc(post.contact)}")
+    if post.additional_info:
+        lines.append(f"📎 <b>{d['additional_info']}</b>: {esc(post.additional_info)}")
+    return "\n".join(lines)
+
+async def legacy_internship(lang_code: str, post) -> str:
+    labels = await read_json_file(I18N_DIR / "internship.json")
+    d = labels.get(lang_code, labels["eng"])
+    lines = [f"{d['hashtag']}\n", f"👨‍💼 <b>{d['position_title']}</b>: {esc(post.position_title)}"]
+    if post.organization_name:
+        lines.append(f"🏛 <b>{d['organization_name']}</b>: {esc(post.organization_name)}")
+    lines += [
+        f"📌 <b>{d['requirements']}</b>: {esc(post.requirements)}",
+        f"⚙️ <b>{d['duties']}</b>: {esc(post.duties)}",
+    ]
+    if post.conditions:
+        lines.append(f"⚖️ <b>{d['conditions']}</b>: {esc(post.conditions)}")
+    lines += [
+        f"📍 <b>{d['address']}</b>: {esc(post.address)}",
+        f"💰 <b>{d['salary']}</b>: {esc(post.salary)}",
+        f"☎️ <b>{d['contact']}</b>: {esc(post.contact)}",
+    ]
+    if post.additional_info:
+        lines.append(f"📎 <b>{d['additional_info']}</b>: {esc(post.additional_info)}")
+    return "\n".join(lines)
+
+async def legacy_one_time_task(lang_code: str, post) -> str:
+    labels = await read_json_file(I18N_DIR / "one_time_task.json")
+    d = labels.get(lang_code, labels["eng"])
+    lines = [
+        f"{d['hashtag']}\n",
+        f"👨‍💼 <b>{d['who_needed']}</b>: {esc(post.who_needed)}",
+        f"🏛 <b>{d['task_description']}</b>: {esc(post.task_description)}",
+        f"💰 <b>{d['salary']}</b>: {esc(post.salary)}",
+    ]
+    if post.deadline:
+        lines.append(f"⚙️ <b>{d['deadline']}</b>: {esc(post.deadline)}")
+    lines.append(f"☎️ <b>{d['contact']}</b>: {esc(post.contact)}")
+    if post.address:
+        lines.append(f"⚙️ <b>{d['address']}</b>: {esc(post.address)}")
+    if post.additional_info:
+        lines.append(f"📎 <b>{d['additional_info']}</b>: {esc(post.additional_info)}")
+    return "\n".join(lines)
+
+async def legacy_opportunities_grants(lang_code: str, post) -> str:
+    labels = await read_json_file(I18N_DIR / "opportunities_grants.json")
+    d = labels.get(lang_code, labels["eng"])
+    return f"{post.content}\n\n{d.get('contact')}"
+
+POST = SimpleNamespace(
+    position_title="Python developer", organization_name="Aumeta", address="Nukus",
+    requirements="3 years", duties="Backend", work_schedule="9-18", salary="1000",
+    contact="+998", additional_info="Remote", conditions="Full time",
+    who_needed="Designer", task_description="Logo", deadline="Friday",
+    content="Grant for students", img_path=None, tg_file_id=None,
+)
+
+CASES = [
+    ("jobvacancy", jobvacancy.get_vacancy_channel_format, legacy_jobvacancy),
+    ("internship", internship.get_vacancy_channel_format, legacy_internship),
+    ("one_time_task", one_time_task.get_vacancy_channel_format, legacy_one_time_task),
+    ("opportunities_grants", opportunities_grants.get_vacancy_channel_format, legacy_opportunities_grants),
+]
+
+async def _time(fn, lang_codes: list[str]) -> float:
+    started = time.perf_counter()
+    for i in range(ITERATIONS):
+        await fn(lang_codes[i % len(lang_codes)], POST)
+    return time.perf_counter() - started
+
+@pytest.mark.parametrize("name,formatter,legacy", CASES, ids=[case[0] for case in CASES])
+async def test_registry_vs_read_json_file(name, formatter, legacy):
+    template_registry.load()
+    lang_codes = list(json.loads((I18N_DIR / f"{name}.json").read_text(encoding="utf-8")))
+
+    # тот же текст для каждого языка, включая неизвестный
+    for code in lang_codes + ["xx"]:
+        assert (await formatter(code, POST)).text == await legacy(code, POST)
+
+    async def current(code, post):
+        return (await formatter(code, post)).text
+
+    old = await _time(legacy, lang_codes)
+    new = await _time(current, lang_codes)
+    report(f"template {name}", iterations=ITERATIONS, read_json_us=old / ITERATIONS * 1e6,
+           registry_us=new / ITERATIONS * 1e6, speedup=old / new)
+    assert new < old
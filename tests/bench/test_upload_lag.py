@@ -0,0 +1,116 @@
+import asyncio
+import datetime
+import io
+import os
+import time
+import uuid
+
+import aiofiles
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from src.core import files
+from tests.bench.conftest import bench_size, percentile, report
+
+pytestmark = pytest.mark.anyio
+
+UPLOADS = bench_size("BENCH_UPLOADS", 32)
+CONCURRENCY = bench_size("BENCH_UPLOAD_CONCURRENCY", 8)
+SIDE = bench_size("BENCH_UPLOAD_SIDE", 3000)
+TICK = 0.005
+
+def make_jpeg(seed: int) -> bytes:
+    # шум не сжимается — файл в несколько мегабайт, как фото с телефона
+    image = Image.frombytes("RGB", (SIDE, SIDE * 3 // 4), os.urandom(SIDE * SIDE * 3 // 4 * 3))
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+def upload(raw: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(raw), size=len(raw), filename="photo.jpg",
+                      headers=Headers({"content-type": "image/jpeg"}))
+
+async def legacy_save_image(img: UploadFile, max_mb: int = 20) -> str:
+    # как было: весь файл в память, verify и запись — в цикле событий
+    raw = await img.read()
+    if len(raw) > max_mb * 1024 * 1024:
+        raise ValueError("File too large")
+    Image.open(io.BytesIO(raw)).verify()
+    subdir = files.MEDIA_ROOT / datetime.date.today().strftime("%Y/%m/%d")
+    subdir.mkdir(parents=True, exist_ok=True)
+    file_location = subdir / f"{uuid.uuid4().hex}.jpg"
+    async with aiofiles.open(file_location, "wb") as f:
+        await f.write(raw)
+    return str(file_location)
+
+async def pipeline_save_image(img: UploadFile, max_mb: int = 20) -> str:
+    # как store_image, без учёта в базе: поток на диск, обработка в пуле
+    max_bytes = files.check_upload(img, max_mb)
+    tmp_path, digest = await files.spool_upload(img, max_bytes)
+    try:
+        stored = await files.process_upload(tmp_path, digest)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return stored.path
+
+async def inline_save_image(img: UploadFile, max_mb: int = 20) -> str:
+    # та же обработка, но прямо в цикле событий — показывает, что даёт пул
+    max_bytes = files.check_upload(img, max_mb)
+    tmp_path, digest = await files.spool_upload(img, max_bytes)
+    try:
+        stored = files._process_image(tmp_path, digest)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return stored.path
+
+async def measure(save, payloads: list[bytes]) -> tuple[list[float], float]:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        # насколько позже обещанного просыпается sleep — это и есть задержка цикла
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - started - TICK)
+
+    gate = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(raw: bytes):
+        async with gate:
+            await save(upload(raw))
+
+    probe = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(one(raw) for raw in payloads))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe
+    return lags, elapsed
+
+def use_media_root(monkeypatch, root) -> None:
+    # у каждого варианта свой каталог: иначе следующий найдёт готовые копии по хэшу
+    monkeypatch.setattr(files, "BASE_DIR", root)
+    monkeypatch.setattr(files, "MEDIA_ROOT", root / "media")
+    monkeypatch.setattr(files, "IMAGES_ROOT", root / "media" / "img")
+    monkeypatch.setattr(files, "UPLOAD_TMP", root / ".media_tmp")
+
+async def test_upload_event_loop_lag(tmp_path, monkeypatch):
+    payloads = [make_jpeg(i) for i in range(UPLOADS)]
+    size_mb = sum(map(len, payloads)) / len(payloads) / 2 ** 20
+
+    results = {}
+    variants = (("legacy", legacy_save_image), ("inline", inline_save_image), ("pipeline", pipeline_save_image))
+    for name, save in variants:
+        use_media_root(monkeypatch, tmp_path / name)
+        lags, elapsed = await measure(save, payloads)
+        results[name] = lags
+        report(f"upload loop lag {name}", uploads=UPLOADS, concurrency=CONCURRENCY, avg_mb=size_mb,
+               seconds=elapsed, lag_p50_ms=percentile(lags, 50) * 1000,
+               lag_p99_ms=percentile(lags, 99) * 1000, lag_max_ms=max(lags) * 1000)
+
+    # старый путь почти ничего не делал (только verify) — сравниваем с той же работой в цикле
+    assert max(results["pipeline"]) < max(results["inline"])
+    assert percentile(results["pipeline"], 99) < percentile(results["inline"], 99)
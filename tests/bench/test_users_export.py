@@ -0,0 +1,102 @@
+import asyncio
+import json
+import time
+import tracemalloc
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.api.statistic import USERS_EXPORT_COLUMNS
+from src.database import get_async_session, get_session_factory
+from src.main import app
+from src.models.users import Clients, Users
+from tests.bench.conftest import bench_size, report
+from tests.bench.seed import seed_users, vacuum_analyze
+from tests.conftest import API_HEADERS
+
+pytestmark = pytest.mark.anyio
+
+SMALL = bench_size("BENCH_EXPORT_SMALL", 10_000)
+LARGE = bench_size("BENCH_EXPORT_ROWS", 1_000_000)
+
+async def drain(query: str) -> int:
+    # ASGI напрямую: httpx.ASGITransport собирает всё тело в память
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/stats/users", "raw_path": b"/stats/users", "root_path": "",
+        "query_string": query.encode(), "client": ("127.0.0.1", 1), "server": ("test", 80),
+        "headers": [(b"host", b"test")] + [(k.lower().encode(), v.encode()) for k, v in API_HEADERS.items()],
+    }
+    received = 0
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Future()  # клиент не отключается
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return received
+
+async def load_everything(factory) -> int:
+    # как было до keyset: все строки в один список и один JSON
+    async with factory() as session:
+        rows = (await session.execute(
+            select(Users.id, Users.telegram_id, Users.full_name, Clients.company_name, Users.contact)
+            .outerjoin(Clients, Clients.user_id == Users.id)
+            .order_by(Users.id)
+        )).all()
+    data = [dict(zip(USERS_EXPORT_COLUMNS, row)) for row in rows]
+    return len(json.dumps({"data": data}, ensure_ascii=False))
+
+async def peak_memory(coro) -> tuple[float, float, int]:
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        size = await coro
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2 ** 20, elapsed, size
+
+async def test_export_memory_is_flat(pg_engine):
+    factory = async_sessionmaker(bind=pg_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_session():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_session
+    # выгрузка потоком открывает свою сессию
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    peaks = {}
+    try:
+        seeded = 0
+        for rows in (SMALL, LARGE):
+            async with pg_engine.begin() as conn:
+                await seed_users(conn, rows - seeded, start=seeded)
+            await vacuum_analyze(pg_engine)
+            seeded = rows
+            for fmt in ("ndjson", "csv"):
+                mb, seconds, size = await peak_memory(drain(f"format={fmt}"))
+                peaks[(fmt, rows)] = mb
+                report(f"users export {fmt}", rows=rows, peak_mb=mb, seconds=seconds, body_mb=size / 2 ** 20)
+            if rows == SMALL:
+                # старый путь меряем только на малом объёме — на большом он съест всю память
+                mb, seconds, size = await peak_memory(load_everything(factory))
+                report("users full list (old)", rows=rows, peak_mb=mb, seconds=seconds, body_mb=size / 2 ** 20)
+    finally:
+        app.dependency_overrides.clear()
+
+    for fmt in ("ndjson", "csv"):
+        # пик памяти не растёт вместе с числом строк
+        assert peaks[(fmt, LARGE)] < max(2 * peaks[(fmt, SMALL)], peaks[(fmt, SMALL)] + 5)
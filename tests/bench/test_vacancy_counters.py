@@ -0,0 +1,49 @@
+import time
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.api.statistic import aggregate_vacancy_counts
+from src.models.statistic import VacancyCounters
+from tests.bench.conftest import bench_size, report
+from tests.bench.seed import (
+    VACANCY_VALUES, refresh_counters, seed_place, seed_users, seed_vacancies, vacuum_analyze,
+)
+
+pytestmark = pytest.mark.anyio
+
+ROWS = bench_size("BENCH_COUNTER_ROWS", 1_000_000)
+REPEATS = bench_size("BENCH_COUNTER_REPEATS", 20)
+
+async def _timed(factory, query) -> tuple[float, dict]:
+    async with factory() as session:
+        await query(session)  # прогрев кэша
+        started = time.perf_counter()
+        for _ in range(REPEATS):
+            result = await query(session)
+        return (time.perf_counter() - started) / REPEATS, result
+
+async def read_counters(session) -> dict:
+    rows = (await session.execute(select(VacancyCounters))).scalars().all()
+    return {row.code: (row.total, row.approved, row.rejected) for row in rows}
+
+async def test_counters_vs_aggregate(pg_engine):
+    started = time.perf_counter()
+    async with pg_engine.begin() as conn:
+        country_id, region_id = await seed_place(conn)
+        await seed_users(conn, 1000)
+        for table in VACANCY_VALUES:
+            await seed_vacancies(conn, table, ROWS, "1 + i % 1000", country_id, region_id)
+        await refresh_counters(conn)
+    await vacuum_analyze(pg_engine)
+    seeded_in = time.perf_counter() - started
+
+    factory = async_sessionmaker(bind=pg_engine, class_=AsyncSession, expire_on_commit=False)
+    aggregate_s, exact = await _timed(factory, aggregate_vacancy_counts)
+    counters_s, fast = await _timed(factory, read_counters)
+
+    report("stats/vacancies", rows_per_table=ROWS, seed_s=seeded_in,
+           aggregate_ms=aggregate_s * 1000, counters_ms=counters_s * 1000, speedup=aggregate_s / counters_s)
+    assert fast == exact
+    assert counters_s < aggregate_s
@@ -0,0 +1,96 @@
+import os
+import time
+
+import httpx
+import pytest
+
+from src.api import statistic
+from src.core import avatars
+from src.core.bot import get_bot_config
+from src.main import app
+from tests.conftest import API_HEADERS
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(avatars, "AVATAR_CACHE_DIR", tmp_path)
+    return tmp_path
+
+def put(directory, name: str, size: int, age: float):
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+def test_cache_dir_is_not_served_from_media():
+    assert avatars.MEDIA_ROOT not in avatars.AVATAR_CACHE_DIR.parents
+
+def test_sweep_removes_expired_files(cache_dir):
+    old = put(cache_dir, "old.jpg", 10, age=100)
+    fresh = put(cache_dir, "fresh.jpg", 10, age=1)
+
+    assert avatars.sweep_avatar_cache(max_bytes=1000, max_age=50) == (1, 10)
+    assert not old.exists() and fresh.exists()
+
+def test_sweep_trims_oldest_files_over_size_limit(cache_dir):
+    a = put(cache_dir, "a.jpg", 40, age=30)
+    b = put(cache_dir, "b.jpg", 40, age=20)
+    c = put(cache_dir, "c.jpg", 40, age=10)
+
+    assert avatars.sweep_avatar_cache(max_bytes=80, max_age=1000) == (1, 40)
+    assert not a.exists() and b.exists() and c.exists()
+
+def test_sweep_keeps_fresh_partial_downloads(cache_dir):
+    part = put(cache_dir, "a.1234.part", 100, age=1)
+    stale = put(cache_dir, "b.5678.part", 100, age=100)
+
+    avatars.sweep_avatar_cache(max_bytes=10, max_age=50)
+    assert part.exists() and not stale.exists()
+
+def test_touch_refreshes_only_stale_mtime(cache_dir):
+    stale = put(cache_dir, "stale.jpg", 10, age=avatars.AVATAR_TOUCH_INTERVAL + 60)
+    recent = put(cache_dir, "recent.jpg", 10, age=60)
+    recent_mtime = recent.stat().st_mtime
+
+    assert avatars.touch_avatar(stale) and avatars.touch_avatar(recent)
+    assert time.time() - stale.stat().st_mtime < 5
+    # в пределах интервала — без лишней записи метаданных
+    assert recent.stat().st_mtime == recent_mtime
+    assert not avatars.touch_avatar(cache_dir / "missing.jpg")
+
+@pytest.mark.anyio
+async def test_cache_hits_keep_hot_files_through_sweep(cache_dir, monkeypatch):
+    monkeypatch.setattr(avatars, "avatar_index", avatars.TTLCache(ttl=60, maxsize=10))
+    age = avatars.AVATAR_TOUCH_INTERVAL + 60
+    hot = put(cache_dir, "hot.jpg", 40, age=age + 10)
+    cold = put(cache_dir, "cold.jpg", 40, age=age)
+    avatars.avatar_index.set(1, "hot")
+
+    # попадание — без обращения к Telegram
+    assert await avatars.get_avatar(bot=None, telegram_id=1) == "hot"
+
+    avatars.sweep_avatar_cache(max_bytes=40, max_age=10 * age)
+    assert hot.exists() and not cold.exists()
+
+class StubBotConfig:
+    async def getBot(self):
+        return None
+
+@pytest.mark.anyio
+async def test_photo_falls_back_when_cached_file_is_gone(cache_dir, monkeypatch):
+    async def swept_avatar(bot, telegram_id):
+        # get_avatar видел файл, но до ответа его удалила очистка
+        return "swept"
+
+    monkeypatch.setattr(statistic, "get_avatar", swept_avatar)
+    app.dependency_overrides[get_bot_config] = lambda: StubBotConfig()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/stats/photo/1", headers=API_HEADERS)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.content == avatars.DEFAULT_AVATAR
+    assert response.headers["etag"] == avatars.DEFAULT_AVATAR_ETAG
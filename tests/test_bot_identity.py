@@ -0,0 +1,88 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import bot as bot_module
+
+pytestmark = pytest.mark.anyio
+
+class StubBot:
+    # getMe падает, пока failures > 0
+    def __init__(self, failures: int = 0):
+        self.id = 42
+        self.failures = failures
+        self.calls = 0
+
+    async def get_me(self):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("telegram unavailable")
+        return SimpleNamespace(id=42, username="jobs_bot", full_name="Jobs Bot")
+
+@pytest.fixture(autouse=True)
+async def reset_identity():
+    await bot_module.close_bot()
+    yield
+    await bot_module.close_bot()
+
+async def settle():
+    while bot_module._identity_task is not None:
+        await asyncio.sleep(0)
+
+async def test_failed_startup_fetch_is_retried_on_next_call(monkeypatch):
+    monkeypatch.setattr(bot_module, "BOT_IDENTITY_RETRY", 0)
+    stub = StubBot(failures=1)
+    with pytest.raises(ConnectionError):
+        await bot_module.refresh_bot_identity(stub)
+
+    # без сети отдаётся id из токена, а в фоне getMe запрашивается заново
+    identity = await bot_module.get_bot_identity(stub)
+    assert identity.id == 42 and identity.username is None
+    await settle()
+
+    identity = await bot_module.get_bot_identity(stub)
+    assert identity.username == "jobs_bot"
+    assert stub.calls == 2
+
+async def test_retries_back_off_while_telegram_is_down(monkeypatch):
+    monkeypatch.setattr(bot_module, "BOT_IDENTITY_RETRY", 60)
+    stub = StubBot(failures=10)
+    with pytest.raises(ConnectionError):
+        await bot_module.refresh_bot_identity(stub)
+
+    for _ in range(20):
+        await bot_module.get_bot_identity(stub)
+        await settle()
+    # следующая попытка не раньше чем через BOT_IDENTITY_RETRY
+    assert stub.calls == 1
+
+    monkeypatch.setattr(bot_module, "_identity_retry_at", 0.0)
+    await bot_module.get_bot_identity(stub)
+    await settle()
+    assert stub.calls == 2
+    # вторая неудача подряд — пауза удваивается
+    assert bot_module._identity_retry_at - time.monotonic() > 100
+
+async def test_close_bot_clears_refresh_task():
+    stub = StubBot()
+    gate = asyncio.Event()
+
+    async def slow_get_me():
+        await gate.wait()
+
+    stub.get_me = slow_get_me
+    await bot_module.get_bot_identity(stub)
+    task = bot_module._identity_task
+    assert task is not None
+
+    await bot_module.close_bot()
+    assert bot_module._identity_task is None
+    await asyncio.sleep(0)
+    assert task.cancelled()
+
+    # после перезапуска обновление снова планируется
+    await bot_module.get_bot_identity(StubBot())
+    assert bot_module._identity_task is not None
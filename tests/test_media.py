@@ -0,0 +1,146 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import anyio
+import anyio.from_thread
+import anyio.to_thread
+import httpx
+import pytest
+from sqlalchemy import select
+
+from src.api import media as media_api
+from src.core import files, media
+from src.main import app
+from src.models.media import MediaObject
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(files, "BASE_DIR", tmp_path)
+    return tmp_path
+
+def put_files(digest: str) -> str:
+    path = f"media/img/{digest[:2]}/{digest[2:4]}/{digest}.jpg"
+    for file in files.media_files(path):
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_bytes(b"x" * 10)
+    return path
+
+async def add_object(session_factory, digest: str, refcount: int, age: timedelta) -> str:
+    path = put_files(digest)
+    async with session_factory() as session:
+        session.add(MediaObject(
+            digest=digest, path=path, size=10, refcount=refcount,
+            released_at=datetime.now(timezone.utc) - age,
+        ))
+        await session.commit()
+    return path
+
+async def test_gc_removes_only_expired_orphans(session_factory, media_root):
+    grace = timedelta(seconds=media.MEDIA_GC_GRACE)
+    orphan = await add_object(session_factory, "a" * 64, 0, grace * 2)
+    fresh = await add_object(session_factory, "b" * 64, 0, timedelta(0))
+    used = await add_object(session_factory, "c" * 64, 1, grace * 2)
+
+    run = await media.collect_media_garbage(session_factory, batch_size=1)
+
+    assert run.files_removed == 1
+    assert run.bytes_reclaimed == 10 * len(files.media_files(orphan))
+    assert not any(file.exists() for file in files.media_files(orphan))
+    assert all(file.exists() for file in files.media_files(fresh) + files.media_files(used))
+    async with session_factory() as session:
+        left = set((await session.execute(select(MediaObject.digest))).scalars())
+    assert left == {"b" * 64, "c" * 64}
+
+async def test_gc_unlinks_after_commit(session_factory, media_root, monkeypatch):
+    digest = "d" * 64
+    await add_object(session_factory, digest, 0, timedelta(seconds=media.MEDIA_GC_GRACE * 2))
+    unlink = media._unlink
+    visible = []
+
+    def checked_unlink(path: str) -> int:
+        # отдельное соединение: строка уже удалена и закоммичена, блокировок нет
+        async def probe():
+            async with session_factory() as session:
+                return await session.get(MediaObject, digest) is not None
+        visible.append(anyio.from_thread.run(probe))
+        return unlink(path)
+
+    monkeypatch.setattr(media, "_unlink", checked_unlink)
+    monkeypatch.setattr(media.asyncio, "to_thread", anyio.to_thread.run_sync)
+    run = await media.collect_media_garbage(session_factory)
+    assert run.files_removed == 1
+    assert visible == [False]
+
+class ReuploadingFactory:
+    # третья сессия GC — проверка после удаляющей транзакции; перед ней
+    # параллельная загрузка того же файла заново регистрирует хэш
+    def __init__(self, session_factory, digest: str, path: str):
+        self.session_factory = session_factory
+        self.digest = digest
+        self.path = path
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls == 3:
+            return self._reupload_then_open()
+        return self.session_factory()
+
+    @asynccontextmanager
+    async def _reupload_then_open(self):
+        async with self.session_factory() as session:
+            session.add(MediaObject(digest=self.digest, path=self.path, size=10,
+                                    released_at=datetime.now(timezone.utc)))
+            await session.commit()
+        async with self.session_factory() as session:
+            yield session
+
+async def test_gc_keeps_files_of_reuploaded_digest(session_factory, media_root):
+    digest = "e" * 64
+    path = await add_object(session_factory, digest, 0, timedelta(seconds=media.MEDIA_GC_GRACE * 2))
+
+    run = await media.collect_media_garbage(ReuploadingFactory(session_factory, digest, path))
+
+    assert run.files_removed == 0
+    assert all(file.exists() for file in files.media_files(path))
+
+@pytest.fixture
+def images(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_api, "_images_root", tmp_path)
+    for name in ("a_list.jpg", "a_list.webp", "b.png"):
+        (tmp_path / name).write_bytes(name.encode())
+    return tmp_path
+
+CHROME = "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8"
+
+@pytest.mark.parametrize("accept, served", [
+    (CHROME, "a_list.webp"),
+    ("image/webp,image/*;q=0.8", "a_list.webp"),
+    ("image/webp;q=0", "a_list.jpg"),
+    ("image/webp;q=0.0, image/jpeg", "a_list.jpg"),
+    ("image/webp;q=0.5, image/jpeg", "a_list.jpg"),
+    ("image/jpeg;q=0.5, IMAGE/WEBP", "a_list.webp"),
+    ("image/webp;q=oops", "a_list.jpg"),
+    ("*/*", "a_list.jpg"),
+    ("", "a_list.jpg"),
+])
+def test_negotiate_respects_q_values(images, accept, served):
+    assert media_api._negotiate(images / "a_list.jpg", accept).name == served
+
+def test_negotiate_keeps_original_without_webp_copy(images):
+    assert media_api._negotiate(images / "b.png", CHROME).name == "b.png"
+
+async def test_media_route_serves_negotiated_file(images):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        webp = await client.get("/media/img/a_list.jpg", headers={"Accept": CHROME})
+        jpeg = await client.get("/media/img/a_list.jpg", headers={"Accept": "image/webp;q=0, */*"})
+
+    assert webp.headers["content-type"] == "image/webp"
+    assert webp.content == b"a_list.webp"
+    assert jpeg.headers["content-type"] == "image/jpeg"
+    assert jpeg.content == b"a_list.jpg"
+    assert webp.headers["vary"] == jpeg.headers["vary"] == "Accept"
+    assert webp.headers["etag"] != jpeg.headers["etag"]
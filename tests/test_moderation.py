@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import select
+
+from src.core.bot import SendMessageConfig, UserTelegramData, get_bot_config
+from src.core.outbox import OutboxWorker, RateLimiter
+from src.main import app
+from src.models.outbox import OutboxStatus, TelegramOutbox
+from src.models.vacancy import JobVacancy, StatusEnum
+from tests.conftest import API_HEADERS
+
+pytestmark = pytest.mark.anyio
+
+CHANNEL_CHAT_ID = -100500
+
+class StubBotConfig:
+    # канал находится, первая публикация падает, остальные проходят
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.posted = []
+
+    async def get_channel(self, channel_username):
+        return UserTelegramData(full_name="Jobs", chat_id=CHANNEL_CHAT_ID, lastname=None, username="jobs")
+
+    async def send_post(self, chat_id, post):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("telegram timeout")
+        self.posted.append(chat_id)
+        return SendMessageConfig(chat_id=chat_id, message=post.text, message_id=900 + len(self.posted))
+
+    async def send_message(self, chat_id, message):
+        return SendMessageConfig(chat_id=chat_id, message=message, message_id=1)
+
+async def test_batch_rejects_unknown_vacancy_type(api_client):
+    payload = {
+        "moderator_tid": 1,
+        "items": [
+            {"vacancy_type": "job", "vacancy_id": 1, "action": "approve"},
+            {"vacancy_type": "vacancy", "vacancy_id": 2, "action": "approve"},
+        ],
+    }
+    response = await api_client.post("/moderation/batch", json=payload, headers=API_HEADERS)
+
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert [error["loc"] for error in errors] == [["body", "items", 1, "vacancy_type"]]
+
+async def test_batch_returns_failed_publish_and_queues_retry(api_client, seeded, session_factory):
+    botcfg = StubBotConfig(failures=1)
+    app.dependency_overrides[get_bot_config] = lambda: botcfg
+    payload = {
+        "moderator_tid": 1,
+        "items": [{"vacancy_type": "job", "vacancy_id": i, "action": "approve"} for i in (1, 2, 3)],
+    }
+    response = await api_client.post("/moderation/batch", json=payload, headers=API_HEADERS)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == ["approved"] * 3
+    [failed] = body["failed"]
+    assert failed["reason"] == "publish_queued"
+    failed_id = failed["vacancy_id"]
+
+    async with session_factory() as session:
+        [queued] = (await session.scalars(
+            select(TelegramOutbox).where(TelegramOutbox.kind == "channel")
+        )).all()
+        job = await session.get(JobVacancy, failed_id)
+    # одобрена, но в канал ещё не вышла
+    assert job.status == StatusEnum.APPROVED and job.channel_message_id is None
+    assert (queued.chat_id, queued.vacancy_type, queued.vacancy_id) == (CHANNEL_CHAT_ID, "job", failed_id)
+
+    # воркер публикует, записывает id сообщения и только тогда уведомляет автора
+    worker = OutboxWorker(bot=None, session_factory=session_factory)
+    worker.botcfg = botcfg
+    worker.limiter = RateLimiter(1000, 0, 0)
+    while await worker.process_batch():
+        pass
+
+    async with session_factory() as session:
+        job = await session.get(JobVacancy, failed_id)
+        queued = await session.get(TelegramOutbox, queued.id)
+        notices = (await session.execute(
+            select(TelegramOutbox.chat_id, TelegramOutbox.status).where(TelegramOutbox.kind == "message")
+        )).all()
+    assert queued.status == OutboxStatus.SENT
+    assert (job.channel_chat_id, job.channel_message_id) == (CHANNEL_CHAT_ID, queued.result_message_id)
+    assert notices == [(seeded["telegram_id"], OutboxStatus.SENT)] * 3
@@ -0,0 +1,176 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError, TelegramNetworkError, TelegramRetryAfter
+from aiogram.methods import SendMessage
+from sqlalchemy import select, text, update
+
+from src.core import outbox as outbox_module
+from src.core.bot import SendMessageConfig
+from src.core.outbox import OutboxWorker, backoff_seconds, enqueue_message
+from src.models.outbox import OutboxStatus, TelegramOutbox
+
+pytestmark = pytest.mark.anyio
+
+class FlakyWorker(OutboxWorker):
+    # без бота и базы: claim отдаёт готовые строки, finish падает для одной из них
+    def __init__(self, rows, broken_id):
+        self.rows = rows
+        self.broken_id = broken_id
+        self.finished = []
+
+    async def claim(self):
+        return self.rows
+
+    async def deliver(self, row):
+        if row.id == self.broken_id:
+            raise RuntimeError("connection reset")
+        self.finished.append(row.id)
+
+async def test_process_batch_survives_failed_delivery(capsys):
+    rows = [SimpleNamespace(id=i) for i in range(1, 6)]
+    worker = FlakyWorker(rows, broken_id=2)
+
+    assert await worker.process_batch() == 5
+    assert sorted(worker.finished) == [1, 3, 4, 5]
+    assert "[outbox] item 2 delivery error: connection reset" in capsys.readouterr().out
+
+# ---------------------------------------------------------------------------
+# deliver/claim/prune на настоящей базе, Telegram подменён заглушкой
+
+METHOD = SendMessage(chat_id=500, text="hello")
+
+class StubSender:
+    # вместо BotConfig: send_message бросает заданную ошибку или «отправляет»
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.sent = []
+
+    async def send_message(self, chat_id, message):
+        if self.error is not None:
+            raise self.error
+        self.sent.append((chat_id, message))
+        return SendMessageConfig(chat_id=chat_id, message=message, message_id=77)
+
+def make_worker(session_factory, error: Exception | None = None) -> OutboxWorker:
+    worker = OutboxWorker(bot=None, session_factory=session_factory)
+    worker.botcfg = StubSender(error)
+    return worker
+
+async def enqueue(session_factory, chat_id: int = 500) -> int:
+    async with session_factory() as session:
+        item = enqueue_message(session, chat_id=chat_id, text="hello")
+        await session.commit()
+        return item.id
+
+def seconds_until(column):
+    # сколько секунд осталось до момента в колонке, по часам базы
+    return text(f"extract(epoch from {column.name} - localtimestamp)")
+
+async def load(session_factory, item_id: int):
+    async with session_factory() as session:
+        item = await session.get(TelegramOutbox, item_id)
+        due_in = await session.scalar(
+            select(seconds_until(TelegramOutbox.next_attempt_at)).where(TelegramOutbox.id == item_id)
+        )
+        return item, due_in
+
+async def deliver_one(worker) -> None:
+    [row] = await worker.claim()
+    await worker.deliver(row)
+
+async def test_deliver_marks_sent(session_factory):
+    item_id = await enqueue(session_factory)
+    worker = make_worker(session_factory)
+    await deliver_one(worker)
+
+    item, _ = await load(session_factory, item_id)
+    assert item.status == OutboxStatus.SENT
+    assert item.attempts == 1 and item.result_message_id == 77
+    assert worker.botcfg.sent == [(500, "hello")]
+
+async def test_retry_after_reschedules_at_server_time(session_factory):
+    item_id = await enqueue(session_factory)
+    worker = make_worker(session_factory, TelegramRetryAfter(METHOD, "Flood control", retry_after=42))
+    await deliver_one(worker)
+
+    item, due_in = await load(session_factory, item_id)
+    assert item.status == OutboxStatus.PENDING
+    # flood control — не попытка
+    assert item.attempts == 0
+    assert 40 <= due_in <= 43
+    # и чат поставлен на паузу в ограничителе
+    assert worker.limiter._next_chat[500] - time.monotonic() > 40
+
+async def test_permanent_error_fails_without_retry(session_factory):
+    item_id = await enqueue(session_factory)
+    worker = make_worker(session_factory, TelegramForbiddenError(METHOD, "bot was blocked by the user"))
+    await deliver_one(worker)
+
+    item, _ = await load(session_factory, item_id)
+    assert item.status == OutboxStatus.FAILED
+    assert item.attempts == 1
+    assert "blocked" in item.last_error
+
+async def test_transient_error_backs_off_then_fails(session_factory, monkeypatch):
+    item_id = await enqueue(session_factory)
+    worker = make_worker(session_factory, TelegramNetworkError(METHOD, "connection reset"))
+    await deliver_one(worker)
+
+    item, due_in = await load(session_factory, item_id)
+    assert item.status == OutboxStatus.PENDING and item.attempts == 1
+    assert backoff_seconds(1) - 2 <= due_in <= backoff_seconds(1) + 1
+
+    # последняя разрешённая попытка — строка уходит в FAILED
+    monkeypatch.setattr(outbox_module, "OUTBOX_MAX_ATTEMPTS", 2)
+    async with session_factory() as session:
+        await session.execute(text("UPDATE telegram_outbox SET next_attempt_at = now() - interval '1 second'"))
+        await session.commit()
+    worker.limiter = outbox_module.RateLimiter(1000, 0, 0)
+    await deliver_one(worker)
+
+    item, _ = await load(session_factory, item_id)
+    assert item.status == OutboxStatus.FAILED and item.attempts == 2
+
+async def test_expired_lease_is_reclaimed(session_factory):
+    item_id = await enqueue(session_factory)
+    worker = make_worker(session_factory)
+
+    # процесс взял строку и упал, не записав результат
+    [row] = await worker.claim()
+    assert row.id == item_id
+    assert await worker.claim() == []
+
+    async with session_factory() as session:
+        await session.execute(
+            update(TelegramOutbox)
+            .where(TelegramOutbox.id == item_id)
+            .values(next_attempt_at=text("now() - interval '1 second'"))
+        )
+        await session.commit()
+
+    [row] = await worker.claim()
+    assert row.id == item_id
+    item, _ = await load(session_factory, item_id)
+    assert item.status == OutboxStatus.SENDING
+
+async def test_prune_removes_only_old_sent_rows(session_factory, monkeypatch):
+    monkeypatch.setattr(outbox_module, "OUTBOX_PRUNE_BATCH", 2)
+    ids = [await enqueue(session_factory, chat_id=500 + i) for i in range(6)]
+    statuses = ["SENT", "SENT", "SENT", "FAILED", "PENDING", "SENT"]
+    async with session_factory() as session:
+        for item_id, status in zip(ids, statuses):
+            await session.execute(text(
+                "UPDATE telegram_outbox SET status = :status, updated_at = now() - interval '30 days' WHERE id = :id"
+            ), {"status": status, "id": item_id})
+        # свежая отправленная строка
+        await session.execute(text("UPDATE telegram_outbox SET updated_at = now() WHERE id = :id"), {"id": ids[-1]})
+        await session.commit()
+
+    worker = make_worker(session_factory)
+    assert await worker.prune() == 3
+
+    async with session_factory() as session:
+        left = (await session.scalars(select(TelegramOutbox.id).order_by(TelegramOutbox.id))).all()
+    assert left == ids[3:]
@@ -0,0 +1,47 @@
+# post_index ведут триггеры из миграции 0004 — схема тестов строится миграциями,
+# поэтому здесь проверяются настоящие строки, а не пустая таблица.
+import pytest
+from sqlalchemy import select, update, func
+
+from src.models.post_index import PostIndex
+from src.models.vacancy import JobVacancy, StatusEnum
+from tests.conftest import API_HEADERS, POSTS_PER_TYPE
+
+pytestmark = pytest.mark.anyio
+
+async def feed(api_client, **params) -> list[dict]:
+    response = await api_client.get("/stats/posts", params=params, headers=API_HEADERS)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+async def test_feed_reads_trigger_maintained_rows(api_client, seeded):
+    posts = await feed(api_client)
+    assert len(posts) == 4 * POSTS_PER_TYPE
+    keys = [(post["created_at"], post["type"], post["id"]) for post in posts]
+    assert keys == sorted(keys, reverse=True)
+
+    jobs = await feed(api_client, type="job_vacancies")
+    assert [post["title"] for post in jobs] == ["Dev"] * POSTS_PER_TYPE
+
+async def test_triggers_follow_status_and_soft_delete(api_client, session_factory, seeded):
+    async with session_factory() as session:
+        await session.execute(update(JobVacancy).where(JobVacancy.id == 1).values(status=StatusEnum.APPROVED))
+        await session.execute(update(JobVacancy).where(JobVacancy.id == 2).values(is_delete=True))
+        await session.commit()
+
+    approved = await feed(api_client, status="APPROVED")
+    assert [(post["type"], post["id"]) for post in approved] == [("job_vacancies", 1)]
+    async with session_factory() as session:
+        jobs = await session.scalar(
+            select(func.count()).select_from(PostIndex).where(PostIndex.type == "job_vacancies")
+        )
+    assert jobs == POSTS_PER_TYPE - 1
+
+async def test_unfiltered_feed_is_read_in_index_order(api_client, sql_counter, pg_engine, seeded):
+    sql_counter.reset()
+    await feed(api_client)
+    statement, parameters = sql_counter.statements[-1], sql_counter.parameters[-1]
+    async with pg_engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        plan = "\n".join((await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)).scalars())
+    assert "ix_post_index_created" in plan and "Sort" not in plan, plan
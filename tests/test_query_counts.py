@@ -0,0 +1,88 @@
+# Сколько SQL-запросов выполняет каждый роут. Число не должно расти с
+# количеством строк: связи по умолчанию lazy="raise", а что подгрузить,
+# задают планы из src/models/load_plans.py. Если число изменилось намеренно —
+# поправьте ожидание здесь же, вместе с изменением плана.
+import pytest
+
+from tests.conftest import API_HEADERS, bearer_headers
+
+pytestmark = pytest.mark.anyio
+
+# (метод, путь, нужен ли Bearer, тело, ожидаемое число запросов)
+# Bearer-роуты: +1 запрос на Principal (кэш очищается перед каждым тестом).
+ENDPOINTS = [
+    ("GET", "/vacancy/jobvacancy/mine", True, None, 2),
+    ("GET", "/vacancy/internship/mine", True, None, 2),
+    ("GET", "/vacancy/one_time_task/mine", True, None, 2),
+    ("GET", "/vacancy/opportunities_grants/mine", True, None, 2),
+    ("GET", "/users/me", True, None, 2),
+    # Principal, профиль, UPDATE, профиль после коммита
+    ("PUT", "/users/me", True, "update", 5),
+    ("GET", "/bot/channels/", False, None, 1),
+    ("POST", "/stats/client/posts", False, "profile", 1),
+    ("POST", "/stats/client/post", False, "post", 1),
+    ("POST", "/stats/user/profile", False, "profile", 1),
+    ("GET", "/stats/posts", False, None, 1),
+]
+
+@pytest.mark.parametrize("method,path,bearer,body,expected", ENDPOINTS, ids=[e[1] for e in ENDPOINTS])
+async def test_statement_count(api_client, sql_counter, seeded, method, path, bearer, body, expected):
+    headers = dict(API_HEADERS)
+    if bearer:
+        headers.update(await bearer_headers(seeded["user_id"], seeded["telegram_id"]))
+    payload = {
+        None: None,
+        "profile": {"id": seeded["user_id"], "telegram_id": seeded["telegram_id"]},
+        "post": {"id": 1, "vacancy_type": "job_vacancies"},
+        "update": {
+            "language_code": None, "full_name": None, "contact": None, "company_name": "Aumeta Jobs",
+            "country_id": None, "region_id": None, "industry_id": None,
+        },
+    }[body]
+
+    sql_counter.reset()
+    response = await api_client.request(method, path, headers=headers, json=payload)
+
+    assert response.status_code == 200, response.text
+    assert sql_counter.count == expected, sql_counter.statements
+
+async def test_reference_routes_do_not_touch_database(api_client, sql_counter, seeded):
+    # первый запрос собирает снимок, остальные отдаются из памяти
+    await api_client.get("/reference/")
+    sql_counter.reset()
+    for path in ("/countries/", f"/countries/{seeded['country_id']}", "/industry/", "/languages/", "/reference/"):
+        response = await api_client.get(path)
+        assert response.status_code == 200, path
+    assert sql_counter.count == 0, sql_counter.statements
+
+# Запросы по автору должны попадать в частичный индекс (... WHERE is_delete = false).
+# Условие is_delete IS false планировщик с ним не сопоставляет — будет seq scan.
+AUTHOR_INDEX_ROUTES = [
+    ("GET", "/vacancy/jobvacancy/mine", True, ["job_vacancies"]),
+    ("GET", "/vacancy/internship/mine", True, ["internship"]),
+    ("GET", "/vacancy/one_time_task/mine", True, ["one_time_task"]),
+    ("GET", "/vacancy/opportunities_grants/mine", True, ["opportunities_grants"]),
+    ("POST", "/stats/client/posts", False, ["job_vacancies", "internship", "one_time_task", "opportunities_grants"]),
+]
+
+@pytest.mark.parametrize("method,path,bearer,tables", AUTHOR_INDEX_ROUTES, ids=[r[1] for r in AUTHOR_INDEX_ROUTES])
+async def test_author_queries_use_partial_index(api_client, sql_counter, pg_engine, seeded, method, path, bearer, tables):
+    headers = dict(API_HEADERS)
+    if bearer:
+        headers.update(await bearer_headers(seeded["user_id"], seeded["telegram_id"]))
+    payload = {"id": seeded["user_id"], "telegram_id": seeded["telegram_id"]} if method == "POST" else None
+
+    sql_counter.reset()
+    response = await api_client.request(method, path, headers=headers, json=payload)
+    assert response.status_code == 200, response.text
+
+    statement, parameters = next(
+        (stmt, params) for stmt, params in zip(sql_counter.statements, sql_counter.parameters)
+        if "is_delete" in stmt
+    )
+    async with pg_engine.connect() as conn:
+        # на паре строк seq scan дешевле любого индекса — запрещаем его
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        plan = "\n".join((await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)).scalars())
+    for table in tables:
+        assert f"ix_{table}_author_live_status" in plan, plan
@@ -0,0 +1,107 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.core.jwt import create_access_token, create_refresh_token, create_token, SECRET_KEY_REFRESH
+from src.core.tokens import issue_token_pair, rotate_refresh_token, refresh_denylist
+from src.models.tokens import RefreshToken
+from src.models.users import Users
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+def clear_denylist():
+    refresh_denylist.clear()
+    yield
+    refresh_denylist.clear()
+
+class NoDatabaseSession:
+    # ветки, которые должны отказать до обращения к базе
+    async def execute(self, *args, **kwargs):
+        raise AssertionError("unexpected database call")
+
+    async def commit(self):
+        raise AssertionError("unexpected commit")
+
+def refresh_payload(**extra) -> dict:
+    return {"user_id": 1, "telegram_id": 1001, "jti": uuid.uuid4().hex, "fid": uuid.uuid4().hex, **extra}
+
+# --- без базы -----------------------------------------------------------------
+
+async def test_token_without_jti_is_rejected():
+    # токены, выданные до ротации
+    token = await create_refresh_token({"user_id": 1, "telegram_id": 1001})
+    assert await rotate_refresh_token(NoDatabaseSession(), token) is None
+
+async def test_expired_token_is_rejected():
+    token = create_token(refresh_payload(), timedelta(seconds=-1), SECRET_KEY_REFRESH, "refresh")
+    assert await rotate_refresh_token(NoDatabaseSession(), token) is None
+
+async def test_garbage_and_access_tokens_are_rejected():
+    access = await create_access_token(refresh_payload())
+    assert await rotate_refresh_token(NoDatabaseSession(), "not-a-jwt") is None
+    assert await rotate_refresh_token(NoDatabaseSession(), access) is None
+
+async def test_denylisted_family_is_rejected_without_database():
+    payload = refresh_payload()
+    refresh_denylist.set(uuid.UUID(payload["fid"]).bytes, True)
+    token = await create_refresh_token(payload)
+    assert await rotate_refresh_token(NoDatabaseSession(), token) is None
+
+# --- Postgres -----------------------------------------------------------------
+
+@pytest.fixture
+async def login(session_factory):
+    async with session_factory() as session:
+        user = Users(telegram_id=1001, language_code="kaa", full_name="Test", contact="+998")
+        session.add(user)
+        await session.flush()
+        pair = await issue_token_pair(session, user.id, user.telegram_id)
+        await session.commit()
+    return pair
+
+async def family_rows(session_factory) -> list[RefreshToken]:
+    async with session_factory() as session:
+        return list((await session.scalars(select(RefreshToken).order_by(RefreshToken.created_at))).all())
+
+async def test_rotation_is_single_use(session_factory, login):
+    async with session_factory() as session:
+        pair = await rotate_refresh_token(session, login["refresh_token"])
+    assert pair is not None
+    assert pair["refresh_token"] != login["refresh_token"]
+
+    rows = await family_rows(session_factory)
+    assert len(rows) == 2
+    assert len({row.family_id for row in rows}) == 1
+    assert sum(row.used_at is not None for row in rows) == 1
+
+    # новый токен тоже ротируется
+    async with session_factory() as session:
+        assert await rotate_refresh_token(session, pair["refresh_token"]) is not None
+
+async def test_reuse_revokes_family(session_factory, login):
+    async with session_factory() as session:
+        pair = await rotate_refresh_token(session, login["refresh_token"])
+    async with session_factory() as session:
+        assert await rotate_refresh_token(session, login["refresh_token"]) is None
+
+    rows = await family_rows(session_factory)
+    assert all(row.revoked_at is not None for row in rows)
+    assert refresh_denylist.get(rows[0].family_id.bytes)
+
+    # законный наследник тоже отозван — и из памяти, и из базы
+    async with session_factory() as session:
+        assert await rotate_refresh_token(session, pair["refresh_token"]) is None
+    refresh_denylist.clear()
+    async with session_factory() as session:
+        assert await rotate_refresh_token(session, pair["refresh_token"]) is None
+
+async def test_expired_row_is_rejected(session_factory, login):
+    async with session_factory() as session:
+        row = (await session.scalars(select(RefreshToken))).one()
+        row.expires_at = row.created_at - timedelta(seconds=1)
+        await session.commit()
+    async with session_factory() as session:
+        assert await rotate_refresh_token(session, login["refresh_token"]) is None
@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import delete, insert
+
+from src.models.users import Users
+from tests.conftest import API_HEADERS
+
+pytestmark = pytest.mark.anyio
+
+USERS = 25
+
+@pytest.fixture
+async def users(session_factory):
+    async with session_factory() as session:
+        rows = await session.execute(
+            insert(Users).returning(Users.id),
+            [{"telegram_id": 7000 + i, "full_name": f"User {i}", "contact": "+998"} for i in range(USERS)],
+        )
+        ids = list(rows.scalars())
+        await session.commit()
+    return ids
+
+async def read_pages(api_client, limit: int, between_pages=None) -> list[int]:
+    seen, after_id = [], None
+    while True:
+        params = {"limit": limit} if after_id is None else {"limit": limit, "after_id": after_id}
+        body = (await api_client.get("/stats/users", params=params, headers=API_HEADERS)).json()
+        assert body["status"] == 200
+        seen += [row["id"] for row in body["data"]]
+        after_id = body["next_after_id"]
+        if after_id is None:
+            return seen
+        assert after_id == seen[-1]
+        if between_pages is not None:
+            await between_pages()
+            between_pages = None
+
+async def test_keyset_pages_cover_every_row_once(api_client, users):
+    for limit in (1, 7, USERS, USERS + 1):
+        assert await read_pages(api_client, limit) == users
+
+async def test_keyset_pages_survive_changes_between_pages(api_client, users, session_factory):
+    added = []
+
+    async def change():
+        # удаление уже прочитанной строки не сдвигает страницы (как было бы с OFFSET),
+        # новая строка попадает в конец
+        async with session_factory() as session:
+            await session.execute(delete(Users).where(Users.id == users[0]))
+            added.append((await session.execute(
+                insert(Users).values(telegram_id=9999, full_name="Late").returning(Users.id)
+            )).scalar_one())
+            await session.commit()
+
+    seen = await read_pages(api_client, 7, between_pages=change)
+    assert seen == users + added
+
+async def test_streamed_exports_match_pages(api_client, users):
+    ndjson = await api_client.get("/stats/users", params={"format": "ndjson"}, headers=API_HEADERS)
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [row["id"] for row in rows] == users
+    assert rows[0]["full_name"] == "User 0"
+
+    exported = await api_client.get("/stats/users", params={"format": "csv"}, headers=API_HEADERS)
+    table = list(csv.reader(io.StringIO(exported.text)))
+    assert table[0] == ["id", "telegram_id", "full_name", "company_name", "contact"]
+    assert [int(row[0]) for row in table[1:]] == users
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import delete, select, update
+
+from src.api.statistic import aggregate_vacancy_counts
+from src.models.statistic import VacancyCounters
+from src.models.vacancy import Internship, JobVacancy, OneTimeTask, OpportunitiesGrants, StatusEnum
+from tests.conftest import API_HEADERS, POSTS_PER_TYPE
+
+pytestmark = pytest.mark.anyio
+
+async def counters(session) -> dict:
+    rows = (await session.execute(select(VacancyCounters))).scalars().all()
+    return {row.code: (row.total, row.approved, row.rejected) for row in rows}
+
+async def test_counters_match_aggregate_after_every_change(session_factory, seeded):
+    async with session_factory() as session:
+        assert await counters(session) == await aggregate_vacancy_counts(session)
+        assert (await counters(session))["job_vacancies"] == (POSTS_PER_TYPE, 0, 0)
+
+        steps = [
+            # одобрение и отклонение, одиночное и пачкой
+            update(JobVacancy).where(JobVacancy.id.in_([1, 2])).values(status=StatusEnum.APPROVED),
+            update(Internship).where(Internship.id == 1).values(status=StatusEnum.REJECTED),
+            # смена уже принятого решения
+            update(JobVacancy).where(JobVacancy.id == 2).values(status=StatusEnum.REJECTED),
+            # обновление без смены статуса и мягкое удаление счётчики не трогают
+            update(JobVacancy).where(JobVacancy.id == 1).values(salary="200"),
+            update(OpportunitiesGrants).where(OpportunitiesGrants.id == 1).values(is_delete=True),
+            # жёсткое удаление
+            delete(OneTimeTask).where(OneTimeTask.id == 1),
+            delete(JobVacancy).where(JobVacancy.id == 1),
+        ]
+        for stmt in steps:
+            await session.execute(stmt)
+            await session.commit()
+            assert await counters(session) == await aggregate_vacancy_counts(session), stmt
+
+        session.add(OpportunitiesGrants(
+            author_id=seeded["user_id"], country_id=seeded["country_id"], content="Grant",
+            contact="+998", status=StatusEnum.APPROVED,
+        ))
+        await session.commit()
+        assert await counters(session) == await aggregate_vacancy_counts(session)
+
+        # откат не оставляет следов в счётчиках
+        await session.execute(update(Internship).values(status=StatusEnum.APPROVED))
+        await session.rollback()
+
+        assert await counters(session) == {
+            "job_vacancies": (POSTS_PER_TYPE - 1, 0, 1),
+            "internship": (POSTS_PER_TYPE, 0, 1),
+            "one_time_task": (POSTS_PER_TYPE - 1, 0, 0),
+            "opportunities_grants": (POSTS_PER_TYPE + 1, 1, 0),
+        }
+
+async def test_stats_endpoint_counters_equal_exact(api_client, seeded, session_factory):
+    async with session_factory() as session:
+        await session.execute(update(JobVacancy).values(status=StatusEnum.APPROVED))
+        await session.execute(update(Internship).where(Internship.id == 2).values(status=StatusEnum.REJECTED))
+        await session.commit()
+
+    fast = await api_client.get("/stats/vacancies", headers=API_HEADERS)
+    exact = await api_client.get("/stats/vacancies", params={"exact": "true"}, headers=API_HEADERS)
+
+    assert fast.json()["status"] == 200
+    assert fast.json()["data"] == exact.json()["data"]
+    job = next(row for row in fast.json()["data"] if row["code"] == "job_vacancies")
+    assert (job["length"], job["approved"], job["rejected"]) == (POSTS_PER_TYPE, POSTS_PER_TYPE, 0)
@@ -0,0 +1,90 @@
+# Одновременные первые входы через WebApp: upsert_telegram_user должен
+# сойтись на unique-индексах без IntegrityError и без дублей.
+import asyncio
+
+import pytest
+from sqlalchemy import select, func, text
+
+from src.api.users import upsert_telegram_user
+from src.core.bot import get_bot_config
+from src.main import app
+from src.models.users import Users, Clients
+from tests.conftest import API_HEADERS
+
+pytestmark = pytest.mark.anyio
+
+LOGINS = 500
+# max_connections по умолчанию 100 — оставляем запас
+CONNECTIONS = 50
+
+async def login_all(session_factory, telegram_ids: list[int]) -> list:
+    gate = asyncio.Semaphore(CONNECTIONS)
+
+    async def login(telegram_id: int):
+        async with gate, session_factory() as session:
+            row = await upsert_telegram_user(session, telegram_id)
+            await session.commit()
+            return row
+
+    return await asyncio.gather(*(login(telegram_id) for telegram_id in telegram_ids))
+
+async def counts(session_factory) -> tuple[int, int]:
+    async with session_factory() as session:
+        users = await session.scalar(select(func.count()).select_from(Users))
+        clients = await session.scalar(select(func.count()).select_from(Clients))
+    return users, clients
+
+async def test_simultaneous_first_logins_same_telegram_id(session_factory):
+    rows = await login_all(session_factory, [777] * LOGINS)
+
+    assert len({row.id for row in rows}) == 1
+    assert await counts(session_factory) == (1, 1)
+
+async def test_simultaneous_first_logins_different_telegram_ids(session_factory):
+    telegram_ids = list(range(10_000, 10_000 + LOGINS))
+    rows = await login_all(session_factory, telegram_ids)
+
+    assert sorted(row.telegram_id for row in rows) == telegram_ids
+    assert len({row.id for row in rows}) == LOGINS
+    assert await counts(session_factory) == (LOGINS, LOGINS)
+
+async def row_versions(session_factory, telegram_id: int) -> tuple:
+    # xmin меняется при каждой записи строки
+    async with session_factory() as session:
+        return (await session.execute(text(
+            "SELECT u.xmin::text, c.xmin::text FROM users u JOIN clients c ON c.user_id = u.id "
+            "WHERE u.telegram_id = :telegram_id"
+        ), {"telegram_id": telegram_id})).one()
+
+async def test_repeat_login_does_not_write(session_factory):
+    [first] = await login_all(session_factory, [555])
+    before = await row_versions(session_factory, 555)
+
+    again = await login_all(session_factory, [555] * 3)
+
+    assert {row.id for row in again} == {first.id}
+    assert await row_versions(session_factory, 555) == before
+
+async def test_login_restores_missing_client_row(session_factory):
+    async with session_factory() as session:
+        session.add(Users(telegram_id=556))
+        await session.commit()
+
+    await login_all(session_factory, [556])
+    assert await counts(session_factory) == (1, 1)
+
+class StubBotConfig:
+    async def get_id(self) -> int:
+        return 42
+
+async def test_bot_auth_is_idempotent(api_client, session_factory):
+    app.dependency_overrides[get_bot_config] = lambda: StubBotConfig()
+    payload = {"bot_id": 42, "user_id": 888, "language_code": "ru"}
+
+    for _ in range(2):
+        response = await api_client.post("/users/telegram/bot/auth", json=payload, headers=API_HEADERS)
+        assert response.status_code == 200
+
+    assert await counts(session_factory) == (1, 1)
+    async with session_factory() as session:
+        assert await session.scalar(select(Users.language_code).where(Users.telegram_id == 888)) == "ru"